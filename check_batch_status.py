@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from utils.neo4j_utils import Neo4jVerifier
+from utils.neo4j_utils import Neo4jVerifier, configure_logging
 
 def check_batch_files():
     """Check which files from batch_30_files.txt are in Neo4j"""
@@ -84,4 +84,5 @@ def check_batch_files():
         print(f"   Contains {len(not_found)} files that still need processing")
 
 if __name__ == "__main__":
+    configure_logging()
     check_batch_files() 
\ No newline at end of file
@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from utils.neo4j_utils import Neo4jVerifier
+from utils.neo4j_utils import Neo4jVerifier, configure_logging
 
 def check_neo4j_memories():
     """Check what memories are actually stored in Neo4j"""
@@ -62,4 +62,5 @@ def check_neo4j_memories():
         print("No recent nodes found in Neo4j")
 
 if __name__ == "__main__":
+    configure_logging()
     check_neo4j_memories() 
\ No newline at end of file
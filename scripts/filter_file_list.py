@@ -12,6 +12,7 @@ import os
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from utils.file_utils import WRITE_BUFFER_SIZE, write_lines
 from utils.filter_file_list import filter_file_list
 
 
@@ -170,9 +171,8 @@ Examples:
             print(f"   Would write {len(filtered_files)} files to {args.output}")
         else:
             # Write filtered files to output
-            with open(args.output, 'w') as f:
-                for file_path in filtered_files:
-                    f.write(f"{file_path}\n")
+            with open(args.output, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                write_lines(f, filtered_files)
             
             print(f"\n💾 Filtered file list written to: {args.output}")
         
@@ -8,11 +8,12 @@ This script provides a command-line interface to generate lists of files for pro
 import argparse
 import sys
 import os
+from itertools import chain, islice
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils.file_utils import generate_file_list_from_path
+from utils.file_utils import WRITE_BUFFER_SIZE, iter_files, write_lines
 
 
 def main():
@@ -108,29 +109,27 @@ Examples:
     print()
     
     try:
-        # Generate the file list
-        file_paths = generate_file_list_from_path(
+        # Stream the file list straight to the output file, keeping only a preview
+        file_paths = iter_files(
             root_dir=args.root_dir,
             extensions=extensions,
             exclude_dirs=exclude_dirs,
             absolute_paths=args.absolute_paths
         )
-        
-        # Write to output file
-        with open(args.output, 'w') as f:
-            for file_path in file_paths:
-                f.write(f"{file_path}\n")
+        preview = list(islice(file_paths, 10))
+        with open(args.output, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            total_files = write_lines(f, chain(preview, file_paths))
         
         print(f"✅ File list generated successfully!")
-        print(f"   Total files: {len(file_paths)}")
+        print(f"   Total files: {total_files}")
         print(f"   Output file: {args.output}")
         
-        if args.verbose and file_paths:
+        if args.verbose and preview:
             print(f"\n📋 First 10 files:")
-            for i, file_path in enumerate(file_paths[:10], 1):
+            for i, file_path in enumerate(preview, 1):
                 print(f"   {i}. {file_path}")
-            if len(file_paths) > 10:
-                print(f"   ... and {len(file_paths) - 10} more files")
+            if total_files > 10:
+                print(f"   ... and {total_files - 10} more files")
         
         print(f"\n💡 Next steps:")
         print(f"   1. Review the file list: cat {args.output}")
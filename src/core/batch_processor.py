@@ -2,37 +2,71 @@
 """
 Batch memory adder that reads file_list.txt, gets file info via chat completion, then creates memories.
 Proper queue monitoring to avoid GPU contention between LM Studio and Graphiti.
+
+The HTTP and docker waits run on a single asyncio event loop so GPU monitoring
+keeps ticking while an LM Studio request is in flight.
 """
-import requests
+import aiohttp
+import asyncio
+import json
 import os
 import argparse
 import time
 import sys
-import subprocess
 import os
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 from core.memory_adder import add_memory_via_lmstudio
-from utils.neo4j_utils import Neo4jVerifier
+from utils.neo4j_utils import Neo4jVerifier, configure_logging
+from utils.status_utils import print_wait_status
+
+# Prompt templates are built once at import; only the per-file fields vary.
+_FILE_INFO_PROMPT_TMPL = (
+    "Please analyze this file and provide a concise summary of what it does:\n\n"
+    "File: {path}\n"
+    "Content:\n"
+    "{body}\n\n"
+    "Please provide a brief summary of:\n"
+    "1. What this file does\n"
+    "2. Key functions/classes\n"
+    "3. Purpose in the project\n"
+    "4. Any important details\n\n"
+    "Keep it concise but informative."
+)
+_ADD_MEMORY_PROMPT_TMPL = "Please add a memory with the name '{name}' and the following content: '{content}'"
+
+QUEUE_STATUS_URL = "http://localhost:8100/queue/status"
 
-def check_queue_status() -> dict:
+# Completed files accumulated in the done log before the file list is rewritten
+COMPACT_EVERY = 100
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create the shared aiohttp session used for LM Studio and queue calls.
+    Must be called from inside a running event loop.
+    """
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector)
+
+async def check_queue_status(session: aiohttp.ClientSession) -> dict:
     """
     Check queue status using the new HTTP endpoint.
     Returns dict with queue information.
     """
     try:
-        response = requests.get("http://localhost:8100/queue/status", timeout=10)
-        response.raise_for_status()
-        return response.json()
+        async with session.get(QUEUE_STATUS_URL, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            return await response.json()
     except Exception as e:
         print(f"⚠️ Error checking queue status: {e}")
         return {"group_queues": {}}
 
-def wait_for_queue_empty(timeout: int = 300, check_interval: int = 5) -> bool:
+async def wait_for_queue_empty(session: aiohttp.ClientSession, timeout: int = 300, check_interval: int = 5) -> bool:
     """
     Wait for the queue to be empty before starting LM Studio processing.
     
     Args:
+        session: Shared aiohttp session
         timeout: Maximum time to wait in seconds
         check_interval: How often to check in seconds
     
@@ -42,8 +76,9 @@ def wait_for_queue_empty(timeout: int = 300, check_interval: int = 5) -> bool:
     print(f"🔍 Checking queue status before starting LM Studio...")
     start_time = time.time()
     
+    polls = 0
     while time.time() - start_time < timeout:
-        queue_data = check_queue_status()
+        queue_data = await check_queue_status(session)
         elapsed_time = int(time.time() - start_time)
         
         # Check if any group has items in queue
@@ -55,17 +90,19 @@ def wait_for_queue_empty(timeout: int = 300, check_interval: int = 5) -> bool:
             print(f"✅ Queue empty – starting LM Studio...")
             return True
         else:
-            print(f"\r⏳ Queue busy ({total_size} items) – waiting... ({elapsed_time}s)", end="", flush=True)
-            time.sleep(check_interval)
+            print_wait_status(f"Queue busy ({total_size} items) – waiting... ({elapsed_time}s)", polls)
+            polls += 1
+            await asyncio.sleep(check_interval)
     
     print(f"\n⚠️ Timeout waiting for queue to empty after {timeout}s")
     return False
 
-def wait_for_episode_completion(episode_name: str, check_interval: int = 5) -> bool:
+async def wait_for_episode_completion(session: aiohttp.ClientSession, episode_name: str, check_interval: int = 5) -> bool:
     """
     Wait for a specific episode to complete processing.
     
     Args:
+        session: Shared aiohttp session
         episode_name: Name of the episode to wait for
         check_interval: How often to check in seconds
     
@@ -75,8 +112,9 @@ def wait_for_episode_completion(episode_name: str, check_interval: int = 5) -> b
     print(f"🔄 Waiting for Graphiti to process: {os.path.basename(episode_name)}")
     start_time = time.time()
     
+    polls = 0
     while True:
-        queue_data = check_queue_status()
+        queue_data = await check_queue_status(session)
         elapsed_time = int(time.time() - start_time)
         
         # Check if episode is still in any items list
@@ -102,10 +140,11 @@ def wait_for_episode_completion(episode_name: str, check_interval: int = 5) -> b
             print(f"✅ Graphiti completed after {elapsed_time}s")
             return True
         else:
-            print(f"\r⏳ {queue_info} ({elapsed_time}s)", end="", flush=True)
-            time.sleep(check_interval)
+            print_wait_status(f"{queue_info} ({elapsed_time}s)", polls)
+            polls += 1
+            await asyncio.sleep(check_interval)
 
-def check_ollama_gpu_usage() -> dict:
+async def check_ollama_gpu_usage() -> dict:
     """
     Check if Ollama is currently using GPU resources by monitoring docker stats.
     
@@ -113,50 +152,50 @@ def check_ollama_gpu_usage() -> dict:
         Dictionary with GPU usage information
     """
     try:
-        # Get Ollama container stats
-        result = subprocess.run([
-            "docker", "stats", "--no-stream", "--format", 
-            "table {{.Name}}\t{{.CPUPerc}}\t{{.MemUsage}}"
-        ], capture_output=True, text=True, timeout=10)
+        # Get Ollama container stats, one JSON object per line
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "stats", "--no-stream", "--format", "{{json .}}", "graphiti-ollama-1",
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
         
-        if result.returncode != 0:
-            return {"error": f"Docker stats failed: {result.stderr}", "is_processing": False}
+        if proc.returncode != 0:
+            return {"error": f"Docker stats failed: {stderr.decode(errors='replace')}", "is_processing": False}
         
         # Parse the output to find Ollama container
-        lines = result.stdout.strip().split('\n')
-        for line in lines:
-            if 'graphiti-ollama-1' in line:
-                # Split by multiple spaces and filter out empty strings
-                parts = [part for part in line.split('  ') if part.strip()]
-                if len(parts) >= 3:
-                    container_name = parts[0].strip()
-                    cpu_percent = parts[1].strip().replace('%', '')
-                    mem_usage = parts[2].strip()
-                    
-                    # Convert CPU percentage to float
-                    try:
-                        cpu_float = float(cpu_percent)
-                        # Consider "processing" if CPU > 1% (above idle threshold)
-                        is_processing = cpu_float > 1.0
-                        
-                        return {
-                            "container": container_name,
-                            "cpu_percent": cpu_float,
-                            "memory_usage": mem_usage,
-                            "is_processing": is_processing,
-                            "error": None
-                        }
-                    except ValueError:
-                        return {"error": f"Invalid CPU value: {cpu_percent}", "is_processing": False}
+        for line in stdout.decode(errors='replace').splitlines():
+            stats = json.loads(line)
+            if stats.get("Name") == "graphiti-ollama-1":
+                cpu_percent = stats.get("CPUPerc", "").rstrip('%')
+                
+                # Convert CPU percentage to float
+                try:
+                    cpu_float = float(cpu_percent)
+                except ValueError:
+                    return {"error": f"Invalid CPU value: {cpu_percent}", "is_processing": False}
+                
+                return {
+                    "container": stats["Name"],
+                    "cpu_percent": cpu_float,
+                    "memory_usage": stats.get("MemUsage", ""),
+                    # Consider "processing" if CPU > 1% (above idle threshold)
+                    "is_processing": cpu_float > 1.0,
+                    "error": None
+                }
         
         return {"error": "Ollama container not found", "is_processing": False}
         
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return {"error": "Docker stats timeout", "is_processing": False}
     except Exception as e:
         return {"error": f"Error checking GPU usage: {str(e)}", "is_processing": False}
 
-def wait_for_ollama_idle(timeout: int = 300, check_interval: int = 5) -> bool:
+async def wait_for_ollama_idle(timeout: int = 300, check_interval: int = 5) -> bool:
     """
     Wait for Ollama to become idle (not using GPU) before starting new processing.
     
@@ -170,8 +209,9 @@ def wait_for_ollama_idle(timeout: int = 300, check_interval: int = 5) -> bool:
     print("🔍 Checking Ollama GPU usage...")
     start_time = time.time()
     
+    polls = 0
     while time.time() - start_time < timeout:
-        gpu_data = check_ollama_gpu_usage()
+        gpu_data = await check_ollama_gpu_usage()
         
         if gpu_data.get("error"):
             print(f"⚠️ GPU monitoring error: {gpu_data['error']}")
@@ -186,13 +226,14 @@ def wait_for_ollama_idle(timeout: int = 300, check_interval: int = 5) -> bool:
         else:
             elapsed = int(time.time() - start_time)
             cpu_percent = gpu_data.get("cpu_percent", 0)
-            print(f"\r⏳ Ollama processing (CPU: {cpu_percent:.1f}%) – waiting... ({elapsed}s)", end="", flush=True)
-            time.sleep(check_interval)
+            print_wait_status(f"Ollama processing (CPU: {cpu_percent:.1f}%) – waiting... ({elapsed}s)", polls)
+            polls += 1
+            await asyncio.sleep(check_interval)
     
     print(f"\n⚠️ Ollama GPU timeout after {timeout}s")
     return False
 
-def wait_for_safe_processing(check_interval: int = 5) -> bool:
+async def wait_for_safe_processing(check_interval: int = 5) -> bool:
     """
     Simplified approach: Wait for Ollama to be idle (GPU monitoring only).
     Since queue status API is broken, we rely on GPU monitoring.
@@ -206,9 +247,10 @@ def wait_for_safe_processing(check_interval: int = 5) -> bool:
     """
     print("🔍 GPU MONITORING: Waiting for Ollama to be idle...")
     
+    polls = 0
     while True:
         # Check GPU usage only (queue API is broken)
-        gpu_data = check_ollama_gpu_usage()
+        gpu_data = await check_ollama_gpu_usage()
         gpu_busy = gpu_data.get("is_processing", False)
         cpu_percent = gpu_data.get("cpu_percent", 0)
         
@@ -216,8 +258,32 @@ def wait_for_safe_processing(check_interval: int = 5) -> bool:
             print(f"✅ SAFE TO PROCEED: Ollama idle (CPU: {cpu_percent:.1f}%)")
             return True
         else:
-            print(f"\r⏳ Waiting for GPU to be idle... (CPU: {cpu_percent:.1f}%)", end="", flush=True)
-            time.sleep(check_interval)
+            print_wait_status(f"Waiting for GPU to be idle... (CPU: {cpu_percent:.1f}%)", polls)
+            polls += 1
+            await asyncio.sleep(check_interval)
+
+async def monitor_gpu_until_done(task: asyncio.Task, check_interval: float = 1) -> dict:
+    """
+    Sample Ollama GPU usage while another task is in flight.
+    
+    Args:
+        task: The task to monitor alongside (e.g. an LM Studio request)
+        check_interval: How often to sample in seconds
+    
+    Returns:
+        The most recent GPU usage sample taken once the task finished
+    """
+    gpu_data = await check_ollama_gpu_usage()
+    while not task.done():
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=check_interval)
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            # The task's own error is surfaced by whoever awaits it
+            break
+        gpu_data = await check_ollama_gpu_usage()
+    return gpu_data
 
 def check_episode_in_neo4j(episode_name: str, neo4j_verifier: Neo4jVerifier = None) -> bool:
     """
@@ -243,7 +309,7 @@ def check_episode_in_neo4j(episode_name: str, neo4j_verifier: Neo4jVerifier = No
             
             # If it's an authentication error, we'll assume the episode was processed
             # since the queue monitoring and GPU monitoring both indicated success
-            if "401" in error_msg or "Unauthorized" in error_msg:
+            if "401" in error_msg or "Unauthorized" in error_msg or "AuthError" in error_msg:
                 print(f"⚠️ Neo4j authentication failed - assuming episode was processed based on queue/GPU monitoring")
                 return True
             
@@ -265,47 +331,62 @@ def check_episode_in_neo4j(episode_name: str, neo4j_verifier: Neo4jVerifier = No
         print(f"⚠️ Assuming episode was processed based on queue/GPU monitoring")
         return True
 
-def remove_file_from_list(file_path: str, file_list_path: str) -> bool:
+def done_log_path(file_list_path: str) -> str:
+    """Return the path of the append-only log of completed files for a file list."""
+    return file_list_path + '.done'
+
+def load_done_log(file_list_path: str) -> set:
+    """
+    Load the set of files already completed for a file list.
+    
+    Args:
+        file_list_path: Path to the file list
+    
+    Returns:
+        Set of absolute file paths recorded in the done log
+    """
+    try:
+        with open(done_log_path(file_list_path), 'r') as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+def compact_file_list(file_list_path: str, done: set) -> int:
     """
-    Remove a file from the processing list.
+    Rewrite the file list without completed entries and truncate the done log.
     
     Args:
-        file_path: The file path to remove
         file_list_path: Path to the file list
+        done: Absolute paths of completed files
     
     Returns:
-        True if file was removed, False otherwise
+        Number of entries removed from the file list
     """
     try:
-        # Read all lines from the file
         with open(file_list_path, 'r') as f:
-            lines = f.readlines()
+            lines = [line.strip() for line in f if line.strip()]
         
-        # Filter out the file to remove
-        original_count = len(lines)
-        filtered_lines = [line.strip() for line in lines if line.strip() != file_path]
-        new_count = len(filtered_lines)
+        remaining = [line for line in lines if os.path.abspath(line) not in done]
+        removed = len(lines) - len(remaining)
+        
+        # Rewrite the list first so a crash in between only leaves redundant log entries
+        with open(file_list_path, 'w') as f:
+            f.writelines(line + '\n' for line in remaining)
+        open(done_log_path(file_list_path), 'w').close()
+        
+        if removed:
+            print(f"🗑️ Compacted file list: {removed} completed entries removed")
+        return removed
         
-        if new_count < original_count:
-            # Write back the filtered lines
-            with open(file_list_path, 'w') as f:
-                for line in filtered_lines:
-                    f.write(line + '\n')
-            
-            print(f"🗑️ Removed from list: {os.path.basename(file_path)} ({original_count - new_count} removed)")
-            return True
-        else:
-            print(f"⚠️ File not found in list: {os.path.basename(file_path)}")
-            return False
-            
     except Exception as e:
-        print(f"⚠️ Error removing file from list: {e}")
-        return False
+        print(f"⚠️ Error compacting file list: {e}")
+        return 0
 
-def get_file_info(file_path: str, lmstudio_url: str = "http://127.0.0.1:1234/v1/chat/completions", model: str = "qwen3-32b", max_chars: int = 2000) -> str:
+async def get_file_info(session: aiohttp.ClientSession, file_path: str, lmstudio_url: str = "http://127.0.0.1:1234/v1/chat/completions", model: str = "qwen3-32b", max_chars: int = 2000) -> str:
     """
     Get specific information about a file using chat completion.
     Args:
+        session: Shared aiohttp session
         file_path: Path to the file (absolute path recommended)
         lmstudio_url: LM Studio API URL
         model: Model to use
@@ -318,16 +399,18 @@ def get_file_info(file_path: str, lmstudio_url: str = "http://127.0.0.1:1234/v1/
             return f"File not found: {file_path}"
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-        prompt = f"""Please analyze this file and provide a concise summary of what it does:\n\nFile: {file_path}\nContent:\n{content[:max_chars]}  # Limit content to avoid token limits\n\nPlease provide a brief summary of:\n1. What this file does\n2. Key functions/classes\n3. Purpose in the project\n4. Any important details\n\nKeep it concise but informative."""
+        # Limit content to avoid token limits
+        prompt = _FILE_INFO_PROMPT_TMPL.format(path=file_path, body=content[:max_chars])
         payload = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
             "stream": False
         }
         headers = {"Content-Type": "application/json"}
-        response = requests.post(lmstudio_url, json=payload, headers=headers, timeout=600)
-        response.raise_for_status()
-        data = response.json()
+        async with session.post(lmstudio_url, json=payload, headers=headers,
+                                timeout=aiohttp.ClientTimeout(total=600)) as response:
+            response.raise_for_status()
+            data = await response.json()
         return data["choices"][0]["message"]["content"]
     except Exception as e:
         return f"Error analyzing file {file_path}: {str(e)}"
@@ -336,90 +419,128 @@ def process_file_list_with_proper_queue_monitoring(file_list_path: str = "file_l
                                                  lmstudio_delay: int = 5):
     """
     Process files with GPU monitoring to avoid GPU contention.
+    Synchronous entry point; runs the async pipeline on a fresh event loop.
     
     Args:
         file_list_path: Path to the file list (default: file_list.txt)
         max_chars: Maximum number of characters from each file to include in the prompt
-        lmstudio_delay: Delay after LM Studio operations to let GPU cool down (default: 5 seconds)
+        lmstudio_delay: Poll interval while waiting for the GPU after LM Studio operations (default: 5 seconds)
     """
+    return asyncio.run(_process_file_list(file_list_path, max_chars, lmstudio_delay))
+
+async def _process_file_list(file_list_path: str, max_chars: int, lmstudio_delay: int):
     try:
-        with open(file_list_path, 'r') as f:
-            file_paths = [line.strip() for line in f if line.strip()]
-        print(f"Found {len(file_paths)} files to process with proper queue monitoring")
-        print(f"GPU contention prevention: {lmstudio_delay}s delay between operations")
-        
-        # Check initial queue status
-        print("\n=== Checking initial queue status ===")
-        initial_queue = check_queue_status()
-        print(f"Initial queue status: {initial_queue}")
-        
-        # Wait for Ollama to be idle before starting
-        if not wait_for_safe_processing():
-                print("⚠️ System may still be processing, proceeding anyway...")
-        
-        # Initialize Neo4j verifier for episode verification
-        print("🔍 Initializing Neo4j verifier...")
-        neo4j_verifier = Neo4jVerifier(username="neo4j", password="demodemo")
-        
-        successful_count = 0
-        error_count = 0
-        
-        from datetime import datetime
+        async with create_http_session() as session:
+            return await _process_file_list_with_session(session, file_list_path, max_chars, lmstudio_delay)
+    except FileNotFoundError:
+        print(f"File not found: {file_list_path}")
+        return {"processed": 0, "successful": 0, "failed": 1}
+    except Exception as e:
+        print(f"Error reading file list: {e}")
+        return {"processed": 0, "successful": 0, "failed": 1}
+
+async def _process_file_list_with_session(session: aiohttp.ClientSession, file_list_path: str, max_chars: int,
+                                          lmstudio_delay: int):
+    with open(file_list_path, 'r') as f:
+        file_paths = [line.strip() for line in f if line.strip()]
+    
+    # Skip files a previous (possibly interrupted) run already completed
+    done = load_done_log(file_list_path)
+    if done:
+        file_paths = [path for path in file_paths if os.path.abspath(path) not in done]
+        print(f"Skipping {len(done)} files already recorded in {done_log_path(file_list_path)}")
+    if not file_paths:
+        compact_file_list(file_list_path, done)
+        print("No files left to process")
+        return {"processed": 0, "successful": 0, "failed": 0}
+    print(f"Found {len(file_paths)} files to process with proper queue monitoring")
+    print(f"GPU contention prevention: {lmstudio_delay}s GPU poll interval between operations")
+    
+    # Check initial queue status
+    print("\n=== Checking initial queue status ===")
+    initial_queue = await check_queue_status(session)
+    print(f"Initial queue status: {initial_queue}")
+    
+    # Wait for Ollama to be idle before starting
+    if not await wait_for_safe_processing():
+            print("⚠️ System may still be processing, proceeding anyway...")
+    
+    # Initialize Neo4j verifier for episode verification
+    print("🔍 Initializing Neo4j verifier...")
+    neo4j_verifier = Neo4jVerifier(username="neo4j", password="demodemo")
+    
+    successful_count = 0
+    error_count = 0
+    
+    from datetime import datetime
 
-        def ts() -> str:
-            """Return human-readable timestamp HH:MM:SS."""
-            return datetime.now().strftime('%H:%M:%S')
+    def ts() -> str:
+        """Return human-readable timestamp HH:MM:SS."""
+        return datetime.now().strftime('%H:%M:%S')
 
+    pending_compaction = 0
+    # Completed files are appended here instead of rewriting the list each time;
+    # the with block closes the log even if the loop is interrupted
+    with open(done_log_path(file_list_path), 'a', buffering=1) as done_log:
         for i, rel_file_path in enumerate(file_paths, 1):
             abs_file_path = os.path.abspath(rel_file_path)
             total = len(file_paths)
 
             # ---- PRE-FILE GPU CHECK ----
             print(f"\n[{ts()}] 🔍 Pre-file GPU check for {os.path.basename(abs_file_path)}")
-            if not wait_for_safe_processing():
+            if not await wait_for_safe_processing():
                 print(f"[{ts()}] ⚠️  Skipping {i}/{total} {os.path.basename(abs_file_path)} - GPU busy")
                 error_count += 1
                 continue
 
             # ---- LM Studio phase START ----
             print(f"[{ts()}] LM  ▶️  Start  {i}/{total}  {os.path.basename(abs_file_path)}", flush=True)
-            
+        
             try:
                 # STEP 1: LM Studio Operation (GPU-intensive)
                 # analyse file
-                file_info = get_file_info(abs_file_path, max_chars=max_chars)
+                # GPU monitoring keeps sampling while the request is in flight
+                lm_task = asyncio.create_task(get_file_info(session, abs_file_path, max_chars=max_chars))
+                file_info, gpu_data = await asyncio.gather(lm_task, monitor_gpu_until_done(lm_task))
                 print(f"[{ts()}] LM  ✅  Done   {i}/{total}  {os.path.basename(abs_file_path)}", flush=True)
-                
-                # Wait for GPU to be available for Graphiti
-                print(f"⏳ Waiting {lmstudio_delay}s for GPU to be available for Graphiti...")
-                time.sleep(lmstudio_delay)
-                
+            
+                # Wait for GPU to be available for Graphiti (skipped if the last sample was idle)
+                if gpu_data.get("is_processing", False):
+                    print("⏳ Waiting for GPU to be available for Graphiti...")
+                    await wait_for_safe_processing(check_interval=lmstudio_delay)
+            
                 # STEP 2: Graphiti Operation (GPU-intensive)
                 print("🔄 STEP 2: Adding memory to Graphiti...")
-                prompt = f"Please add a memory with the name '{abs_file_path}' and the following content: '{file_info}'"
-                
-                result = add_memory_via_lmstudio(
+                prompt = _ADD_MEMORY_PROMPT_TMPL.format(name=abs_file_path, content=file_info)
+            
+                result = await asyncio.to_thread(
+                    add_memory_via_lmstudio,
                     prompt, 
                     rate_limit_delay=0,  # No additional delay since we're controlling timing
                     check_queue=False    # We're doing manual queue monitoring
                 )
-                
+            
                 if "Memory added successfully" in result or "Memory queued for processing" in result:
                     print(f"✅ Memory queued: {abs_file_path}")
-                    
+                
                     # STEP 3: Wait for Graphiti to finish processing this specific episode
                     print("🔄 STEP 3: Waiting for Graphiti to process this episode...")
                     # Use GPU monitoring: wait for Ollama to be idle
-                    if wait_for_safe_processing():
+                    if await wait_for_safe_processing():
                         print(f"[{ts()}] GRA ✅  Done   {i}/{total}  {os.path.basename(abs_file_path)}", flush=True)
-                        
+                    
                         # STEP 4: Verify episode was actually stored in Neo4j
                         print("🔍 STEP 4: Verifying episode in Neo4j...")
-                        if check_episode_in_neo4j(abs_file_path, neo4j_verifier):
+                        if await asyncio.to_thread(check_episode_in_neo4j, abs_file_path, neo4j_verifier):
                             print(f"✅ Neo4j verification successful: {os.path.basename(abs_file_path)}")
-                            # Remove from processing list since it's confirmed in Neo4j
-                            remove_file_from_list(abs_file_path, file_list_path)
+                            # Record as done since it's confirmed in Neo4j
+                            done_log.write(abs_file_path + '\n')
+                            done.add(abs_file_path)
                             successful_count += 1
+                            pending_compaction += 1
+                            if pending_compaction >= COMPACT_EVERY:
+                                compact_file_list(file_list_path, done)
+                                pending_compaction = 0
                         else:
                             print(f"⚠️ Neo4j verification failed: {os.path.basename(abs_file_path)}")
                             print(f"⚠️ File will remain in list for retry: {os.path.basename(abs_file_path)}")
@@ -430,43 +551,38 @@ def process_file_list_with_proper_queue_monitoring(file_list_path: str = "file_l
                 else:
                     print(f"[{ts()}] GRA ❌  ERROR  {i}/{total}  {os.path.basename(abs_file_path)}", flush=True)
                     error_count += 1
-                    
+                
             except Exception as e:
                 print(f"[{ts()}] ⚠️  Unexpected error on {os.path.basename(abs_file_path)}: {e}", flush=True)
                 error_count += 1
-            
+        
             # Brief pause between files to ensure clean separation
             if i < len(file_paths):
                 print(f"[{ts()}] Waiting 2s before next file…", flush=True)
-                time.sleep(2)
-        
-        # Final summary
-        print(f"\n{'='*60}")
-        print(f"PROPER QUEUE MONITORING COMPLETE")
-        print(f"{'='*60}")
-        print(f"Total files: {len(file_paths)}")
-        print(f"Successful: {successful_count}")
-        print(f"Errors: {error_count}")
-        print(f"Success rate: {(successful_count/len(file_paths)*100):.1f}%")
-        print(f"GPU contention prevention: ✅ Proper queue monitoring completed")
-        
-        # Final queue status check
-        print(f"\n=== Final queue status check ===")
-        final_queue = check_queue_status()
-        print(f"Final queue status: {final_queue}")
-        
-        return {
-            "processed": len(file_paths),
-            "successful": successful_count,
-            "failed": error_count
-        }
-        
-    except FileNotFoundError:
-        print(f"File not found: {file_list_path}")
-        return {"processed": 0, "successful": 0, "failed": 1}
-    except Exception as e:
-        print(f"Error reading file list: {e}")
-        return {"processed": 0, "successful": 0, "failed": 1}
+                await asyncio.sleep(2)
+    
+    compact_file_list(file_list_path, done)
+    
+    # Final summary
+    print(f"\n{'='*60}")
+    print(f"PROPER QUEUE MONITORING COMPLETE")
+    print(f"{'='*60}")
+    print(f"Total files: {len(file_paths)}")
+    print(f"Successful: {successful_count}")
+    print(f"Errors: {error_count}")
+    print(f"Success rate: {(successful_count/len(file_paths)*100):.1f}%")
+    print(f"GPU contention prevention: ✅ Proper queue monitoring completed")
+    
+    # Final queue status check
+    print(f"\n=== Final queue status check ===")
+    final_queue = await check_queue_status(session)
+    print(f"Final queue status: {final_queue}")
+    
+    return {
+        "processed": len(file_paths),
+        "successful": successful_count,
+        "failed": error_count
+    }
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Batch memory adder with proper queue monitoring to avoid GPU contention.")
@@ -474,6 +590,7 @@ if __name__ == "__main__":
     parser.add_argument('--max-chars', type=int, default=2000, help='Maximum number of characters from each file to include in the prompt (default: 2000)')
     parser.add_argument('--lmstudio-delay', type=int, default=5, help='Delay after LM Studio operations in seconds (default: 5)')
     args = parser.parse_args()
+    configure_logging()
     
     process_file_list_with_proper_queue_monitoring(
         file_list_path=args.file_list, 
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Git Commit Parser
+
+Shared Git log reading, parsing and commit categorization used by the Git
+memory processors. Log output is requested in a machine-readable
+`--numstat` format and streamed from the git process commit by commit. The
+older processors' human-readable `--stat` log is read and parsed here too
+(get_stat_log_data / parse_stat_log).
+"""
+
+import re
+import subprocess
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# Machine-readable log layout: each commit starts with RS and header fields are
+# separated by US, followed by NUL-terminated `--numstat` rows ("ins\tdel\tpath").
+_RECORD_SEP = "\x1e"
+_FIELD_SEP = "\x1f"
+_GIT_LOG_FORMAT = "%x1e%H%x1f%an <%ae>%x1f%aI%x1f%B%x1f"
+_GIT_LOG_READ_SIZE = 64 * 1024
+
+# One anchored pattern classifies each `git log --stat --format=fuller --date=iso-strict`
+# line (see get_stat_log_data); the named group that matched (match.lastgroup)
+# selects the branch in parse_stat_log.
+LOG_LINE_RE = re.compile(
+    r"^(?:commit (?P<hash>\S+)"
+    r"|Author:\s+(?P<author>.*)"
+    r"|AuthorDate:\s+(?P<date>.*)"
+    r"|    (?P<message>(?!    ).*)"
+    r"| (?P<filename>\S.*?)\s+\|\s+(?P<change>.*))$"
+)
+# Change summary of a --stat row, e.g. "10 +++++-----"
+CHANGE_RE = re.compile(r"(\d+)\s*(\+*)(-*)")
+
+def get_git_log_data(repo_path: str, since: str = "1 week ago") -> Iterator[str]:
+    """
+    Stream Git log data for the specified repository and time period.
+    
+    Reads `git log` output incrementally from a pipe rather than capturing it
+    whole, yielding one raw record per commit (see _GIT_LOG_FORMAT). git runs
+    in its own session with no inherited descriptors or stdin, so it cannot
+    hold parent resources open or react to terminal signals meant for us.
+    """
+    try:
+        proc = subprocess.Popen(
+            ["git", "log", f"--since={since}", "-z", "--numstat", f"--format={_GIT_LOG_FORMAT}"],
+            cwd=repo_path,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            close_fds=True,
+            start_new_session=True,
+            text=True
+        )
+    except Exception as e:
+        print(f"Error getting Git log: {e}")
+        return
+    
+    with proc:
+        pending = ""
+        for chunk in iter(lambda: proc.stdout.read(_GIT_LOG_READ_SIZE), ""):
+            records = (pending + chunk).split(_RECORD_SEP)
+            pending = records.pop()
+            yield from records
+        if pending:
+            yield pending
+
+def _parse_numstat(numstat: str, commit: Dict) -> None:
+    """Add NUL-separated `--numstat -z` rows to a commit dict."""
+    entries = iter(numstat.split("\0"))
+    for entry in entries:
+        entry = entry.lstrip("\n")
+        if not entry:
+            continue
+        parts = entry.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        added, deleted, filename = parts
+        if not filename:
+            # Renames are emitted as "ins\tdel\t\0old\0new"; keep the new path
+            next(entries, "")
+            filename = next(entries, "")
+        # Binary files report "-" for both counts
+        insertions = int(added) if added != "-" else 0
+        deletions = int(deleted) if deleted != "-" else 0
+        commit['files_changed'].append({
+            'filename': filename,
+            'insertions': insertions,
+            'deletions': deletions
+        })
+        commit['insertions'] += insertions
+        commit['deletions'] += deletions
+
+def parse_git_log(git_log_output: Union[str, Iterable[str]]) -> List[Dict]:
+    """
+    Parse `git log -z --numstat` output (see _GIT_LOG_FORMAT) into structured commit data.
+    
+    Accepts either the full output string or an iterable of per-commit records
+    as yielded by get_git_log_data.
+    """
+    if isinstance(git_log_output, str):
+        git_log_output = git_log_output.split(_RECORD_SEP)
+    commits = []
+    
+    for record in git_log_output:
+        fields = record.split(_FIELD_SEP, 4)
+        if len(fields) < 4:
+            continue
+        commit_hash, author, date, message = fields[:4]
+        commit = {
+            'hash': commit_hash.strip(),
+            'author': author,
+            'date': date,
+            'message': message.strip() + '\n',
+            'files_changed': [],
+            'insertions': 0,
+            'deletions': 0
+        }
+        if len(fields) == 5:
+            _parse_numstat(fields[4], commit)
+        commits.append(commit)
+    
+    return commits
+
+def get_stat_log_data(repo_path: str, since: str = "1 week ago") -> str:
+    """
+    Get `git log --stat --format=fuller --date=iso-strict` output for the
+    specified repository and time period, as read by parse_stat_log.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "log", f"--since={since}", "--stat", "--format=fuller", "--date=iso-strict"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout
+    except Exception as e:
+        print(f"Error getting Git log: {e}")
+        return ""
+
+def parse_stat_log(git_log_output: str) -> List[Dict]:
+    """Parse get_stat_log_data output into structured commit data (see LOG_LINE_RE)."""
+    commits = []
+    current_commit = {}
+    lines = git_log_output.strip().split('\n')
+    
+    for line in lines:
+        match = LOG_LINE_RE.match(line)
+        if match is None:
+            continue
+        kind = match.lastgroup
+        
+        if kind == 'hash':
+            # Save previous commit if exists
+            if current_commit:
+                commits.append(current_commit)
+            
+            # Start new commit
+            commit_hash = match.group('hash')
+            current_commit = {
+                'hash': commit_hash,
+                'author': '',
+                'date': '',
+                'message': '',
+                'files_changed': [],
+                'insertions': 0,
+                'deletions': 0
+            }
+        
+        elif kind == 'author':
+            current_commit['author'] = match.group('author').strip()
+        
+        elif kind == 'date':
+            # Already ISO-8601 thanks to --date=iso-strict
+            current_commit['date'] = match.group('date').strip()
+        
+        elif kind == 'message':
+            # This is part of the commit message
+            current_commit['message'] += match.group('message').strip() + '\n'
+        
+        elif kind == 'change':
+            # This is a file change line like " src/file.js | 10 +++++-----"
+            filename = match.group('filename')
+            change_info = match.group('change').strip()
+            
+            # Parse change info like "10 +++++-----"
+            change_match = CHANGE_RE.match(change_info)
+            if change_match:
+                insertions = len(change_match.group(2))
+                deletions = len(change_match.group(3))
+                current_commit['files_changed'].append({
+                    'filename': filename,
+                    'insertions': insertions,
+                    'deletions': deletions
+                })
+                current_commit['insertions'] += insertions
+                current_commit['deletions'] += deletions
+    
+    # Add the last commit
+    if current_commit:
+        commits.append(current_commit)
+    
+    return commits
+
+# Commit categories in priority order; a message takes the first category with a keyword hit
+_COMMIT_CATEGORIES = [
+    ("bug_fix", frozenset({"fix", "bug", "resolve", "correct"})),
+    ("feature", frozenset({"feat", "add", "implement", "create"})),
+    ("documentation", frozenset({"docs", "documentation"})),
+    ("refactoring", frozenset({"refactor", "restructure"})),
+    ("cleanup", frozenset({"cleanup", "remove", "delete"})),
+]
+# Zero-width lookahead so overlapping keywords are all found in a single scan
+_COMMIT_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(sorted({kw for _, kws in _COMMIT_CATEGORIES for kw in kws})) + "))"
+)
+
+def categorize_commit(commit_message: str) -> str:
+    """Categorize commit based on its message."""
+    found = set(_COMMIT_KEYWORD_RE.findall(commit_message.lower()))
+    
+    for category, keywords in _COMMIT_CATEGORIES:
+        if found & keywords:
+            return category
+    return "other"
+
+def create_commit_memory_content(commit_data: Dict, category: Optional[str] = None) -> Dict:
+    """
+    Create structured memory content for a single commit.
+    
+    Returned as a dict so callers decide how (and how often) to serialize it.
+    """
+    if category is None:
+        category = categorize_commit(commit_data['message'])
+    
+    # Create structured memory content
+    memory_content = {
+        "commit_hash": commit_data['hash'],
+        "author": commit_data['author'],
+        "date": commit_data['date'],
+        "category": category,
+        "message": commit_data['message'].strip(),
+        "files_changed": commit_data['files_changed'],
+        "total_insertions": commit_data['insertions'],
+        "total_deletions": commit_data['deletions'],
+        "impact_summary": f"Modified {len(commit_data['files_changed'])} files with {commit_data['insertions']} insertions and {commit_data['deletions']} deletions"
+    }
+    
+    return memory_content
+
+def commit_memory_name(commit_data: Dict, category: str) -> str:
+    """Create the memory name for a single commit."""
+    return f"Git Commit: {commit_data['hash'][:8]} - {category.replace('_', ' ').title()}"
@@ -8,11 +8,14 @@ timestamp, allowing the knowledge graph to track the evolution of the codebase o
 """
 
 import json
-import subprocess
 import sys
 from datetime import datetime
 from typing import Dict, List, Optional
-import re
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from core.git_commit_parser import get_stat_log_data, parse_stat_log
 
 # Mock Graphiti MCP tool for now - in real implementation this would be the actual MCP tool
 def add_memory_to_graphiti(name: str, episode_body: str, source: str = "git_commit", 
@@ -39,86 +42,6 @@ def add_memory_to_graphiti(name: str, episode_body: str, source: str = "git_comm
     
     return {"result": {"message": f"Episode '{name}' queued for processing"}}
 
-def get_git_log_data(repo_path: str, since: str = "1 week ago") -> str:
-    """Get Git log data for the specified repository and time period."""
-    try:
-        result = subprocess.run(
-            ["git", "log", f"--since={since}", "--stat", "--format=fuller"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True
-        )
-        return result.stdout
-    except Exception as e:
-        print(f"Error getting Git log: {e}")
-        return ""
-
-def parse_git_log(git_log_output: str) -> List[Dict]:
-    """Parse Git log output into structured commit data."""
-    commits = []
-    current_commit = {}
-    lines = git_log_output.strip().split('\n')
-    
-    for line in lines:
-        if line.startswith('commit '):
-            # Save previous commit if exists
-            if current_commit:
-                commits.append(current_commit)
-            
-            # Start new commit
-            commit_hash = line.split()[1]
-            current_commit = {
-                'hash': commit_hash,
-                'author': '',
-                'date': '',
-                'message': '',
-                'files_changed': [],
-                'insertions': 0,
-                'deletions': 0
-            }
-        
-        elif line.startswith('Author: '):
-            current_commit['author'] = line.replace('Author: ', '').strip()
-        
-        elif line.startswith('Date: '):
-            date_str = line.replace('Date: ', '').strip()
-            try:
-                # Parse date string like "Sun Aug 3 22:41:25 2025 -0400"
-                dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                current_commit['date'] = dt.isoformat()
-            except:
-                current_commit['date'] = date_str
-        
-        elif line.startswith('    ') and not line.startswith('    ' * 2):
-            # This is part of the commit message
-            current_commit['message'] += line.strip() + '\n'
-        
-        elif line and not line.startswith(' ') and '|' in line:
-            # This is a file change line like "src/file.js | 10 +++++-----"
-            parts = line.split('|')
-            if len(parts) == 2:
-                filename = parts[0].strip()
-                change_info = parts[1].strip()
-                
-                # Parse change info like "10 +++++-----"
-                change_match = re.match(r'(\d+)\s*(\+*)(-*)', change_info)
-                if change_match:
-                    insertions = len(change_match.group(2))
-                    deletions = len(change_match.group(3))
-                    current_commit['files_changed'].append({
-                        'filename': filename,
-                        'insertions': insertions,
-                        'deletions': deletions
-                    })
-                    current_commit['insertions'] += insertions
-                    current_commit['deletions'] += deletions
-    
-    # Add the last commit
-    if current_commit:
-        commits.append(current_commit)
-    
-    return commits
-
 def categorize_commit(commit_message: str) -> str:
     """Categorize commit based on its message."""
     message_lower = commit_message.lower()
@@ -173,13 +96,13 @@ def process_git_commits_to_memories(repo_path: str, since: str = "1 week ago") -
     print(f"Processing Git commits from {repo_path} since {since}...")
     
     # Get Git log data
-    git_log = get_git_log_data(repo_path, since)
+    git_log = get_stat_log_data(repo_path, since)
     if not git_log:
         print("No Git log data found.")
         return []
     
     # Parse commits
-    commits = parse_git_log(git_log)
+    commits = parse_stat_log(git_log)
     print(f"Found {len(commits)} commits to process.")
     
     # Create memories for each commit
@@ -16,10 +16,11 @@ import time
 import requests
 from datetime import datetime
 from typing import Dict, List, Optional
-import re
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from core.git_commit_parser import get_stat_log_data, parse_stat_log
+from utils.status_utils import print_wait_status
 
 def check_ollama_gpu_usage() -> dict:
     """
@@ -29,41 +30,34 @@ def check_ollama_gpu_usage() -> dict:
         Dictionary with GPU usage information
     """
     try:
-        # Get Ollama container stats
+        # Get Ollama container stats, one JSON object per line
         result = subprocess.run([
-            "docker", "stats", "--no-stream", "--format", 
-            "table {{.Name}}\t{{.CPUPerc}}\t{{.MemUsage}}"
+            "docker", "stats", "--no-stream", "--format", "{{json .}}", "graphiti-ollama-1"
         ], capture_output=True, text=True, timeout=10)
         
         if result.returncode != 0:
             return {"error": f"Docker stats failed: {result.stderr}", "is_processing": False}
         
         # Parse the output to find Ollama container
-        lines = result.stdout.strip().split('\n')
-        for line in lines:
-            if 'graphiti-ollama-1' in line:
-                # Split by multiple spaces and filter out empty strings
-                parts = [part for part in line.split('  ') if part.strip()]
-                if len(parts) >= 3:
-                    container_name = parts[0].strip()
-                    cpu_percent = parts[1].strip().replace('%', '')
-                    mem_usage = parts[2].strip()
-                    
-                    # Convert CPU percentage to float
-                    try:
-                        cpu_float = float(cpu_percent)
-                        # Consider "processing" if CPU > 1% (above idle threshold)
-                        is_processing = cpu_float > 1.0
-                        
-                        return {
-                            "container": container_name,
-                            "cpu_percent": cpu_float,
-                            "memory_usage": mem_usage,
-                            "is_processing": is_processing,
-                            "error": None
-                        }
-                    except ValueError:
-                        return {"error": f"Invalid CPU value: {cpu_percent}", "is_processing": False}
+        for line in result.stdout.splitlines():
+            stats = json.loads(line)
+            if stats.get("Name") == "graphiti-ollama-1":
+                cpu_percent = stats.get("CPUPerc", "").rstrip('%')
+                
+                # Convert CPU percentage to float
+                try:
+                    cpu_float = float(cpu_percent)
+                except ValueError:
+                    return {"error": f"Invalid CPU value: {cpu_percent}", "is_processing": False}
+                
+                return {
+                    "container": stats["Name"],
+                    "cpu_percent": cpu_float,
+                    "memory_usage": stats.get("MemUsage", ""),
+                    # Consider "processing" if CPU > 1% (above idle threshold)
+                    "is_processing": cpu_float > 1.0,
+                    "error": None
+                }
         
         return {"error": "Ollama container not found", "is_processing": False}
         
@@ -84,6 +78,7 @@ def wait_for_safe_processing(check_interval: int = 5) -> bool:
     """
     print("🔍 GPU MONITORING: Waiting for Ollama to be idle...")
     
+    polls = 0
     while True:
         gpu_data = check_ollama_gpu_usage()
         
@@ -98,89 +93,10 @@ def wait_for_safe_processing(check_interval: int = 5) -> bool:
             return True
         else:
             cpu_percent = gpu_data.get("cpu_percent", 0)
-            print(f"\r⏳ GPU busy (CPU: {cpu_percent:.1f}%) – waiting...", end="", flush=True)
+            print_wait_status(f"GPU busy (CPU: {cpu_percent:.1f}%) – waiting...", polls)
+            polls += 1
             time.sleep(check_interval)
 
-def get_git_log_data(repo_path: str, since: str = "1 week ago") -> str:
-    """Get Git log data for the specified repository and time period."""
-    try:
-        result = subprocess.run(
-            ["git", "log", f"--since={since}", "--stat", "--format=fuller"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True
-        )
-        return result.stdout
-    except Exception as e:
-        print(f"Error getting Git log: {e}")
-        return ""
-
-def parse_git_log(git_log_output: str) -> List[Dict]:
-    """Parse Git log output into structured commit data."""
-    commits = []
-    current_commit = {}
-    lines = git_log_output.strip().split('\n')
-    
-    for line in lines:
-        if line.startswith('commit '):
-            # Save previous commit if exists
-            if current_commit:
-                commits.append(current_commit)
-            
-            # Start new commit
-            commit_hash = line.split()[1]
-            current_commit = {
-                'hash': commit_hash,
-                'author': '',
-                'date': '',
-                'message': '',
-                'files_changed': [],
-                'insertions': 0,
-                'deletions': 0
-            }
-        
-        elif line.startswith('Author: '):
-            current_commit['author'] = line.replace('Author: ', '').strip()
-        
-        elif line.startswith('Date: '):
-            date_str = line.replace('Date: ', '').strip()
-            try:
-                # Parse date string like "Sun Aug 3 22:41:25 2025 -0400"
-                dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                current_commit['date'] = dt.isoformat()
-            except:
-                current_commit['date'] = date_str
-        
-        elif line.startswith('    ') and not line.startswith('    ' * 2):
-            # This is part of the commit message
-            current_commit['message'] += line.strip() + '\n'
-        
-        elif line and not line.startswith(' ') and '|' in line:
-            # This is a file change line like "src/file.js | 10 +++++-----"
-            parts = line.split('|')
-            if len(parts) == 2:
-                filename = parts[0].strip()
-                change_info = parts[1].strip()
-                
-                # Parse change info like "10 +++++-----"
-                change_match = re.match(r'(\d+)\s*(\+*)(-*)', change_info)
-                if change_match:
-                    insertions = len(change_match.group(2))
-                    deletions = len(change_match.group(3))
-                    current_commit['files_changed'].append({
-                        'filename': filename,
-                        'insertions': insertions,
-                        'deletions': deletions
-                    })
-                    current_commit['insertions'] += insertions
-                    current_commit['deletions'] += deletions
-    
-    # Add the last commit
-    if current_commit:
-        commits.append(current_commit)
-    
-    return commits
-
 def categorize_commit(commit_message: str) -> str:
     """Categorize commit based on its message."""
     message_lower = commit_message.lower()
@@ -276,13 +192,13 @@ def process_git_commits_with_gpu_monitoring(repo_path: str, since: str = "1 week
     print(f"GPU contention prevention: {lmstudio_delay}s delay between operations")
     
     # Get Git log data
-    git_log = get_git_log_data(repo_path, since)
+    git_log = get_stat_log_data(repo_path, since)
     if not git_log:
         print("No Git log data found.")
         return []
     
     # Parse commits
-    commits = parse_git_log(git_log)
+    commits = parse_stat_log(git_log)
     print(f"Found {len(commits)} commits to process.")
     
     # Wait for safe processing before starting
@@ -16,15 +16,31 @@ import subprocess
 import sys
 import os
 import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
-import re
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-from core.memory_adder import add_memory_via_lmstudio
-from utils.neo4j_utils import Neo4jVerifier
+from core.git_commit_parser import (
+    categorize_commit,
+    commit_memory_name,
+    create_commit_memory_content,
+    get_git_log_data,
+    parse_git_log,
+)
+from core.memory_adder import add_memories_batch
+from utils.neo4j_utils import Neo4jVerifier, configure_logging
+from utils.status_utils import print_wait_status
+
+# Shared keep-alive session so repeated polls reuse pooled localhost connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                      max_retries=Retry(total=2, backoff_factor=0.2)))
 
 def check_queue_status() -> dict:
     """
@@ -32,56 +48,195 @@ def check_queue_status() -> dict:
     Returns dict with queue information.
     """
     try:
-        response = requests.get("http://localhost:8100/queue/status", timeout=10)
+        response = _SESSION.get("http://localhost:8100/queue/status", timeout=10)
         response.raise_for_status()
         return response.json()
     except Exception as e:
         print(f"⚠️ Error checking queue status: {e}")
         return {"group_queues": {}}
 
+OLLAMA_CONTAINER = "graphiti-ollama-1"
+
+# Container PID resolved once via `docker inspect`; cleared if the process goes away
+_ollama_pid: Optional[int] = None
+# Whether the container's processes are visible in this host's /proc. Turned off
+# for good once the PID turns out to belong to another namespace (Docker Desktop
+# or any VM-backed engine), so later polls go straight to `docker stats`
+_proc_sampling = os.path.isdir("/proc")
+# Last (cpu_usage_usec, monotonic_time) sample used to compute CPU% between calls
+_last_cpu_sample: Optional[tuple] = None
+# Samples older than this are discarded and a fresh short window is measured
+_CPU_SAMPLE_MAX_AGE = 10.0
+_CPU_SAMPLE_WINDOW = 0.2
+
+class _ProcSamplingUnavailable(RuntimeError):
+    """The container's PID does not refer to its process in this host's /proc."""
+
+def _get_ollama_pid() -> int:
+    """
+    Resolve (and cache) the host PID of the Ollama container's init process.
+    
+    The PID is only trusted if /proc/<pid>/cgroup names the container ID;
+    otherwise /proc sampling is disabled for the rest of the run.
+    
+    Raises:
+        FileNotFoundError: If the container is not running
+        _ProcSamplingUnavailable: If the PID is from another process namespace
+    """
+    global _ollama_pid, _proc_sampling
+    if _ollama_pid is None:
+        result = subprocess.run(
+            ["docker", "inspect", "-f", "{{.State.Pid}} {{.Id}}", OLLAMA_CONTAINER],
+            capture_output=True, text=True, timeout=10
+        )
+        pid_text, _, container_id = result.stdout.strip().partition(" ")
+        pid = int(pid_text or 0) if result.returncode == 0 else 0
+        if pid <= 0:
+            raise FileNotFoundError(f"No running process for {OLLAMA_CONTAINER}")
+        try:
+            with open(f"/proc/{pid}/cgroup") as f:
+                owned = bool(container_id) and container_id in f.read()
+        except OSError:
+            owned = False
+        if not owned:
+            _proc_sampling = False
+            print(f"⚠️ {OLLAMA_CONTAINER} is not visible in this host's /proc - using docker stats")
+            raise _ProcSamplingUnavailable(f"PID {pid} is not in container {container_id[:12]}")
+        _ollama_pid = pid
+    return _ollama_pid
+
+def _read_container_cpu_usec(pid: int) -> tuple:
+    """
+    Read cumulative CPU time for the container owning `pid`.
+    
+    Prefers the cgroup v2 `cpu.stat` (covers every process in the container,
+    including model runners); falls back to utime+stime from /proc/<pid>/stat.
+    
+    Returns:
+        Tuple of (cpu_usage_usec, memory_usage string)
+    """
+    with open(f"/proc/{pid}/cgroup") as f:
+        cgroup_path = f.readline().strip().split("::", 1)[-1]
+    cgroup_dir = f"/sys/fs/cgroup{cgroup_path}"
+    try:
+        with open(f"{cgroup_dir}/cpu.stat") as f:
+            usage_usec = int(f.readline().split()[1])
+        with open(f"{cgroup_dir}/memory.current") as f:
+            memory_usage = f"{int(f.read()) / (1024 * 1024):.1f}MiB"
+        return usage_usec, memory_usage
+    except (FileNotFoundError, IndexError, ValueError):
+        pass
+    
+    with open(f"/proc/{pid}/stat") as f:
+        # Fields after the parenthesised command name; utime/stime are fields 14/15
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = int(fields[11]) + int(fields[12])
+    return ticks * 1_000_000 // os.sysconf("SC_CLK_TCK"), "n/a"
+
+def _check_ollama_cpu_from_proc() -> dict:
+    """Compute Ollama CPU% from two cgroup/proc samples without spawning docker stats."""
+    global _ollama_pid, _last_cpu_sample
+    try:
+        pid = _get_ollama_pid()
+        now = time.monotonic()
+        if _last_cpu_sample is None or now - _last_cpu_sample[1] > _CPU_SAMPLE_MAX_AGE:
+            _last_cpu_sample = (_read_container_cpu_usec(pid)[0], now)
+            time.sleep(_CPU_SAMPLE_WINDOW)
+            now = time.monotonic()
+        usage_usec, memory_usage = _read_container_cpu_usec(pid)
+    except (FileNotFoundError, ProcessLookupError):
+        # Container restarted or stopped; re-resolve the PID next time
+        _ollama_pid = None
+        _last_cpu_sample = None
+        raise
+    
+    prev_usec, prev_time = _last_cpu_sample
+    _last_cpu_sample = (usage_usec, now)
+    elapsed_usec = max((now - prev_time) * 1_000_000, 1.0)
+    cpu_float = (usage_usec - prev_usec) * 100.0 / elapsed_usec
+    
+    return {
+        "container": OLLAMA_CONTAINER,
+        "cpu_percent": cpu_float,
+        "memory_usage": memory_usage,
+        # Consider "processing" if CPU > 1% (above idle threshold)
+        "is_processing": cpu_float > 1.0,
+        "error": None
+    }
+
+# Single-flight cache so concurrent workers share one GPU observation
+_GPU_LOCK = threading.Lock()
+_GPU_CACHE = (0.0, None)
+_GPU_CACHE_TTL = 0.2
+
 def check_ollama_gpu_usage() -> dict:
     """
-    Check if Ollama is currently using GPU resources by monitoring docker stats.
+    Check if Ollama is currently using GPU resources.
+    
+    Observations are shared between callers for _GPU_CACHE_TTL seconds, so
+    concurrent worker threads trigger at most one sample between them.
     
     Returns:
         Dictionary with GPU usage information
     """
+    global _GPU_CACHE
+    ts, cached = _GPU_CACHE
+    if cached is not None and time.monotonic() - ts < _GPU_CACHE_TTL:
+        return cached
+    with _GPU_LOCK:
+        ts, cached = _GPU_CACHE
+        if cached is not None and time.monotonic() - ts < _GPU_CACHE_TTL:
+            return cached
+        result = _sample_ollama_gpu_usage()
+        _GPU_CACHE = (time.monotonic(), result)
+        return result
+
+def _sample_ollama_gpu_usage() -> dict:
+    """
+    Take a fresh sample of Ollama's resource usage.
+    
+    Reads the container's CPU counters directly from /sys/fs/cgroup or /proc
+    on Linux hosts, and falls back to `docker stats` where those are not
+    visible (e.g. Docker Desktop).
+    
+    Returns:
+        Dictionary with GPU usage information
+    """
+    if _proc_sampling:
+        try:
+            return _check_ollama_cpu_from_proc()
+        except (_ProcSamplingUnavailable, OSError, subprocess.SubprocessError, ValueError, IndexError):
+            pass
+    
     try:
-        # Get Ollama container stats
+        # Get Ollama container stats, one JSON object per line
         result = subprocess.run([
-            "docker", "stats", "--no-stream", "--format", 
-            "table {{.Name}}\t{{.CPUPerc}}\t{{.MemUsage}}"
+            "docker", "stats", "--no-stream", "--format", "{{json .}}", OLLAMA_CONTAINER
         ], capture_output=True, text=True, timeout=10)
         
         if result.returncode != 0:
             return {"error": f"Docker stats failed: {result.stderr}", "is_processing": False}
         
         # Parse the output to find Ollama container
-        lines = result.stdout.strip().split('\n')
-        for line in lines:
-            if 'graphiti-ollama-1' in line:
-                # Split by multiple spaces and filter out empty strings
-                parts = [part for part in line.split('  ') if part.strip()]
-                if len(parts) >= 3:
-                    container_name = parts[0].strip()
-                    cpu_percent = parts[1].strip().replace('%', '')
-                    mem_usage = parts[2].strip()
-                    
-                    # Convert CPU percentage to float
-                    try:
-                        cpu_float = float(cpu_percent)
-                        # Consider "processing" if CPU > 1% (above idle threshold)
-                        is_processing = cpu_float > 1.0
-                        
-                        return {
-                            "container": container_name,
-                            "cpu_percent": cpu_float,
-                            "memory_usage": mem_usage,
-                            "is_processing": is_processing,
-                            "error": None
-                        }
-                    except ValueError:
-                        return {"error": f"Invalid CPU value: {cpu_percent}", "is_processing": False}
+        for line in result.stdout.splitlines():
+            stats = json.loads(line)
+            if stats.get("Name") == OLLAMA_CONTAINER:
+                cpu_percent = stats.get("CPUPerc", "").rstrip('%')
+                
+                # Convert CPU percentage to float
+                try:
+                    cpu_float = float(cpu_percent)
+                except ValueError:
+                    return {"error": f"Invalid CPU value: {cpu_percent}", "is_processing": False}
+                
+                return {
+                    "container": stats["Name"],
+                    "cpu_percent": cpu_float,
+                    "memory_usage": stats.get("MemUsage", ""),
+                    # Consider "processing" if CPU > 1% (above idle threshold)
+                    "is_processing": cpu_float > 1.0,
+                    "error": None
+                }
         
         return {"error": "Ollama container not found", "is_processing": False}
         
@@ -104,6 +259,7 @@ def wait_for_ollama_idle(timeout: int = 300, check_interval: int = 5) -> bool:
     print("🔍 Checking Ollama GPU usage...")
     start_time = time.time()
     
+    polls = 0
     while time.time() - start_time < timeout:
         gpu_data = check_ollama_gpu_usage()
         
@@ -120,26 +276,49 @@ def wait_for_ollama_idle(timeout: int = 300, check_interval: int = 5) -> bool:
         else:
             elapsed = int(time.time() - start_time)
             cpu_percent = gpu_data.get("cpu_percent", 0)
-            print(f"\r⏳ Ollama processing (CPU: {cpu_percent:.1f}%) – waiting... ({elapsed}s)", end="", flush=True)
+            print_wait_status(f"Ollama processing (CPU: {cpu_percent:.1f}%) – waiting... ({elapsed}s)", polls)
+            polls += 1
             time.sleep(check_interval)
     
     print(f"\n⚠️ Ollama GPU timeout after {timeout}s")
     return False
 
-def wait_for_safe_processing(check_interval: int = 5) -> bool:
+# Monotonic time of the last idle observation; a wait within _IDLE_TTL of it returns at once
+_LAST_IDLE_AT = 0.0
+_IDLE_TTL = 0.5
+
+def _mark_idle() -> None:
+    """Record that the GPU was just observed idle."""
+    global _LAST_IDLE_AT
+    _LAST_IDLE_AT = time.monotonic()
+
+def wait_for_safe_processing(check_interval: float = 5, min_interval: float = 0.2,
+                             backoff: float = 1.5) -> bool:
     """
     Simplified approach: Wait for Ollama to be idle (GPU monitoring only).
     Since queue status API is broken, we rely on GPU monitoring.
     No artificial timeout - let natural system timeouts handle it.
     
+    Polls quickly at first and backs off exponentially while the GPU stays
+    busy, so short busy periods are noticed fast without hammering the GPU
+    check during long ones. Returns immediately if the GPU was seen idle
+    within the last _IDLE_TTL seconds (e.g. by the previous call in a burst).
+    
     Args:
-        check_interval: How often to check in seconds
+        check_interval: Maximum time between checks in seconds
+        min_interval: Initial time between checks in seconds
+        backoff: Factor the interval grows by after each busy observation
     
     Returns:
         True when GPU is idle, False if interrupted
     """
+    if time.monotonic() - _LAST_IDLE_AT < _IDLE_TTL:
+        return True
+    
     print("🔍 GPU MONITORING: Waiting for Ollama to be idle...")
+    interval = min_interval
     
+    polls = 0
     while True:
         gpu_data = check_ollama_gpu_usage()
         
@@ -149,186 +328,157 @@ def wait_for_safe_processing(check_interval: int = 5) -> bool:
             return True
         
         if not gpu_data.get("is_processing", False):
+            _mark_idle()
             cpu_percent = gpu_data.get("cpu_percent", 0)
             print(f"✅ GPU available (CPU: {cpu_percent:.1f}%)")
             return True
         else:
             cpu_percent = gpu_data.get("cpu_percent", 0)
-            print(f"\r⏳ GPU busy (CPU: {cpu_percent:.1f}%) – waiting...", end="", flush=True)
-            time.sleep(check_interval)
-
-def get_git_log_data(repo_path: str, since: str = "1 week ago") -> str:
-    """Get Git log data for the specified repository and time period."""
-    try:
-        result = subprocess.run(
-            ["git", "log", f"--since={since}", "--stat", "--format=fuller"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True
-        )
-        return result.stdout
-    except Exception as e:
-        print(f"Error getting Git log: {e}")
-        return ""
+            print_wait_status(f"GPU busy (CPU: {cpu_percent:.1f}%) – waiting...", polls)
+            polls += 1
+            time.sleep(interval)
+            interval = min(interval * backoff, check_interval)
 
-def parse_git_log(git_log_output: str) -> List[Dict]:
-    """Parse Git log output into structured commit data."""
-    commits = []
-    current_commit = {}
-    lines = git_log_output.strip().split('\n')
-    
-    for line in lines:
-        if line.startswith('commit '):
-            # Save previous commit if exists
-            if current_commit:
-                commits.append(current_commit)
-            
-            # Start new commit
-            commit_hash = line.split()[1]
-            current_commit = {
-                'hash': commit_hash,
-                'author': '',
-                'date': '',
-                'message': '',
-                'files_changed': [],
-                'insertions': 0,
-                'deletions': 0
-            }
-        
-        elif line.startswith('Author: '):
-            current_commit['author'] = line.replace('Author: ', '').strip()
-        
-        elif line.startswith('Date: '):
-            date_str = line.replace('Date: ', '').strip()
-            try:
-                # Parse date string like "Sun Aug 3 22:41:25 2025 -0400"
-                dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                current_commit['date'] = dt.isoformat()
-            except:
-                current_commit['date'] = date_str
-        
-        elif line.startswith('    ') and not line.startswith('    ' * 2):
-            # This is part of the commit message
-            current_commit['message'] += line.strip() + '\n'
-        
-        elif line and not line.startswith(' ') and '|' in line:
-            # This is a file change line like "src/file.js | 10 +++++-----"
-            parts = line.split('|')
-            if len(parts) == 2:
-                filename = parts[0].strip()
-                change_info = parts[1].strip()
-                
-                # Parse change info like "10 +++++-----"
-                change_match = re.match(r'(\d+)\s*(\+*)(-*)', change_info)
-                if change_match:
-                    insertions = len(change_match.group(2))
-                    deletions = len(change_match.group(3))
-                    current_commit['files_changed'].append({
-                        'filename': filename,
-                        'insertions': insertions,
-                        'deletions': deletions
-                    })
-                    current_commit['insertions'] += insertions
-                    current_commit['deletions'] += deletions
-    
-    # Add the last commit
-    if current_commit:
-        commits.append(current_commit)
-    
-    return commits
+def monitor_gpu_idle(gpu_idle: threading.Event, stop: threading.Event, check_interval: float = 1) -> None:
+    """
+    Keep `gpu_idle` in sync with Ollama's observed GPU state until `stop` is set.
+    
+    Args:
+        gpu_idle: Event set while the GPU is idle and cleared while it is busy
+        stop: Event that ends the monitor loop
+        check_interval: How often to sample GPU usage in seconds
+    """
+    while not stop.is_set():
+        gpu_data = check_ollama_gpu_usage()
+        # If we can't check GPU usage, treat it as idle (same as wait_for_safe_processing)
+        if gpu_data.get("error") or not gpu_data.get("is_processing", False):
+            _mark_idle()
+            gpu_idle.set()
+        else:
+            gpu_idle.clear()
+        stop.wait(check_interval)
 
-def categorize_commit(commit_message: str) -> str:
-    """Categorize commit based on its message."""
-    message_lower = commit_message.lower()
-    
-    if any(word in message_lower for word in ['fix', 'bug', 'resolve', 'correct']):
-        return "bug_fix"
-    elif any(word in message_lower for word in ['feat', 'add', 'implement', 'create']):
-        return "feature"
-    elif any(word in message_lower for word in ['docs', 'documentation']):
-        return "documentation"
-    elif any(word in message_lower for word in ['refactor', 'restructure']):
-        return "refactoring"
-    elif any(word in message_lower for word in ['cleanup', 'remove', 'delete']):
-        return "cleanup"
-    else:
-        return "other"
+# Workers take turns claiming an idle observation, so a single `gpu_idle.set()`
+# releases one batch instead of every blocked worker at once
+_SUBMIT_LOCK = threading.Lock()
+# Longest wait on the monitor's event before polling the GPU directly (the
+# monitor thread may have died)
+_GPU_IDLE_WAIT_TIMEOUT = 60.0
 
-def create_commit_memory_content(commit_data: Dict) -> str:
-    """Create structured memory content for a single commit."""
-    category = categorize_commit(commit_data['message'])
-    
-    # Create structured memory content
-    memory_content = {
-        "commit_hash": commit_data['hash'],
-        "author": commit_data['author'],
-        "date": commit_data['date'],
-        "category": category,
-        "message": commit_data['message'].strip(),
-        "files_changed": commit_data['files_changed'],
-        "total_insertions": commit_data['insertions'],
-        "total_deletions": commit_data['deletions'],
-        "impact_summary": f"Modified {len(commit_data['files_changed'])} files with {commit_data['insertions']} insertions and {commit_data['deletions']} deletions"
-    }
+def _claim_gpu_idle(gpu_idle: threading.Event) -> bool:
+    """
+    Wait until the GPU is idle and claim that observation for one batch.
+    
+    Args:
+        gpu_idle: Event driven by monitor_gpu_idle
     
-    return json.dumps(memory_content, indent=2)
+    Returns:
+        True when the caller may submit, False if the GPU never became available
+    """
+    with _SUBMIT_LOCK:
+        if not gpu_idle.wait(timeout=_GPU_IDLE_WAIT_TIMEOUT):
+            print(f"⚠️ No idle signal from the GPU monitor in {_GPU_IDLE_WAIT_TIMEOUT:.0f}s - polling directly")
+            if not wait_for_safe_processing():
+                return False
+        # The next worker has to wait for the monitor to observe idle again
+        gpu_idle.clear()
+        return True
 
-def add_commit_to_graphiti_with_gpu_monitoring(commit_data: Dict, lmstudio_delay: int = 5) -> bool:
-    """Add a single commit to Graphiti using GPU monitoring."""
-    try:
+def add_commits_to_graphiti_with_gpu_monitoring(commits: List[Dict],
+                                                gpu_idle: Optional[threading.Event] = None) -> List[bool]:
+    """
+    Add a batch of commits to Graphiti over one MCP session using GPU monitoring.
+    
+    Args:
+        commits: Parsed commit dicts
+        gpu_idle: Event driven by monitor_gpu_idle; when omitted the GPU is polled directly
+    
+    Returns:
+        One success flag per commit, in input order
+    """
+    memories = []
+    for commit_data in commits:
         category = categorize_commit(commit_data['message'])
-        memory_name = f"Git Commit: {commit_data['hash'][:8]} - {category.replace('_', ' ').title()}"
-        episode_body = create_commit_memory_content(commit_data)
+        memory_name = commit_memory_name(commit_data, category)
+        episode_body = create_commit_memory_content(commit_data, category)
+        memories.append((memory_name, episode_body))
         
         print(f"Adding memory to Graphiti: {memory_name}")
         print(f"Commit: {commit_data['hash'][:8]}")
         print(f"Date: {commit_data['date']}")
         print(f"Category: {category}")
         print(f"Files changed: {len(commit_data['files_changed'])}")
-        
-        # Wait for safe processing conditions (GPU idle)
-        if not wait_for_safe_processing():
-            print(f"⚠️ Skipping commit {commit_data['hash'][:8]} - GPU busy")
-            return False
-        
-        # Add memory using the existing infrastructure
-        prompt = f"Please add a memory with the name '{memory_name}' and the following content: '{episode_body}'"
-        
-        result = add_memory_via_lmstudio(
-            prompt, 
-            rate_limit_delay=0,  # No additional delay since we're controlling timing
-            check_queue=False    # We're doing manual queue monitoring
-        )
-        
+    
+    # Wait for safe processing conditions (GPU idle)
+    if gpu_idle is not None:
+        if not _claim_gpu_idle(gpu_idle):
+            print(f"⚠️ Skipping {len(commits)} commits - GPU busy")
+            return [False] * len(commits)
+    elif not wait_for_safe_processing():
+        print(f"⚠️ Skipping {len(commits)} commits - GPU busy")
+        return [False] * len(commits)
+    
+    # One MCP session for the whole batch
+    results = add_memories_batch(memories)
+    
+    successes = []
+    for (memory_name, _), result in zip(memories, results):
         if "Memory added successfully" in result or "Memory queued for processing" in result:
             print(f"✅ Memory queued: {memory_name}")
-            
-            # Wait for GPU to be available for next operation
-            print(f"⏳ Waiting {lmstudio_delay}s for GPU to be available...")
-            time.sleep(lmstudio_delay)
-            
-            return True
+            successes.append(True)
         else:
-            print(f"❌ Failed to add memory: {memory_name}")
-            return False
-        
-    except Exception as e:
-        print(f"Error adding commit {commit_data['hash'][:8]} to Graphiti: {e}")
-        return False
+            print(f"❌ Failed to add memory: {memory_name} ({result})")
+            successes.append(False)
+    return successes
 
-def process_git_commits_with_gpu_monitoring(repo_path: str, since: str = "1 week ago", lmstudio_delay: int = 5) -> List[Dict]:
-    """Process Git commits and add each one to Graphiti with GPU monitoring."""
+def add_commit_to_graphiti_with_gpu_monitoring(commit_data: Dict, gpu_idle: Optional[threading.Event] = None) -> bool:
+    """
+    Add a single commit to Graphiti using GPU monitoring.
+    
+    Args:
+        commit_data: Parsed commit dict
+        gpu_idle: Event driven by monitor_gpu_idle; when omitted the GPU is polled directly
+    """
+    return add_commits_to_graphiti_with_gpu_monitoring([commit_data], gpu_idle)[0]
+
+def process_git_commits_with_gpu_monitoring(repo_path: str, output_file: str, since: str = "1 week ago",
+                                            check_interval: float = 1, max_workers: int = 2,
+                                            batch_size: int = 4) -> int:
+    """
+    Process Git commits and add each one to Graphiti with GPU monitoring.
+    
+    Commits are submitted in small batches (one MCP session each) by a
+    worker pool; each worker parks on a GPU-idle event maintained by a
+    background monitor thread instead of sleeping a fixed delay between
+    commits.
+    
+    Successful commits are appended to `output_file` (a JSON array) as soon
+    as their batch completes, so progress survives an interrupted run and
+    successful commits are not accumulated in memory. On Ctrl-C, queued
+    batches are cancelled and any batch that already finished is still
+    recorded before the array is closed.
+    
+    Args:
+        repo_path: Path to the Git repository
+        output_file: Path of the JSON file successful commits are written to
+        since: Git `--since` expression
+        check_interval: GPU monitor poll interval in seconds
+        max_workers: Maximum number of batches submitted concurrently
+        batch_size: Commits added per MCP session
+    
+    Returns:
+        Number of commits successfully added
+    """
     print(f"Processing Git commits from {repo_path} since {since}...")
-    print(f"GPU contention prevention: {lmstudio_delay}s delay between operations")
+    print(f"GPU contention prevention: polling every {check_interval}s, {max_workers} workers, "
+          f"batches of {batch_size}")
     
-    # Get Git log data
-    git_log = get_git_log_data(repo_path, since)
-    if not git_log:
+    # Stream and parse Git log data
+    commits = parse_git_log(get_git_log_data(repo_path, since))
+    if not commits:
         print("No Git log data found.")
-        return []
+        return 0
     
-    # Parse commits
-    commits = parse_git_log(git_log)
     print(f"Found {len(commits)} commits to process.")
     
     # Wait for safe processing before starting
@@ -336,38 +486,83 @@ def process_git_commits_with_gpu_monitoring(repo_path: str, since: str = "1 week
     if not wait_for_safe_processing():
         print("⚠️ System may still be processing, proceeding anyway...")
     
-    # Add each commit to Graphiti with GPU monitoring
-    successful_memories = []
-    for i, commit in enumerate(commits, 1):
-        print(f"\n=== Processing commit {i}/{len(commits)}: {commit['hash'][:8]} ===")
+    # Add commits to Graphiti while the monitor thread tracks GPU idleness
+    gpu_idle = threading.Event()
+    stop_monitor = threading.Event()
+    monitor = threading.Thread(target=monitor_gpu_idle, args=(gpu_idle, stop_monitor, check_interval), daemon=True)
+    monitor.start()
+    
+    def process_batch(start: int, batch: List[Dict]) -> List[bool]:
+        end = start + len(batch) - 1
+        print(f"\n=== Processing commits {start}-{end}/{len(commits)} ===")
+        return add_commits_to_graphiti_with_gpu_monitoring(batch, gpu_idle)
+    
+    batches = [commits[i:i + batch_size] for i in range(0, len(commits), batch_size)]
+    successful_count = 0
+    written = set()  # hashes already recorded, so a batch is never written twice
+    with open(output_file, 'w') as out:
+        out.write("[")
         
-        if add_commit_to_graphiti_with_gpu_monitoring(commit, lmstudio_delay):
-            successful_memories.append(commit)
-            print(f"✅ Successfully added memory for commit {commit['hash'][:8]}")
-        else:
-            print(f"❌ Failed to add memory for commit {commit['hash'][:8]}")
+        def record(batch: List[Dict], results: List[bool]) -> None:
+            nonlocal successful_count
+            for commit, success in zip(batch, results):
+                if commit['hash'] in written:
+                    continue
+                written.add(commit['hash'])
+                if success:
+                    out.write(",\n" if successful_count else "\n")
+                    json.dump(commit, out, indent=2)
+                    out.flush()
+                    successful_count += 1
+                    print(f"✅ Successfully added memory for commit {commit['hash'][:8]}")
+                else:
+                    print(f"❌ Failed to add memory for commit {commit['hash'][:8]}")
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = []
+        try:
+            futures = [executor.submit(process_batch, i * batch_size + 1, batch) for i, batch in enumerate(batches)]
+            for batch, future in zip(batches, futures):
+                record(batch, future.result())
+            executor.shutdown()
+        except KeyboardInterrupt:
+            # Don't let queued batches keep waiting for the GPU and reach Graphiti
+            print("\n⚠️ Interrupted - cancelling queued batches")
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Batches that already finished were sent to Graphiti, so record them
+            for batch, future in zip(batches, futures):
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    record(batch, future.result())
+            raise
+        finally:
+            # Close the array even on interruption so the file stays valid JSON
+            out.write("\n]\n")
+            stop_monitor.set()
+            monitor.join(timeout=check_interval + 15)
     
-    print(f"\nSuccessfully created {len(successful_memories)} memory entries.")
-    return successful_memories
+    print(f"\nSuccessfully created {successful_count} memory entries.")
+    return successful_count
 
 def main():
     """Main function to process Git commits with GPU monitoring."""
     if len(sys.argv) < 2:
-        print("Usage: python git_memory_processor_gpu_safe.py <repo_path> [since] [delay]")
-        print("Example: python git_memory_processor_gpu_safe.py /path/to/repo '1 week ago' 5")
+        print("Usage: python git_memory_processor_gpu_safe.py <repo_path> [since] [check_interval] [workers] [batch_size]")
+        print("Example: python git_memory_processor_gpu_safe.py /path/to/repo '1 week ago' 1 2 4")
         sys.exit(1)
     
     repo_path = sys.argv[1]
     since = sys.argv[2] if len(sys.argv) > 2 else "1 week ago"
-    lmstudio_delay = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    check_interval = float(sys.argv[3]) if len(sys.argv) > 3 else 1
+    max_workers = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+    batch_size = int(sys.argv[5]) if len(sys.argv) > 5 else 4
+    configure_logging()
+    
+    # Successful memories are saved to this file for reference as they complete
+    output_file = f"git_memories_gpu_safe_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     
     try:
-        successful_memories = process_git_commits_with_gpu_monitoring(repo_path, since, lmstudio_delay)
-        
-        # Save successful memories to file for reference
-        output_file = f"git_memories_gpu_safe_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(successful_memories, f, indent=2)
+        process_git_commits_with_gpu_monitoring(repo_path, output_file, since, check_interval, max_workers,
+                                                batch_size)
         
         print(f"Git memory data saved to {output_file}")
         
@@ -282,42 +282,89 @@ def add_memory_via_lmstudio(prompt, lmstudio_url="http://127.0.0.1:1234/v1/chat/
             episode_body = prompt
         
         # Call the add_memory tool
-        tool_name = "add_memory"
-        arguments = {
-            "name": name,
-            "episode_body": episode_body
-        }
-        
-        tool_response = session.post_tool_call(base_url, tool_name, arguments)
+        result = call_add_memory_tool(session, base_url, name, episode_body)
+        session.stop()
         
-        if tool_response.status_code == 202:
-            # Wait for the result
-            for _ in range(30):
-                event = session.get_event(timeout=1)
-                if event and event.get("event") == "message":
-                    try:
-                        data = json.loads(event["data"])
-                        if "result" in data:
-                            session.stop()
-                            # Rate limiting delay
-                            if rate_limit_delay > 0:
-                                time.sleep(rate_limit_delay)
-                            return "Memory added successfully"
-                        elif "error" in data:
-                            session.stop()
-                            return f"Error adding memory: {data['error']}"
-                    except json.JSONDecodeError:
-                        continue
-            
-            session.stop()
-            return "Memory queued for processing"
-        else:
-            session.stop()
-            return f"Error: Tool call failed with status {tool_response.status_code}"
+        # Rate limiting delay
+        if result == "Memory added successfully" and rate_limit_delay > 0:
+            time.sleep(rate_limit_delay)
+        return result
             
     except Exception as e:
         return f"Error: {str(e)}"
 
+def call_add_memory_tool(session, base_url, name, episode_body):
+    """
+    Call the add_memory tool on an initialized session and wait for its result.
+    
+    Args:
+        session: Initialized FastMcpSession
+        base_url: Graphiti server URL
+        name: Memory name
+        episode_body: Memory content; dicts/lists are sent as compact JSON
+    
+    Returns:
+        Success/error message in the same wording as add_memory_via_lmstudio
+    """
+    if not isinstance(episode_body, str):
+        episode_body = json.dumps(episode_body, separators=(",", ":"))
+    arguments = {
+        "name": name,
+        "episode_body": episode_body
+    }
+    
+    tool_response = session.post_tool_call(base_url, "add_memory", arguments)
+    
+    if tool_response.status_code != 202:
+        return f"Error: Tool call failed with status {tool_response.status_code}"
+    
+    # Wait for the result
+    for _ in range(30):
+        event = session.get_event(timeout=1)
+        if event and event.get("event") == "message":
+            try:
+                data = json.loads(event["data"])
+                if "result" in data:
+                    return "Memory added successfully"
+                elif "error" in data:
+                    return f"Error adding memory: {data['error']}"
+            except json.JSONDecodeError:
+                continue
+    
+    return "Memory queued for processing"
+
+def add_memories_batch(memories, base_url="http://localhost:8000"):
+    """
+    Add several memories over a single MCP session.
+    
+    Opening the SSE stream and running the MCP initialize handshake is the
+    fixed cost of every add; batching pays it once per group of memories.
+    
+    Args:
+        memories: List of (name, episode_body) tuples; episode_body may be a dict
+        base_url: Graphiti server URL
+    
+    Returns:
+        List of success/error messages, one per memory, in input order
+    """
+    session = FastMcpSession(f"{base_url}/sse")
+    try:
+        session.start()
+        if not session.initialize(base_url):
+            return ["Error: Failed to initialize MCP session"] * len(memories)
+        
+        results = []
+        for name, episode_body in memories:
+            try:
+                results.append(call_add_memory_tool(session, base_url, name, episode_body))
+            except Exception as e:
+                results.append(f"Error: {str(e)}")
+        return results
+    except Exception as e:
+        return [f"Error: {str(e)}"] * len(memories)
+    finally:
+        session.stop()
+
 if __name__ == "__main__":
     # 1. Initialize MCP session and keep SSE connection open
     print("=== STEP 1: Initializing MCP Session ===")
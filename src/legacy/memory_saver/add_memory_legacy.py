@@ -1,22 +1,34 @@
 # add_memory.py
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def add_memory_via_lmstudio(name, episode_body, lmstudio_url="http://127.0.0.1:1234/v1", model="qwen3-32b"):
+# Shared keep-alive session reused across memory additions
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                      max_retries=Retry(total=2, backoff_factor=0.2)))
+
+LMSTUDIO_URL = "http://127.0.0.1:1234/v1"
+LMSTUDIO_CHAT_URL = f"{LMSTUDIO_URL}/chat/completions"
+
+add_memory_schema = {"type": "function", "function": {"name": "add_memory", "description": "Add memory", "parameters": {"type": "object", "properties": {"name": {"type": "string"}, "episode_body": {"type": "string"}}, "required": ["name", "episode_body"]}}}
+_TOOLS = [add_memory_schema]
+
+def add_memory_via_lmstudio(name, episode_body, lmstudio_url=LMSTUDIO_URL, model="qwen3-32b"):
     """Add memory using LM Studio chat completion API with tool calling."""
     try:
-        tools = [{"type": "function", "function": {"name": "add_memory", "description": "Add memory", "parameters": {"type": "object", "properties": {"name": {"type": "string"}, "episode_body": {"type": "string"}}, "required": ["name", "episode_body"]}}}]
-        payload = {"model": model, "messages": [{"role": "user", "content": f"Add memory: {name} - {episode_body}"}], "tools": tools, "stream": False}
-        response = requests.post(f"{lmstudio_url}/chat/completions", json=payload, timeout=30)
+        chat_url = LMSTUDIO_CHAT_URL if lmstudio_url == LMSTUDIO_URL else f"{lmstudio_url}/chat/completions"
+        payload = {"model": model, "messages": [{"role": "user", "content": f"Add memory: {name} - {episode_body}"}], "tools": _TOOLS, "stream": False}
+        response = _SESSION.post(chat_url, json=payload, timeout=30)
         response.raise_for_status()
         data = response.json()
-        if data["choices"][0]["message"].get("tool_calls"):
-            tool_call = data["choices"][0]["message"]["tool_calls"][0]
+        message = data["choices"][0]["message"]
+        if message.get("tool_calls"):
+            tool_call = message["tool_calls"][0]
             func_name = tool_call["function"]["name"]
             func_args = tool_call["function"]["arguments"]
             return f"Tool call: {func_name} with args: {func_args}"
         else:
-            return f"Response: {data[choices][0][message][content]}"
+            return f"Response: {message['content']}"
     except Exception as exc:
         return f"Error: {exc}"
-
-add_memory_schema = {"type": "function", "function": {"name": "add_memory", "description": "Add memory", "parameters": {"type": "object", "properties": {"name": {"type": "string"}, "episode_body": {"type": "string"}}, "required": ["name", "episode_body"]}}}
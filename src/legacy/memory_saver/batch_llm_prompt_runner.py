@@ -7,30 +7,50 @@ content, and submits it (plus an instruction block describing available MCP
 assistant tools) to the LM Studio OpenAI-compatible HTTP API. Responses are
 saved one-per-line in JSONL so they can be post-processed later.
 
+The instructions and tool list live in a system message that is identical for
+every file, and the file itself is the only per-request tail of the prompt.
+Start LM Studio with prompt (prefix) caching enabled so that shared prefix is
+only prefilled once per run.
+
 Example usage
 -------------
 $ python batch_llm_prompt_runner.py file_list.txt --model llama-3 --output results.jsonl
 
 Environment variables
 ---------------------
-OPENAI_API_KEY      – Dummy key required by the openai-python SDK. Set to any value
+OPENAI_API_KEY      – Sent as the bearer token; LM Studio accepts any value
 OPENAI_API_BASE_URL – Override the default http://localhost:1234/v1 endpoint if
                       your LM Studio server is running elsewhere.
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
 import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional
 
-import openai  # pip install --upgrade openai>=1.0.0
+import aiohttp  # pip install aiohttp
+import orjson  # pip install orjson
 import re
 import requests  # pip install requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlsplit
+from urllib3.util.retry import Retry
 
 LLM_MODEL = "qwen3-32b"
+# JSONL records buffered before each write to the output file
+WRITE_BATCH_SIZE = 64
+
+# Shared keep-alive session for Graphiti tool calls and tool discovery
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                                      max_retries=Retry(total=3, backoff_factor=0.2)))
 
 
 def load_paths(list_file: Path) -> List[Path]:
@@ -39,19 +59,53 @@ def load_paths(list_file: Path) -> List[Path]:
         return [Path(line.strip()) for line in fp if line.strip()]
 
 
-def build_prompt(file_name: str, file_content: str, tools_description: str) -> str:
-    """Construct the user prompt sent to the LLM for *file_name*."""
+def read_truncated(src: Path, max_chars: int) -> str:
+    """Return at most *max_chars* characters of *src* without reading the whole file."""
+    with src.open("r", encoding="utf-8", errors="replace") as fp:
+        return fp.read(max_chars)
+
+
+def build_system_prompt(tools_description: str) -> str:
+    """Construct the system prompt shared by every file in the run."""
     return (
-        f"You are a developer assistant equipped with several MCP tools that "
-        f"can inspect and modify a codebase.\n\n"
+        f"You are a helpful developer assistant that follows instructions exactly. "
+        f"You are equipped with several MCP tools that can inspect and modify a codebase.\n\n"
         f"Available tools:\n{tools_description}\n\n"
         f"When you need to invoke a tool respond with *only* a JSON payload in the "
         f"format {{\"tool\": \"<name>\", \"parameters\": {{...}}}}. Otherwise, "
-        f"answer normally.\n\n"
-        f"Here is the content of {file_name}:\n```\n{file_content}\n```"
+        f"answer normally."
     )
 
 
+def build_prompt(file_name: str, file_content: str) -> str:
+    """Construct the user prompt sent to the LLM for *file_name*."""
+    return f"File: {file_name}\n```\n{file_content}\n```"
+
+
+# Marker line that opens each file's section in a multi-file prompt and reply
+_FILE_MARKER_RE = re.compile(r"^===FILE (\d+)(?::[^\n]*?)?===[ \t]*$", re.MULTILINE)
+
+
+def build_batch_prompt(files: list[tuple[str, str]]) -> str:
+    """Construct one user prompt covering several ``(file_name, file_content)`` pairs."""
+    parts = [
+        "Analyze each of the following files separately. Begin the answer for each "
+        "file with a line containing only its marker, e.g. ===FILE 1===."
+    ]
+    for i, (file_name, file_content) in enumerate(files, 1):
+        parts.append(f"===FILE {i}: {file_name}===\n```\n{file_content}\n```")
+    return "\n".join(parts)
+
+
+def split_batch_reply(reply: str, count: int) -> Optional[list[str]]:
+    """Split a multi-file *reply* into *count* sections, or None if any is missing."""
+    pieces = _FILE_MARKER_RE.split(reply)
+    sections = {int(num): body.strip() for num, body in zip(pieces[1::2], pieces[2::2])}
+    if set(sections) != set(range(1, count + 1)):
+        return None
+    return [sections[i] for i in range(1, count + 1)]
+
+
 # ---------------------------------------------------------------------------
 # Graphiti integration helpers
 # ---------------------------------------------------------------------------
@@ -81,7 +135,7 @@ def add_memory_to_graphiti(name: str, episode_body: str, url: str) -> str:
     }
 
     try:
-        resp = requests.post(url, json=payload, timeout=10)
+        resp = _SESSION.post(url, json=payload, timeout=10)
         resp.raise_for_status()
         return f"✅ Stored memory (status {resp.status_code})"
     except Exception as exc:  # noqa: BLE001
@@ -93,14 +147,20 @@ def add_memory_to_graphiti(name: str, episode_body: str, url: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+# Leading ```lang fence line or trailing ``` around a fenced JSON reply
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\n|```$")
+
+
 def is_tool_call(response_content: str) -> bool:
     """Return True if *response_content* looks like a JSON tool call."""
-    return response_content.strip().startswith("{") and "\"tool\"" in response_content
+    s = response_content.lstrip()
+    return s[:1] == "{" and "\"tool\"" in s
 
 
 def safely_parse_json(json_str: str) -> dict | None:
     """Attempt to parse JSON, stripping triple backticks if present."""
-    cleaned = re.sub(r"^```[a-zA-Z]*\n|```$", "", json_str.strip())
+    s = json_str.strip()
+    cleaned = _FENCE_RE.sub("", s) if s.startswith("```") else s
     try:
         return json.loads(cleaned)
     except json.JSONDecodeError:
@@ -122,6 +182,47 @@ def execute_tool_call(tool_json: dict, graphiti_url: str) -> str:
     return f"⚠️ Unsupported tool: {name}"
 
 
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+
+def open_response_cache(path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the SQLite response cache at *path*."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (hash TEXT PRIMARY KEY, response TEXT)")
+    return conn
+
+
+def cache_key_base(model: str, system_prompt: str) -> "hashlib._Hash":
+    """Return a sha256 state already fed with the parts shared by every file.
+
+    Hashing the model and system prompt once lets each per-file key only
+    hash its own user prompt (see :func:`cache_key`).
+    """
+    blob = json.dumps({"model": model, "system": system_prompt}, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8"))
+
+
+def cache_key(base: "hashlib._Hash", user_prompt: str) -> str:
+    """Return the cache key for *user_prompt*, continuing from :func:`cache_key_base`."""
+    h = base.copy()
+    h.update(user_prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+def cache_get(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    """Return the cached reply for *key*, or None on a miss."""
+    row = conn.execute("SELECT response FROM responses WHERE hash = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def cache_put(conn: sqlite3.Connection, key: str, reply: str) -> None:
+    """Store *reply* under *key*, committing immediately so it survives a crash."""
+    conn.execute("INSERT OR REPLACE INTO responses (hash, response) VALUES (?, ?)", (key, reply))
+    conn.commit()
+
+
 # ---------------------------------------------------------------------------
 # Tool discovery
 # ---------------------------------------------------------------------------
@@ -133,10 +234,32 @@ def derive_base_url(url: str) -> str:
     return f"{parts.scheme}://{parts.netloc}"
 
 
+def probe_tools(base_url: str, method: str, path: str) -> Optional[list[str]]:
+    """Fetch tool names from one candidate endpoint, or None if it fails."""
+    headers = {"Accept": "application/json"}
+    try:
+        url = base_url + path
+        if method == "GET":
+            resp = _SESSION.get(url, headers=headers, timeout=2)
+        else:  # POST
+            resp = _SESSION.post(url, json={}, headers=headers, timeout=2)
+        if resp.ok:
+            data = resp.json()
+            # Expect either list[str] or {"tools": [..]}
+            if isinstance(data, list):
+                return data  # type: ignore[return-value]
+            if isinstance(data, dict) and "tools" in data:
+                return data["tools"]  # type: ignore[return-value]
+    except Exception:
+        pass
+    return None
+
+
 def discover_tools(base_url: str) -> Optional[list[str]]:
     """Attempt to fetch available MCP tool names from *base_url*.
 
-    Returns None if discovery fails.
+    All candidate endpoints are probed at once and the first one to answer
+    with a tool list wins. Returns None if discovery fails.
     """
     candidate_paths = [
         ("GET", "/tools"),
@@ -145,24 +268,310 @@ def discover_tools(base_url: str) -> Optional[list[str]]:
         ("POST", "/tools/list"),  # MCP standard
         ("POST", "/sse/tools/list"),
     ]
-    headers = {"Accept": "application/json"}
-    for method, path in candidate_paths:
+    pool = ThreadPoolExecutor(max_workers=len(candidate_paths))
+    futures = [pool.submit(probe_tools, base_url, method, path) for method, path in candidate_paths]
+    try:
+        for future in as_completed(futures):
+            tools = future.result()
+            if tools is not None:
+                return tools
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets gating each LLM call.
+
+    Both buckets start full and refill continuously at ``limit / 60`` per
+    second; a limit of 0 disables that bucket.
+    """
+
+    def __init__(self, max_rpm: float, max_tpm: float) -> None:
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self.requests = max_rpm
+        self.tokens = max_tpm
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.max_rpm, self.requests + self.max_rpm * elapsed / 60)
+        self.tokens = min(self.max_tpm, self.tokens + self.max_tpm * elapsed / 60)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and *tokens* tokens are available, then take them."""
+        # Holding the lock while waiting keeps callers in FIFO order
+        async with self.lock:
+            while True:
+                self._refill()
+                short_requests = self.max_rpm and self.requests < 1
+                short_tokens = self.max_tpm and self.tokens < min(tokens, self.max_tpm)
+                if not short_requests and not short_tokens:
+                    break
+                await asyncio.sleep(0.05)
+            if self.max_rpm:
+                self.requests -= 1
+            if self.max_tpm:
+                self.tokens -= tokens
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Rough prompt token count for *messages* (about 4 characters per token)."""
+    return sum(len(m.get("content") or "") for m in messages) // 4 + 1
+
+
+async def stream_reply(session: aiohttp.ClientSession, chat_url: str, model: str, messages: list[dict]) -> str:
+    """Stream a chat completion and return the accumulated reply text.
+
+    When the reply opens with a JSON object (a tool call), reading stops as
+    soon as that object's closing brace arrives and the reply is cut right
+    after it; dropping the response lets the server stop generating whatever
+    would have followed.
+    """
+    reply = ""
+    is_json: Optional[bool] = None
+    depth = 0
+    in_string = escaped = False
+
+    async with session.post(chat_url, json={"model": model, "messages": messages, "stream": True}) as resp:
+        resp.raise_for_status()
+        async for raw_line in resp.content:
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices")
+            if not choices:
+                continue
+            delta = (choices[0].get("delta") or {}).get("content") or ""
+            reply += delta
+
+            if is_json is None and reply.strip():
+                is_json = reply.lstrip()[0] == "{"
+            if not is_json:
+                continue
+
+            # Track brace depth outside string literals to spot the object's end
+            for i, ch in enumerate(delta):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}":
+                    depth -= 1
+                    if depth == 0:
+                        # Drop any text that arrived in the same delta after the brace
+                        return reply[: len(reply) - len(delta) + i + 1]
+    return reply
+
+
+async def send_chat(
+    session: aiohttp.ClientSession,
+    chat_url: str,
+    model: str,
+    messages: list[dict],
+    limiter: RateLimiter,
+    max_attempts: int,
+) -> str:
+    """Send one chat request within the rate limits, retrying 429s with exponential backoff."""
+    for attempt in range(max_attempts):
+        await limiter.acquire(estimate_tokens(messages))
         try:
-            url = base_url + path
-            if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=5)
-            else:  # POST
-                resp = requests.post(url, json={}, headers=headers, timeout=5)
-            if resp.ok:
-                data = resp.json()
-                # Expect either list[str] or {"tools": [..]}
-                if isinstance(data, list):
-                    return data  # type: ignore[return-value]
-                if isinstance(data, dict) and "tools" in data:
-                    return data["tools"]  # type: ignore[return-value]
-        except Exception:
-            continue  # try next path
-    return None
+            return await stream_reply(session, chat_url, model, messages)
+        except aiohttp.ClientResponseError as exc:
+            if exc.status != 429 or attempt == max_attempts - 1:
+                raise
+            await asyncio.sleep(2 ** attempt)
+    raise RuntimeError("max_attempts must be at least 1")
+
+
+async def query_llm(
+    session: aiohttp.ClientSession,
+    chat_url: str,
+    model: str,
+    messages: list[dict],
+    graphiti_url: str,
+    limiter: RateLimiter,
+    max_attempts: int = 5,
+    max_turns: int = 8,
+    run_tools: bool = True,
+) -> str:
+    """Run the tool-call conversation loop for one file and return the final reply.
+
+    The loop ends early with the latest reply once *max_turns* requests have
+    been made, or when the model repeats its previous reply verbatim. With
+    *run_tools* False the first reply is returned as-is, tool call or not.
+    """
+    last_reply = None
+    # Conversation loop – keep calling LLM until it returns a normal message
+    for turn in range(max_turns):
+        reply = await send_chat(session, chat_url, model, messages, limiter, max_attempts)
+
+        if run_tools and is_tool_call(reply) and reply != last_reply and turn < max_turns - 1:
+            tool_json = safely_parse_json(reply)
+            if not tool_json:
+                messages.append({"role": "assistant", "content": reply})
+                return reply  # malformed tool call – treat as final
+
+            # Log assistant tool call message
+            messages.append({"role": "assistant", "content": reply})
+
+            # Execute the tool (blocking HTTP) off the event loop and get result
+            result_str = await asyncio.to_thread(execute_tool_call, tool_json, graphiti_url)
+
+            # Feed result back to LLM
+            messages.append({"role": "tool", "name": tool_json.get("tool", "unknown"), "content": result_str})
+
+            # Continue loop – LLM will see the tool result
+            last_reply = reply
+            continue
+
+        # Normal content (or a stuck tool loop) – conversation finished
+        messages.append({"role": "assistant", "content": reply})
+        return reply
+    raise ValueError("max_turns must be at least 1")
+
+
+async def process_files(
+    file_paths: List[Path], out_path: Path, system_prompt: str, args: argparse.Namespace
+) -> None:
+    """Query the LLM for every file, keeping up to ``args.concurrency`` requests in flight.
+
+    Responses are buffered as each file finishes and written to *out_path*
+    every ``WRITE_BATCH_SIZE`` records and once more at the end, so line order
+    follows completion order rather than the order of the list file, and a
+    crash loses up to ``WRITE_BATCH_SIZE - 1`` (63) unwritten records. Unless
+    ``args.no_cache`` is set, replies are looked up in and saved to the SQLite
+    cache at ``args.cache``, so unchanged files are not re-sent on a rerun.
+    With ``args.files_per_request`` above 1, files are sent in groups of that
+    size and the reply is split back into one record per file; a group whose
+    reply does not have a section for every file is retried file by file.
+    Tool calls only run in single-file requests, so that retry never repeats
+    a tool call, and an unsplittable group reply is never cached.
+    """
+    cache = None if args.no_cache else open_response_cache(Path(args.cache))
+    key_base = cache_key_base(args.model, system_prompt)
+    limiter = RateLimiter(args.max_rpm, args.max_tpm)
+    # POST straight to the OpenAI-compatible endpoint over one pooled session;
+    # a dummy token works for the local LM Studio server
+    chat_url = args.api_base.rstrip("/") + "/chat/completions"
+    headers = {"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', 'lm-studio')}"}
+    connector = aiohttp.TCPConnector(limit=args.concurrency, keepalive_timeout=60)
+    # aiohttp's default 300 s total would cut off long local generations (the
+    # openai client allowed 600 s); bound each read instead of the whole stream
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=600)
+    session = aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout)
+    sem = asyncio.Semaphore(args.concurrency)
+    write_lock = asyncio.Lock()
+    pending: list[bytes] = []
+    total = len(file_paths)
+    started = 0
+
+    with out_path.open("wb") as out_fp:
+
+        async def ask(user_prompt: str, label: str, count: int = 1) -> str:
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+
+            key = cache_key(key_base, user_prompt)
+            reply = cache_get(cache, key) if cache else None
+            if reply is not None:
+                print(f"[cache] {label}")
+                return reply
+            reply = await query_llm(
+                session, chat_url, args.model, messages, args.graphiti_url, limiter,
+                args.max_attempts, args.max_turns, run_tools=count == 1,
+            )
+            # A group reply is only worth caching once it splits into every file
+            if cache and (count == 1 or split_batch_reply(reply, count) is not None):
+                cache_put(cache, key, reply)
+            return reply
+
+        async def write_record(src: Path, reply: str) -> None:
+            async with write_lock:
+                pending.append(orjson.dumps({"file": str(src), "response": reply}) + b"\n")
+                if len(pending) >= WRITE_BATCH_SIZE:
+                    out_fp.write(b"".join(pending))
+                    pending.clear()
+
+        async def process(src: Path) -> None:
+            nonlocal started
+            async with sem:
+                started += 1
+                print(f"[{started}/{total}] Processing {src} …")
+                content = read_truncated(src, args.truncate)
+
+                try:
+                    reply = await ask(build_prompt(src.name, content), str(src))
+                except Exception as exc:
+                    reply = f"⚠️ Error querying LLM: {exc}"
+
+            await write_record(src, reply)
+
+        async def process_group(group: List[Path]) -> None:
+            nonlocal started
+            if len(group) == 1:
+                return await process(group[0])
+
+            async with sem:
+                started += len(group)
+                print(f"[{started}/{total}] Processing {len(group)} files from {group[0]} …")
+                files = [
+                    (src.name, read_truncated(src, args.truncate))
+                    for src in group
+                ]
+
+                try:
+                    reply = await ask(build_batch_prompt(files), f"{group[0]} +{len(group) - 1}", len(group))
+                    sections = split_batch_reply(reply, len(group))
+                except Exception as exc:
+                    print(f"[batch] Error querying LLM: {exc}")
+                    sections = None
+
+            if sections is None:
+                # Reply did not cover every file – fall back to one request per file
+                started -= len(group)
+                await asyncio.gather(*(process(src) for src in group))
+                return
+            for src, reply in zip(group, sections):
+                await write_record(src, reply)
+
+        existing = []
+        for src in file_paths:
+            if src.is_file():
+                existing.append(src)
+            else:
+                print(f"[skip] {src} – not found or not a file")
+        k = max(1, args.files_per_request)
+        groups = [existing[i : i + k] for i in range(0, len(existing), k)]
+
+        try:
+            await asyncio.gather(*(process_group(group) for group in groups))
+        finally:
+            out_fp.write(b"".join(pending))
+            await session.close()
+            if cache:
+                cache.close()
 
 
 def main() -> None:
@@ -189,6 +598,52 @@ def main() -> None:
         default=8000,
         help="Maximum characters of file content to include to avoid context overflow",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Number of files to have in flight with the LLM at once (default: 10)",
+    )
+    parser.add_argument(
+        "--files-per-request",
+        type=int,
+        default=1,
+        help="Number of files to pack into each LLM request (default: 1)",
+    )
+    parser.add_argument(
+        "--max-rpm",
+        type=float,
+        default=0,
+        help="Maximum LLM requests per minute (default: 0, unlimited)",
+    )
+    parser.add_argument(
+        "--max-tpm",
+        type=float,
+        default=0,
+        help="Maximum estimated prompt tokens per minute (default: 0, unlimited)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=5,
+        help="Attempts per LLM request when the server answers 429 (default: 5)",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        default=8,
+        help="Maximum LLM requests per file's tool-call conversation (default: 8)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=".llm_cache.sqlite",
+        help="SQLite file caching replies by model and prompt (default: .llm_cache.sqlite)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the response cache and query the LLM for every file",
+    )
 
     parser.add_argument(
         "--graphiti_url",
@@ -198,10 +653,6 @@ def main() -> None:
 
     args = parser.parse_args()
 
-    # Configure OpenAI SDK for LM Studio
-    openai.api_key = os.getenv("OPENAI_API_KEY", "lm-studio")  # dummy token works for local server
-    openai.base_url = args.api_base
-
     # -----------------------------------------------------------------------
     # Discover available MCP tools and build prompt description
     # -----------------------------------------------------------------------
@@ -227,59 +678,9 @@ def main() -> None:
         return
 
     out_path = Path(args.output)
-    processed = 0
-
-    with out_path.open("w", encoding="utf-8") as out_fp:
-        for src in file_paths:
-            if not src.is_file():
-                print(f"[skip] {src} – not found or not a file")
-                continue
-
-            processed += 1
-            print(f"[{processed}/{len(file_paths)}] Processing {src} …")
-            content = src.read_text(encoding="utf-8", errors="replace")[: args.truncate]
-
-            user_prompt = build_prompt(src.name, content, tools_description)
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a helpful developer assistant that follows instructions exactly.",
-                },
-                {"role": "user", "content": user_prompt},
-            ]
-
-            try:
-                # Conversation loop – keep calling LLM until it returns a normal message
-                while True:
-                    completion = openai.chat.completions.create(model=args.model, messages=messages)
-                    reply = completion.choices[0].message.content or ""
-
-                    if is_tool_call(reply):
-                        tool_json = safely_parse_json(reply)
-                        if not tool_json:
-                            messages.append({"role": "assistant", "content": reply})
-                            break  # malformed tool call – treat as final
-
-                        # Log assistant tool call message
-                        messages.append({"role": "assistant", "content": reply})
-
-                        # Execute the tool and get result
-                        result_str = execute_tool_call(tool_json, args.graphiti_url)
-
-                        # Feed result back to LLM
-                        messages.append({"role": "tool", "name": tool_json.get("tool", "unknown"), "content": result_str})
-
-                        # Continue loop – LLM will see the tool result
-                        continue
-
-                    # Normal content – conversation finished
-                    messages.append({"role": "assistant", "content": reply})
-                    break
-            except Exception as exc:
-                reply = f"⚠️ Error querying LLM: {exc}"
-
-            out_fp.write(json.dumps({"file": str(src), "response": reply}) + "\n")
+    # Built once here; every request reuses the same system prompt object
+    system_prompt = build_system_prompt(tools_description)
+    asyncio.run(process_files(file_paths, out_path, system_prompt, args))
 
     print(f"Done – responses saved to {out_path}")
 
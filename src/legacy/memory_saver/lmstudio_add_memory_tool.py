@@ -3,6 +3,13 @@
 Defines the add_memory tool schema and a Python function to call the Graphiti server's add_memory endpoint.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session reused across add_memory calls
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                                      max_retries=Retry(total=3, backoff_factor=0.2)))
 
 def add_memory(name: str, episode_body: str, graphiti_url: str = "http://localhost:8000/add_memory") -> str:
     """
@@ -19,7 +26,7 @@ def add_memory(name: str, episode_body: str, graphiti_url: str = "http://localho
         "episode_body": episode_body,
     }
     try:
-        resp = requests.post(graphiti_url, json=payload, timeout=10)
+        resp = _SESSION.post(graphiti_url, json=payload, timeout=10)
         resp.raise_for_status()
         return resp.text
     except Exception as exc:
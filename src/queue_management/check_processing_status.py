@@ -4,25 +4,17 @@ One-time check of Graphiti queue and processing status.
 Shows what's currently being processed and what's waiting.
 """
 
-import subprocess
-import json
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from queue_management.queue_common import fetch_queue_status
 
 def check_status():
     """Check current queue and processing status."""
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        (
-            "import json, graphiti_mcp_server as s; "
-            "result = {}; "
-            "[result.update({k: {'size': q.qsize(), 'items': s.queue_names.get(k, []), 'worker_active': s.queue_workers.get(k, False), 'currently_processing': s.currently_processing.get(k, None)}}) for k, q in s.episode_queues.items()]; "
-            "print(json.dumps(result, indent=2))"
-        ),
-    ]
-    
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        status_data = json.loads(result.stdout.strip() or "{}")
+        status_data = fetch_queue_status()
         
         print("🔍 Graphiti Queue & Processing Status")
         print("=" * 50)
@@ -60,11 +52,8 @@ def check_status():
             worker_status = "ACTIVE" if worker_active else "INACTIVE"
             print(f"👷 Worker: {worker_status}")
             
-    except subprocess.CalledProcessError as e:
+    except RuntimeError as e:
         print(f"❌ Error checking status: {e}")
-        print(f"Stderr: {e.stderr}")
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing response: {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
@@ -10,31 +10,16 @@ This provides complete visibility into the processing lifecycle.
 """
 
 import subprocess
-import json
+import sys
 import time
 import argparse
 from datetime import datetime
 import os
 
-def fetch_queue_status() -> dict:
-    """Return comprehensive queue status including currently processing episodes."""
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        (
-            "import json, graphiti_mcp_server as s; "
-            "result = {}; "
-            "[result.update({k: {'size': q.qsize(), 'items': s.queue_names.get(k, []), 'worker_active': s.queue_workers.get(k, False), 'currently_processing': s.currently_processing.get(k, None)}}) for k, q in s.episode_queues.items()]; "
-            "print(json.dumps(result, indent=2))"
-        ),
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        return {}
-    try:
-        return json.loads(result.stdout.strip() or "{}")
-    except json.JSONDecodeError:
-        return {}
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from queue_management.queue_common import fetch_queue_status
+from queue_management.monitor_processing_logs import KEYWORD_RX
 
 def get_recent_logs(lines: int = 10) -> list[str]:
     """Get recent processing-related logs."""
@@ -43,20 +28,16 @@ def get_recent_logs(lines: int = 10) -> list[str]:
     ]
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        logs = result.stdout.strip().split('\n')
+        # Raw bytes: only the lines that match the (ASCII) keywords get decoded
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        logs = result.stdout.strip().split(b'\n')
         
         # Filter for processing-related messages
-        processing_logs = []
-        for line in logs:
-            if any(keyword in line for keyword in [
-                "STARTING PROCESSING", 
-                "FINISHED PROCESSING", 
-                "Processing queued episode",
-                "Episode processed successfully",
-                "Error processing episode"
-            ]):
-                processing_logs.append(line.strip())
+        processing_logs = [
+            line.decode(errors='replace').strip()
+            for line in logs
+            if KEYWORD_RX.search(line)
+        ]
         
         return processing_logs[-5:]  # Return last 5 processing logs
     except:
@@ -64,14 +45,19 @@ def get_recent_logs(lines: int = 10) -> list[str]:
 
 def display_status():
     """Display comprehensive status information."""
-    os.system('clear' if os.name == 'posix' else 'cls')
+    # Home the cursor and clear the screen; skipped when output is piped to a file
+    if sys.stdout.isatty():
+        print("\x1b[H\x1b[2J", end="")
     
     ts = datetime.now().strftime("%H:%M:%S")
     print(f"🔍 Graphiti Comprehensive Monitor - {ts}")
     print("=" * 80)
     
     # Get queue status
-    status_data = fetch_queue_status()
+    try:
+        status_data = fetch_queue_status()
+    except RuntimeError:
+        status_data = {}
     
     # Display queue and processing status
     print("\n📊 QUEUE & PROCESSING STATUS")
@@ -4,31 +4,15 @@ Enhanced Graphiti queue monitor that shows both waiting and currently processing
 This provides visibility into the gap between add_episode() and task_done().
 """
 
-import subprocess
+import os
+import sys
 import time
-import json
 import argparse
 from datetime import datetime
 
-def fetch_queue_status() -> dict:
-    """Return comprehensive queue status including currently processing episodes."""
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        (
-            "import json, graphiti_mcp_server as s; "
-            "result = {}; "
-            "[result.update({k: {'size': q.qsize(), 'items': s.queue_names.get(k, []), 'worker_active': s.queue_workers.get(k, False), 'currently_processing': s.currently_processing.get(k, None)}}) for k, q in s.episode_queues.items()]; "
-            "print(json.dumps(result, indent=2))"
-        ),
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.strip() or "Failed to exec docker command")
-    try:
-        return json.loads(result.stdout.strip() or "{}")
-    except json.JSONDecodeError:
-        raise RuntimeError("Unexpected output: " + result.stdout)
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from queue_management.queue_common import fetch_queue_status
 
 def format_status(status_data: dict) -> str:
     """Format the status data into a readable string."""
@@ -7,8 +7,18 @@ This shows the STARTING PROCESSING and FINISHED PROCESSING log messages.
 import subprocess
 import time
 import argparse
+import re
 from datetime import datetime
 
+# Processing-related log messages worth echoing (matched against raw bytes)
+KEYWORD_RX = re.compile(
+    rb"STARTING PROCESSING|FINISHED PROCESSING|Processing queued episode"
+    rb"|Episode processed successfully|Error processing episode"
+)
+
+# Pipe buffer and read size for the followed log stream
+READ_CHUNK = 1 << 16
+
 def monitor_logs():
     """Monitor Graphiti container logs for processing messages."""
     cmd = [
@@ -20,27 +30,32 @@ def monitor_logs():
     print("Looking for: 🔄 STARTING PROCESSING and ✅ FINISHED PROCESSING messages")
     print("=" * 60)
     
+    process = None
     try:
         process = subprocess.Popen(
             cmd, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            bufsize=READ_CHUNK
         )
         
-        for line in process.stdout:
-            # Filter for processing-related messages
-            if any(keyword in line for keyword in [
-                "STARTING PROCESSING", 
-                "FINISHED PROCESSING", 
-                "Processing queued episode",
-                "Episode processed successfully",
-                "Error processing episode"
-            ]):
-                ts = datetime.now().strftime("%H:%M:%S")
-                print(f"[{ts}] {line.strip()}")
+        # Read whatever is available in large chunks and split lines ourselves;
+        # only matching lines are ever decoded
+        residue = b""
+        while True:
+            chunk = process.stdout.read1(READ_CHUNK)
+            if not chunk:
+                break
+            lines = (residue + chunk).split(b"\n")
+            residue = lines.pop()
+            for line in lines:
+                # Filter for processing-related messages
+                if KEYWORD_RX.search(line):
+                    ts = datetime.now().strftime("%H:%M:%S")
+                    print(f"[{ts}] {line.decode(errors='replace').strip()}")
+        if residue and KEYWORD_RX.search(residue):
+            ts = datetime.now().strftime("%H:%M:%S")
+            print(f"[{ts}] {residue.decode(errors='replace').strip()}")
                 
     except KeyboardInterrupt:
         print("\n🛑 Log monitoring stopped")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Shared Graphiti queue status lookup for the queue monitor scripts.
+
+Status is read from the MCP container's queue status endpoint when it is up
+and reports currently_processing for every group. Otherwise a single
+long-lived `docker exec -i` Python process is kept inside the container and
+asked for a fresh snapshot over its stdin/stdout pipes, so polling does not
+start a new interpreter each time.
+"""
+
+import atexit
+import json
+import subprocess
+import threading
+from typing import Optional
+
+import requests
+
+QUEUE_STATUS_URL = "http://localhost:8100/queue/status"
+MCP_CONTAINER = "graphiti-graphiti-mcp-1"
+
+# Runs inside the container: print one JSON snapshot per line read from stdin
+_STATUS_LOOP_SOURCE = (
+    "import json, sys, graphiti_mcp_server as s\n"
+    "for _ in sys.stdin:\n"
+    "    print(json.dumps({k: {'size': q.qsize(), 'items': s.queue_names.get(k, []), "
+    "'worker_active': s.queue_workers.get(k, False), "
+    "'currently_processing': s.currently_processing.get(k, None)} "
+    "for k, q in s.episode_queues.items()}), flush=True)\n"
+)
+
+_proc: Optional[subprocess.Popen] = None
+_proc_lock = threading.Lock()
+
+
+def fetch_queue_status_http() -> Optional[dict]:
+    """Return {group_id: status} from the queue status endpoint, or None if it is unreachable."""
+    try:
+        response = requests.get(QUEUE_STATUS_URL, timeout=2)
+        response.raise_for_status()
+        return response.json().get("group_queues", {})
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def _with_defaults(status: dict) -> dict:
+    """Return *status* with every per-group field present, defaulting any a source left out."""
+    return {
+        group_id: {
+            "size": group.get("size", 0),
+            "items": group.get("items", []),
+            "worker_active": group.get("worker_active", False),
+            "currently_processing": group.get("currently_processing"),
+        }
+        for group_id, group in status.items()
+    }
+
+
+def _close_status_process() -> None:
+    """Stop the in-container status process if it is running."""
+    global _proc
+    if _proc is not None:
+        try:
+            _proc.stdin.close()
+        except OSError:
+            pass
+        _proc.terminate()
+        _proc = None
+
+
+def _status_process() -> subprocess.Popen:
+    """Return the running in-container status process, starting it if needed."""
+    global _proc
+    if _proc is None or _proc.poll() is not None:
+        _proc = subprocess.Popen(
+            ["docker", "exec", "-i", MCP_CONTAINER, "python", "-u", "-c", _STATUS_LOOP_SOURCE],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+    return _proc
+
+
+def fetch_queue_status_docker() -> dict:
+    """Return {group_id: status} from the persistent in-container status process."""
+    with _proc_lock:
+        for _ in range(2):  # restart once if the process has exited
+            proc = _status_process()
+            try:
+                proc.stdin.write("\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = ""
+            if line:
+                try:
+                    return json.loads(line)
+                except json.JSONDecodeError:
+                    raise RuntimeError("Unexpected output: " + line)
+            _close_status_process()
+    raise RuntimeError(f"Failed to read queue status from {MCP_CONTAINER}")
+
+
+def fetch_queue_status() -> dict:
+    """
+    Return comprehensive queue status including currently processing episodes.
+
+    If the endpoint omits currently_processing, the container snapshot is
+    used instead; if that cannot be read either, the endpoint's status is
+    returned with currently_processing set to None.
+
+    Returns:
+        Dictionary of {group_id: {size, items, worker_active, currently_processing}}
+
+    Raises:
+        RuntimeError: If neither the endpoint nor the container can be read
+    """
+    status = fetch_queue_status_http()
+    # The endpoint's per-group shape is not guaranteed to include
+    # currently_processing, which the in-container snapshot always has
+    if status is not None and all("currently_processing" in g for g in status.values()):
+        return _with_defaults(status)
+    try:
+        return _with_defaults(fetch_queue_status_docker())
+    except RuntimeError:
+        if status is None:
+            raise
+        return _with_defaults(status)
+
+
+atexit.register(_close_status_process)
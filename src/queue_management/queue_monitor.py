@@ -10,66 +10,205 @@ import time
 import argparse
 import subprocess
 import re
+import threading
+from collections import deque
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
+# Queue-related log message patterns, compiled once at import and shared by all monitors
+_QUEUE_PATTERNS = {
+    "processing": re.compile(r"Processing queued episode '([^']+)' for group_id: ([^\s]+)"),
+    "completed": re.compile(r"Episode '([^']+)' processed successfully"),
+    "worker_started": re.compile(r"Starting episode queue worker for group_id: ([^\s]+)"),
+    "worker_stopped": re.compile(r"Stopped episode queue worker for group_id: ([^\s]+)"),
+    "errors": re.compile(r"Error processing queued episode for group_id ([^\s]+): ([^\n]+)"),
+}
+
+# All of the above as one named-group alternation, so each line is scanned once;
+# m.lastgroup names the kind and _QUEUE_GROUPS gives where its own groups start
+_QUEUE_RX = re.compile("|".join(f"(?P<{k}>{p.pattern})" for k, p in _QUEUE_PATTERNS.items()))
+_QUEUE_GROUPS = {k: (_QUEUE_RX.groupindex[k], p.groups) for k, p in _QUEUE_PATTERNS.items()}
+# Every queue message above contains this substring ("episode"/"Episode"), so a
+# plain substring test can reject most log lines before the regex runs
+_QUEUE_SIGIL = "pisode"
+
 class GraphitiQueueMonitor:
+    # Container whose logs are followed, how many lines seed the state, and
+    # how many completed episodes and recent errors are kept
+    CONTAINER = "graphiti-graphiti-mcp-1"
+    LOG_TAIL = 50
+    MAX_COMPLETED = 10_000
+    MAX_ERRORS = 50
+
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
         self.sse_url = f"{base_url}/sse"
+        # Queue state, updated line by line by a background `docker logs -f` reader
+        self._processing: Dict[str, str] = {}  # episode name -> group_id
+        self._completed: Dict[str, None] = {}  # insertion-ordered set of episode names
+        self._workers: Dict[str, str] = {}  # group_id -> "running" / "stopped"
+        self._errors = deque(maxlen=self.MAX_ERRORS)
+        self._error_active = False  # an error was logged after the last episode event
+        self._log_thread: Optional[threading.Thread] = None
+        # Docker timestamp of the last applied log line; a restarted reader resumes from it
+        self._last_seen: Optional[str] = None
+        # Guards the state above; notified whenever the reader handles a line
+        self._cond = threading.Condition()
         
-    def check_queue_status_via_logs(self) -> Dict[str, Any]:
+    def _start_log_stream(self) -> bool:
         """
-        Check queue status by monitoring Docker logs for processing messages.
-        This is the most reliable way to see what's actually happening.
+        Seed the queue state and start following the container logs.
+        
+        On first start the last LOG_TAIL lines are parsed once up front; a
+        single long-lived `docker logs -f` process then feeds new lines from a
+        daemon thread, so status checks no longer spawn a docker process each
+        time. A restarted reader keeps the existing state and resumes from the
+        last line it applied instead of re-reading the tail.
+        
+        Returns:
+            bool: False if the container logs could not be read
         """
-        try:
-            # Get recent logs from the Graphiti MCP container
+        if self._last_seen is None:
+            since = datetime.now(timezone.utc).isoformat()
             result = subprocess.run(
-                ["docker", "logs", "--tail", "50", "graphiti-graphiti-mcp-1"],
+                ["docker", "logs", "--timestamps", "--tail", str(self.LOG_TAIL), self.CONTAINER],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
-            
             if result.returncode != 0:
+                return False
+            with self._cond:
+                self._processing.clear()
+                self._completed.clear()
+                self._workers.clear()
+                self._errors.clear()
+                self._error_active = False
+                for line in result.stdout.splitlines():
+                    self._apply_stamped_line(line)
+        
+        # Lines at or before the last applied one are skipped, so the
+        # one-second overlap of --since is never applied twice
+        since = self._last_seen or since
+        proc = subprocess.Popen(
+            ["docker", "logs", "--timestamps", "-f", "--since", since, self.CONTAINER],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._log_thread = threading.Thread(target=self._stream_logs, args=(proc,), daemon=True)
+        self._log_thread.start()
+        return True
+    
+    def _apply_stamped_line(self, line: str) -> None:
+        """
+        Apply one `docker logs --timestamps` line unless it was already seen.
+        Caller must hold self._cond.
+        """
+        # Docker prints fixed-width RFC 3339 timestamps, so they compare as strings
+        timestamp, _, line = line.partition(" ")
+        if self._last_seen is not None and timestamp <= self._last_seen:
+            return
+        self._last_seen = timestamp
+        self._apply_log_line(line)
+    
+    def _apply_log_line(self, line: str) -> None:
+        """Update the queue state from one log line. Caller must hold self._cond."""
+        if _QUEUE_SIGIL not in line:
+            return
+        m = _QUEUE_RX.search(line)
+        if not m:
+            return
+        kind = m.lastgroup
+        start, count = _QUEUE_GROUPS[kind]
+        groups = m.groups()[start:start + count]
+        if kind == "processing":
+            self._processing[groups[0]] = groups[1]
+            self._error_active = False
+        elif kind == "completed":
+            self._processing.pop(groups[0], None)
+            self._completed.pop(groups[0], None)  # re-insert as the newest
+            self._completed[groups[0]] = None
+            if len(self._completed) > self.MAX_COMPLETED:
+                # Forget the oldest completed episode to keep memory bounded
+                del self._completed[next(iter(self._completed))]
+            self._error_active = False
+        elif kind == "worker_started":
+            self._workers[groups[0]] = "running"
+        elif kind == "worker_stopped":
+            self._workers[groups[0]] = "stopped"
+        elif kind == "errors":
+            group_id = groups[0]
+            # The failed episode is no longer being processed
+            for name in [n for n, g in self._processing.items() if g == group_id]:
+                del self._processing[name]
+            self._errors.append({"group_id": group_id, "error": groups[1]})
+            self._error_active = True
+    
+    def _stream_logs(self, proc: subprocess.Popen) -> None:
+        """Apply each followed log line to the queue state until the stream ends."""
+        for line in proc.stdout:
+            with self._cond:
+                self._apply_stamped_line(line.rstrip("\n"))
+                self._cond.notify_all()
+        proc.wait()
+        with self._cond:
+            self._cond.notify_all()
+    
+    def _ensure_log_stream(self) -> bool:
+        """(Re)start the log reader if it is not running. Returns False if the logs can't be read."""
+        if self._log_thread is None or not self._log_thread.is_alive():
+            return self._start_log_stream()
+        return True
+    
+    def _wait_for_logs(self, predicate, timeout: float) -> bool:
+        """
+        Block until predicate() holds or timeout elapses, re-checking as log lines arrive.
+        
+        Returns:
+            bool: The final value of predicate()
+        """
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout=timeout)
+    
+    @staticmethod
+    def _is_queue_empty(status: Dict[str, Any]) -> bool:
+        """Whether a status from check_queue_status_via_logs shows no active processing."""
+        return status["status"] == "idle" or (status["status"] == "unknown" and not status["processing"])
+    
+    def _queue_empty_locked(self) -> bool:
+        """
+        _is_queue_empty evaluated on the live state, without building a snapshot.
+        Caller must hold self._cond.
+        """
+        return not self._error_active and not self._processing
+    
+    def check_queue_status_via_logs(self) -> Dict[str, Any]:
+        """
+        Check queue status by monitoring Docker logs for processing messages.
+        This is the most reliable way to see what's actually happening.
+        """
+        try:
+            # Follow the Graphiti MCP container logs, (re)starting the reader if needed
+            if not self._ensure_log_stream():
                 return {"status": "error", "message": "Could not access Docker logs"}
             
-            logs = result.stdout
-            
-            # Look for queue-related messages
-            queue_patterns = {
-                "processing": r"Processing queued episode '([^']+)' for group_id: ([^\s]+)",
-                "completed": r"Episode '([^']+)' processed successfully",
-                "worker_started": r"Starting episode queue worker for group_id: ([^\s]+)",
-                "worker_stopped": r"Stopped episode queue worker for group_id: ([^\s]+)",
-                "errors": r"Error processing queued episode for group_id ([^\s]+): ([^\n]+)"
-            }
-            
-            status = {
-                "status": "unknown",
-                "message": "Queue status unclear",
-                "processing": [],
-                "completed": [],
-                "workers": [],
-                "errors": []
-            }
-            
-            # Extract information from logs
-            for pattern_name, pattern in queue_patterns.items():
-                matches = re.findall(pattern, logs)
-                if pattern_name == "processing":
-                    status["processing"] = [{"name": m[0], "group_id": m[1]} for m in matches]
-                elif pattern_name == "completed":
-                    status["completed"] = [m for m in matches]
-                elif pattern_name == "worker_started":
-                    status["workers"].extend([{"group_id": m, "status": "running"} for m in matches])
-                elif pattern_name == "worker_stopped":
-                    status["workers"].extend([{"group_id": m, "status": "stopped"} for m in matches])
-                elif pattern_name == "errors":
-                    status["errors"] = [{"group_id": m[0], "error": m[1]} for m in matches]
+            # Snapshot the incrementally maintained state
+            with self._cond:
+                status = {
+                    "status": "unknown",
+                    "message": "Queue status unclear",
+                    "processing": [{"name": n, "group_id": g} for n, g in self._processing.items()],
+                    "completed": list(self._completed),
+                    "workers": [{"group_id": g, "status": w} for g, w in self._workers.items()],
+                    "errors": list(self._errors)
+                }
+                error_active = self._error_active
             
             # Determine overall status
-            if status["errors"]:
+            if error_active:
                 status["status"] = "error"
                 status["message"] = f"Found {len(status['errors'])} processing errors"
             elif status["processing"]:
@@ -95,9 +234,12 @@ class GraphitiQueueMonitor:
         """
         Wait for the queue to be empty (no active processing).
         
+        Returns as soon as a followed log line shows the queue empty; progress
+        is reported every check_interval seconds while waiting.
+        
         Args:
             timeout: Maximum time to wait in seconds
-            check_interval: How often to check in seconds
+            check_interval: How often to report progress in seconds
             
         Returns:
             bool: True if queue is empty, False if timeout reached
@@ -110,7 +252,7 @@ class GraphitiQueueMonitor:
             
             if status["status"] == "error":
                 print(f"⚠️ Error checking queue: {status['message']}")
-            elif status["status"] == "idle" or (status["status"] == "unknown" and not status["processing"]):
+            elif self._is_queue_empty(status):
                 print("✅ Queue appears to be empty")
                 return True
             elif status["status"] == "processing":
@@ -121,7 +263,17 @@ class GraphitiQueueMonitor:
                 remaining = timeout - (time.time() - start_time)
                 print(f"⏳ Queue status unclear... {remaining:.0f}s remaining")
             
-            time.sleep(check_interval)
+            # The reader was (re)started by check_queue_status_via_logs above, outside
+            # the lock; the predicate runs under it once per applied line, so it
+            # only reads the live state. Without a reader that state is stale, so
+            # an error just waits out the interval before checking again
+            remaining = timeout - (time.time() - start_time)
+            wait = min(check_interval, max(remaining, 0))
+            if status["status"] == "error":
+                time.sleep(wait)
+            elif self._wait_for_logs(self._queue_empty_locked, wait):
+                print("✅ Queue appears to be empty")
+                return True
         
         print(f"⚠️ Timeout reached ({timeout}s), queue may still be processing")
         return False
@@ -130,10 +282,13 @@ class GraphitiQueueMonitor:
         """
         Wait for a specific episode to be processed.
         
+        Returns as soon as a followed log line shows the episode completed;
+        progress is reported every check_interval seconds while waiting.
+        
         Args:
             episode_name: Name of the episode to wait for
             timeout: Maximum time to wait in seconds
-            check_interval: How often to check in seconds
+            check_interval: How often to report progress in seconds
             
         Returns:
             bool: True if episode was processed, False if timeout reached
@@ -142,22 +297,37 @@ class GraphitiQueueMonitor:
         
         start_time = time.time()
         while time.time() - start_time < timeout:
-            status = self.check_queue_status_via_logs()
+            try:
+                stream_ok = self._ensure_log_stream()
+            except (subprocess.SubprocessError, OSError):
+                stream_ok = False
+            if not stream_ok:
+                print("⚠️ Error checking queue: Could not access Docker logs")
+            
+            # Look the episode up directly in the live state (constant-time
+            # membership), rather than scanning a full status snapshot
+            with self._cond:
+                completed = episode_name in self._completed
+                processing = episode_name in self._processing
             
             # Check if episode was completed
-            if episode_name in status["completed"]:
+            if completed:
                 print(f"✅ Episode processed successfully: {episode_name}")
                 return True
             
             # Check if episode is still being processed
-            if any(ep["name"] == episode_name for ep in status["processing"]):
+            if processing:
                 remaining = timeout - (time.time() - start_time)
                 print(f"⏳ Episode still processing... {remaining:.0f}s remaining")
             else:
                 remaining = timeout - (time.time() - start_time)
                 print(f"⏳ Episode not found in processing queue... {remaining:.0f}s remaining")
             
-            time.sleep(check_interval)
+            remaining = timeout - (time.time() - start_time)
+            if self._wait_for_logs(lambda: episode_name in self._completed,
+                                   min(check_interval, max(remaining, 0))):
+                print(f"✅ Episode processed successfully: {episode_name}")
+                return True
         
         print(f"⚠️ Timeout reached ({timeout}s), episode may not have been processed")
         return False
@@ -1,32 +1,23 @@
 #!/usr/bin/env python3
 """
 Poll the live Graphiti queue length every N seconds and log to stdout.
-The queue length is read directly from `graphiti_mcp_server.episode_queues` inside the running container — no regex.
+The queue length is read from the MCP container's queue status endpoint, falling back to
+`graphiti_mcp_server.episode_queues` inside the running container — no regex.
 """
 
-import subprocess
+import os
+import sys
 import time
-import json
 import argparse
 from datetime import datetime
 
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from queue_management.queue_common import fetch_queue_status
+
 def fetch_queue_lengths() -> dict[str, int]:
-    """Return {group_id: qsize} by running a one-liner inside the MCP container."""
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        (
-            "import json, graphiti_mcp_server as s; "
-            "print(json.dumps({k: q.qsize() for k, q in s.episode_queues.items()}))"
-        ),
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.strip() or "Failed to exec docker command")
-    try:
-        return json.loads(result.stdout.strip() or "{}")
-    except json.JSONDecodeError:
-        raise RuntimeError("Unexpected output: " + result.stdout)
+    """Return {group_id: qsize} from the shared queue status lookup."""
+    return {k: v.get("size", 0) for k, v in fetch_queue_status().items()}
 
 def poll(interval: int):
     print("Polling Graphiti queue length every", interval, "seconds… (Ctrl+C to stop)")
@@ -5,16 +5,36 @@ Show exactly what the Graphiti queue looks like by parsing Docker logs.
 
 import subprocess
 import re
-from datetime import datetime
+from collections import deque
+
+# Log line patterns, compiled once rather than on every status check
+_PROC_RE = re.compile(r"Processing queued episode '([^']+)' for group_id: ([^\s]+)")
+_DONE_RE = re.compile(r"Episode '([^']+)' processed successfully")
+_ERR_RE = re.compile(r"Error processing episode '([^']+)' for group_id ([^\s]+): ([^\n]+)")
+_TS_RE = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})")
+
+# Incremental log state: each call only parses lines logged since the previous one.
+# _last_seen is the Docker timestamp of the newest line already applied
+_last_seen = None
+_currently_processing = None
+_recently_completed = deque(maxlen=5)
+_recent_errors = deque(maxlen=5)
+_last_activity = None
 
 def get_queue_status():
     """
     Get the current queue status by parsing Docker logs.
+    
+    The first call reads the last 200 lines; later calls in the same process
+    only fetch lines logged since the newest line already applied and fold
+    them into the running state, keeping the last 5 completions and errors.
     """
+    global _last_seen, _currently_processing, _last_activity
     try:
-        # Get recent logs
+        # Get recent logs (or only the new ones since the last check)
+        window = ["--tail", "200"] if _last_seen is None else ["--since", _last_seen]
         result = subprocess.run(
-            ["docker", "logs", "--tail", "200", "graphiti-graphiti-mcp-1"],
+            ["docker", "logs", "--timestamps", *window, "graphiti-graphiti-mcp-1"],
             capture_output=True,
             text=True,
             timeout=10
@@ -23,41 +43,42 @@ def get_queue_status():
         if result.returncode != 0:
             return {"error": "Could not access Docker logs"}
         
-        logs = result.stdout
-        
-        # Parse queue information
-        queue_info = {
-            "currently_processing": None,
-            "recently_completed": [],
-            "recent_errors": [],
-            "queue_length": 0,
-            "last_activity": None
-        }
+        # --since has one-second granularity, so lines at or before the last
+        # applied one are skipped rather than counted twice. Docker prints
+        # fixed-width RFC 3339 timestamps, so they compare as strings
+        new_lines = []
+        for line in result.stdout.splitlines():
+            timestamp, _, line = line.partition(" ")
+            if _last_seen is not None and timestamp <= _last_seen:
+                continue
+            _last_seen = timestamp
+            new_lines.append(line)
+        logs = "\n".join(new_lines)
         
-        # Find currently processing episode
-        processing_matches = re.findall(r"Processing queued episode '([^']+)' for group_id: ([^\s]+)", logs)
-        if processing_matches:
-            queue_info["currently_processing"] = {
-                "name": processing_matches[-1][0],  # Most recent
-                "group_id": processing_matches[-1][1]
-            }
+        # Find currently processing episode (most recent match wins)
+        for m in _PROC_RE.finditer(logs):
+            _currently_processing = {"name": m.group(1), "group_id": m.group(2)}
         
-        # Find recently completed episodes
-        completed_matches = re.findall(r"Episode '([^']+)' processed successfully", logs)
-        queue_info["recently_completed"] = completed_matches[-5:]  # Last 5
+        # Find recently completed episodes; the deques keep only the last 5
+        for m in _DONE_RE.finditer(logs):
+            _recently_completed.append(m.group(1))
         
         # Find recent errors
-        error_matches = re.findall(r"Error processing episode '([^']+)' for group_id ([^\s]+): ([^\n]+)", logs)
-        queue_info["recent_errors"] = [
-            {"name": m[0], "group_id": m[1], "error": m[2]} 
-            for m in error_matches[-5:]  # Last 5
-        ]
+        for m in _ERR_RE.finditer(logs):
+            _recent_errors.append({"name": m.group(1), "group_id": m.group(2), "error": m.group(3)})
         
-        # Estimate queue length by counting "Processing queued episode" messages
-        # and subtracting completed/error ones
-        total_processed = len(processing_matches)
-        total_completed = len(completed_matches)
-        total_errors = len(error_matches)
+        # Get last activity timestamp
+        for m in _TS_RE.finditer(logs):
+            _last_activity = m.group(1)
+        
+        # Parse queue information
+        queue_info = {
+            "currently_processing": _currently_processing,
+            "recently_completed": list(_recently_completed),
+            "recent_errors": list(_recent_errors),
+            "queue_length": 0,
+            "last_activity": _last_activity
+        }
         
         # Rough estimate: if we're currently processing something, queue might have more
         if queue_info["currently_processing"]:
@@ -65,11 +86,6 @@ def get_queue_status():
         else:
             queue_info["queue_length"] = "0 (no active processing)"
         
-        # Get last activity timestamp
-        timestamp_matches = re.findall(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})", logs)
-        if timestamp_matches:
-            queue_info["last_activity"] = timestamp_matches[-1]
-        
         return queue_info
         
     except Exception as e:
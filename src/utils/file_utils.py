@@ -1,53 +1,126 @@
 import os
+import sys
 import argparse
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
 
-def generate_file_list_from_path(
+# Add the src directory to the Python path so this also runs as a standalone script
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from utils.filter_file_list import filter_dir_entries
+
+# Output files are opened with a 64 KiB buffer and written ~1000 lines at a time
+WRITE_BUFFER_SIZE = 1 << 16
+WRITE_BATCH_LINES = 1000
+
+def write_lines(f: TextIO, lines: Iterable[str], batch_size: int = WRITE_BATCH_LINES) -> int:
+    """
+    Write one line per item, joining each batch into a single write call.
+    
+    Args:
+        f: Text file opened for writing
+        lines: Lines to write, without trailing newlines
+        batch_size: Number of lines joined per write (default: WRITE_BATCH_LINES)
+    
+    Returns:
+        Number of lines written
+    """
+    count = 0
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            f.write("\n".join(batch) + "\n")
+            count += len(batch)
+            batch.clear()
+    if batch:
+        f.write("\n".join(batch) + "\n")
+        count += len(batch)
+    return count
+
+def iter_files(
     root_dir: str = ".",
     extensions: Optional[List[str]] = None,
     exclude_dirs: Optional[List[str]] = None,
-    absolute_paths: bool = True
-) -> List[str]:
+    absolute_paths: bool = True,
+    size_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+) -> Iterator[str]:
     """
-    Generate a list of file paths from a directory tree.
+    Yield file paths from a directory tree as it is walked.
     
     Args:
         root_dir: Root directory to scan (default: current directory)
         extensions: List of file extensions to include (e.g., ['py', 'js', 'md'])
         exclude_dirs: List of directory names to exclude (e.g., ['node_modules', '.git'])
         absolute_paths: Whether to return absolute paths (default: True)
+        size_range: Optional (min_size, max_size) in bytes; either bound may be None
     
-    Returns:
-        List of file paths
+    Yields:
+        File paths, one directory at a time
     """
-    if exclude_dirs is None:
-        exclude_dirs = []
+    exclude_set = frozenset(exclude_dirs or ())
+    ext_set = frozenset(e.lower() for e in extensions) if extensions else None
     
+    # Root is made absolute up front, so every DirEntry.path below already is
     root_dir = os.path.abspath(root_dir)
-    file_paths = []
+    min_size, max_size = size_range or (None, None)
     
-    # Walk through the directory tree
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # Filter out excluded directories
-        dirnames[:] = [d for d in dirnames if d not in exclude_dirs]
+    def walk(dirpath: str) -> Iterator[str]:
+        # Same order as os.walk: a directory's files, then its subdirectories
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type, so this needs no extra stat call
+                    if entry.is_dir():
+                        # Like os.walk, don't descend into symlinked directories
+                        if entry.name not in exclude_set and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                    
+                    # Check file extension if specified (same rules as os.path.splitext)
+                    if ext_set is not None:
+                        head, dot, file_ext = entry.name.rpartition('.')
+                        if not dot or not head.strip('.'):
+                            file_ext = ''
+                        if file_ext.lower() not in ext_set:
+                            continue
+                    
+                    files.append(entry)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            return
         
-        for filename in filenames:
-            # Check file extension if specified
-            if extensions:
-                file_ext = os.path.splitext(filename)[1].lower().lstrip('.')
-                if file_ext not in extensions:
-                    continue
-            
-            # Get the file path
-            file_path = os.path.join(dirpath, filename)
-            
-            # Convert to absolute path if requested
-            if absolute_paths:
-                file_path = os.path.abspath(file_path)
-            
-            file_paths.append(file_path)
+        # The scandir handle is closed before yielding, so a paused consumer
+        # never holds one open file descriptor per directory level
+        if size_range:
+            # Size check uses the DirEntry's own stat rather than a second lookup by path
+            yield from filter_dir_entries(files, min_size=min_size, max_size=max_size)
+        else:
+            for entry in files:
+                yield entry.path
+        
+        for subdir in subdirs:
+            yield from walk(subdir)
     
-    return file_paths
+    yield from walk(root_dir)
+
+def generate_file_list_from_path(
+    root_dir: str = ".",
+    extensions: Optional[List[str]] = None,
+    exclude_dirs: Optional[List[str]] = None,
+    absolute_paths: bool = True,
+    size_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+) -> List[str]:
+    """
+    Generate a list of file paths from a directory tree.
+    
+    List-returning wrapper around iter_files; see it for the arguments.
+    
+    Returns:
+        List of file paths
+    """
+    return list(iter_files(root_dir, extensions, exclude_dirs, absolute_paths, size_range))
 
 def main():
     """Legacy main function for backward compatibility."""
@@ -56,14 +129,11 @@ def main():
     parser.add_argument('--output-file', type=str, default='file_list.txt', help='Output file name (default: file_list.txt)')
     args = parser.parse_args()
 
-    file_paths = generate_file_list_from_path(root_dir=args.root_dir)
-    
-    # Write all file paths to the output file
-    with open(args.output_file, 'w') as f:
-        for path in file_paths:
-            f.write(path + '\n')
+    # Stream paths straight to the output file instead of building the whole list first
+    with open(args.output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        count = write_lines(f, iter_files(root_dir=args.root_dir))
 
-    print(f"Wrote {len(file_paths)} file paths to {args.output_file}")
+    print(f"Wrote {count} file paths to {args.output_file}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,7 +1,9 @@
 import argparse
 import os
 import fnmatch
-from typing import List, Optional
+import functools
+import re
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
 
 # Default patterns to filter out
 DEFAULT_FILTER_PATTERNS = [
@@ -17,36 +19,49 @@ DEFAULT_FILTER_PATTERNS = [
     '*.cache',
 ]
 
-def filter_file_list(
-    file_paths: List[str],
+@functools.lru_cache(maxsize=256)
+def _compile_exclude_rx(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """Compile glob patterns into one regex matched against normcased file names."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(os.path.normcase(p))})" for p in patterns))
+
+@functools.lru_cache(maxsize=256)
+def _compile_dir_rx(dir_names: Tuple[str, ...]) -> Optional[Pattern]:
+    """Compile directory names into one regex matching any whole path component."""
+    if not dir_names:
+        return None
+    sep = re.escape(os.sep)
+    return re.compile(f"(?:^|{sep})(?:{'|'.join(map(re.escape, dir_names))})(?:{sep}|$)")
+
+def iter_filter(
+    file_paths: Iterable[str],
     exclude_patterns: Optional[List[str]] = None,
     exclude_dirs: Optional[List[str]] = None,
     exclude_extensions: Optional[List[str]] = None,
     min_size: Optional[int] = None,
     max_size: Optional[int] = None
-) -> List[str]:
+) -> Iterator[str]:
     """
-    Filter a list of file paths based on various criteria.
+    Lazily filter file paths based on various criteria.
     
     Args:
-        file_paths: List of file paths to filter
+        file_paths: File paths to filter (any iterable, e.g. iter_files output)
         exclude_patterns: List of glob patterns to exclude (e.g., ['*.log', '*.tmp'])
         exclude_dirs: List of directory names to exclude (e.g., ['node_modules', '.git'])
         exclude_extensions: List of file extensions to exclude (e.g., ['log', 'tmp'])
         min_size: Minimum file size in bytes
         max_size: Maximum file size in bytes
     
-    Returns:
-        Filtered list of file paths
+    Yields:
+        File paths that pass every filter
     """
-    if exclude_patterns is None:
-        exclude_patterns = []
-    if exclude_dirs is None:
-        exclude_dirs = []
-    if exclude_extensions is None:
-        exclude_extensions = []
-    
-    filtered_files = []
+    # Combined regexes for the glob patterns and directory names (cached across
+    # calls), and a set for extension lookups, rather than work per path
+    exclude_rx = _compile_exclude_rx(tuple(sorted(exclude_patterns or ())))
+    # A path is excluded when any whole component equals one of exclude_dirs
+    dir_rx = _compile_dir_rx(tuple(sorted(exclude_dirs or ())))
+    ext_set = frozenset(e.lower() for e in exclude_extensions or ())
     
     for file_path in file_paths:
         # Skip empty lines
@@ -66,24 +81,90 @@ def filter_file_list(
                 continue
         
         # Check exclude patterns (glob patterns)
-        if exclude_patterns:
-            filename = os.path.basename(file_path)
-            if any(fnmatch.fnmatch(filename, pattern) for pattern in exclude_patterns):
-                continue
+        if exclude_rx and exclude_rx.match(os.path.normcase(os.path.basename(file_path))):
+            continue
         
         # Check exclude directories
-        if exclude_dirs:
-            path_parts = file_path.split(os.sep)
-            if any(dir_name in path_parts for dir_name in exclude_dirs):
-                continue
+        if dir_rx and dir_rx.search(file_path):
+            continue
         
         # Check exclude extensions
-        if exclude_extensions:
+        if ext_set:
             file_ext = os.path.splitext(file_path)[1].lower().lstrip('.')
-            if file_ext in exclude_extensions:
+            if file_ext in ext_set:
                 continue
         
-        filtered_files.append(file_path)
+        yield file_path
+
+def filter_file_list(
+    file_paths: List[str],
+    exclude_patterns: Optional[List[str]] = None,
+    exclude_dirs: Optional[List[str]] = None,
+    exclude_extensions: Optional[List[str]] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None
+) -> List[str]:
+    """
+    Filter a list of file paths based on various criteria.
+    
+    List-returning wrapper around iter_filter; see it for the arguments.
+    
+    Returns:
+        Filtered list of file paths
+    """
+    return list(iter_filter(
+        file_paths, exclude_patterns, exclude_dirs, exclude_extensions, min_size, max_size
+    ))
+
+def filter_dir_entries(
+    entries: Iterable[os.DirEntry],
+    exclude_patterns: Optional[List[str]] = None,
+    exclude_extensions: Optional[List[str]] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None
+) -> List[str]:
+    """
+    Filter directory entries from os.scandir, reusing each entry's cached stat.
+    
+    Same rules as filter_file_list, but sizes come from DirEntry.stat() and names
+    from DirEntry.name, so no extra os.path.getsize call is made per file.
+    Symlinks are followed, as os.path.getsize does, so both give the same result.
+    
+    Args:
+        entries: Directory entries to filter (e.g., from os.scandir)
+        exclude_patterns: List of glob patterns to exclude (e.g., ['*.log', '*.tmp'])
+        exclude_extensions: List of file extensions to exclude (e.g., ['log', 'tmp'])
+        min_size: Minimum file size in bytes
+        max_size: Maximum file size in bytes
+    
+    Returns:
+        Paths of the entries that were kept
+    """
+    exclude_rx = _compile_exclude_rx(tuple(sorted(exclude_patterns or ())))
+    ext_set = frozenset(e.lower() for e in exclude_extensions or ())
+    check_size = min_size is not None or max_size is not None
+    
+    filtered_files = []
+    
+    for entry in entries:
+        if check_size:
+            try:
+                file_size = entry.stat().st_size
+            except OSError:
+                # Skip entries that can't be accessed
+                continue
+            if min_size is not None and file_size < min_size:
+                continue
+            if max_size is not None and file_size > max_size:
+                continue
+        
+        if exclude_rx and exclude_rx.match(os.path.normcase(entry.name)):
+            continue
+        
+        if ext_set and os.path.splitext(entry.name)[1].lower().lstrip('.') in ext_set:
+            continue
+        
+        filtered_files.append(entry.path)
     
     return filtered_files
 
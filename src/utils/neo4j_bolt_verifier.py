@@ -7,9 +7,9 @@ using the same Bolt protocol that Graphiti uses.
 """
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
-from neo4j import AsyncGraphDatabase
+from neo4j import AsyncGraphDatabase, READ_ACCESS
 
 class Neo4jBoltVerifier:
     def __init__(self, uri: str = "bolt://localhost:7687", 
@@ -18,6 +18,9 @@ class Neo4jBoltVerifier:
         self.username = username
         self.password = password
         self.driver = None
+        # One read session reused by every query, instead of a new session per query
+        self._session = None
+        self._session_busy = False
         
     def log(self, message: str):
         """Log a message with timestamp"""
@@ -31,9 +34,18 @@ class Neo4jBoltVerifier:
                 self.uri,
                 auth=(self.username, self.password)
             )
+        if self._session is None:
+            self._session = self._open_session()
+            
+    def _open_session(self):
+        """Open a read session on the server's default database"""
+        return self.driver.session(default_access_mode=READ_ACCESS)
         
     async def close(self):
         """Close the Neo4j connection"""
+        if self._session:
+            await self._session.close()
+            self._session = None
         if self.driver:
             await self.driver.close()
             self.driver = None
@@ -42,11 +54,25 @@ class Neo4jBoltVerifier:
         """Execute a Cypher query against Neo4j"""
         await self.connect()
         
+        # A session runs one query at a time, so queries issued while the shared
+        # session is busy (e.g. under asyncio.gather) get a short-lived one of their own
+        if self._session_busy:
+            async with self._open_session() as session:
+                return await self._run_query(session, query, kwargs)
+        
+        self._session_busy = True
         try:
-            async with self.driver.session() as session:
-                result = await session.run(query, **kwargs)
-                records = await result.data()
-                return {"success": True, "data": records}
+            return await self._run_query(self._session, query, kwargs)
+        finally:
+            self._session_busy = False
+            
+    async def _run_query(self, session, query: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a query on the given session and collect its records"""
+        try:
+            result = await session.run(query, **params)
+            # Keep the driver's records as-is rather than converting every value to dicts
+            records = [record async for record in result]
+            return {"success": True, "data": records}
         except Exception as e:
             self.log(f"Neo4j query error: {e}")
             return {"success": False, "error": str(e)}
@@ -74,28 +100,30 @@ class Neo4jBoltVerifier:
         return await self.execute_query(query)
         
     async def get_memory_nodes(self) -> Dict[str, Any]:
-        """Get all memory-related nodes"""
+        """Get the names of memory-related nodes"""
         self.log("=== Getting Memory Nodes ===")
         query = """
         MATCH (n)
         WHERE n.name IS NOT NULL OR n.episode_body IS NOT NULL
-        RETURN n
+        RETURN n.name AS name
         LIMIT 50
         """
         return await self.execute_query(query)
         
     async def get_recent_nodes(self, hours: int = 24) -> Dict[str, Any]:
-        """Get nodes created in the last N hours"""
+        """Get the name and created_at of nodes created in the last N hours"""
         self.log(f"=== Getting Recent Nodes (last {hours} hours) ===")
-        query = f"""
+        # Cutoff computed here so the plan only depends on parameters
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        query = """
         MATCH (n)
         WHERE n.created_at IS NOT NULL
-        AND datetime(n.created_at) > datetime() - duration({{hours: {hours}}})
-        RETURN n
-        ORDER BY n.created_at DESC
+        AND datetime(n.created_at) > datetime($cutoff)
+        RETURN n.name AS name, n.created_at AS created_at
+        ORDER BY created_at DESC
         LIMIT 50
         """
-        return await self.execute_query(query)
+        return await self.execute_query(query, cutoff=cutoff)
         
     async def get_node_count(self) -> Dict[str, Any]:
         """Get total node count"""
@@ -133,8 +161,14 @@ class Neo4jBoltVerifier:
         if not await self.test_neo4j_connection():
             return
             
+        # The count, memory and recent queries are independent, so run them concurrently
+        count_result, memory_result, recent_result = await asyncio.gather(
+            self.get_node_count(),
+            self.get_memory_nodes(),
+            self.get_recent_nodes(hours=24),
+        )
+        
         # Get node count
-        count_result = await self.get_node_count()
         if count_result["success"]:
             total_nodes = count_result["data"][0]["total_nodes"] if count_result["data"] else 0
             self.log(f"Total nodes in database: {total_nodes}")
@@ -142,7 +176,6 @@ class Neo4jBoltVerifier:
             self.log(f"Failed to get node count: {count_result['error']}")
             
         # Get memory nodes
-        memory_result = await self.get_memory_nodes()
         if memory_result["success"]:
             memory_count = len(memory_result["data"])
             self.log(f"Memory nodes found: {memory_count}")
@@ -150,14 +183,12 @@ class Neo4jBoltVerifier:
             if memory_count > 0:
                 self.log("Sample memory nodes:")
                 for i, record in enumerate(memory_result["data"][:5]):
-                    node = record["n"]
-                    name = node.get("name", "NO_NAME")
+                    name = record["name"] or "NO_NAME"
                     self.log(f"  {i+1}. {name}")
         else:
             self.log(f"Failed to get memory nodes: {memory_result['error']}")
             
         # Get recent nodes
-        recent_result = await self.get_recent_nodes(hours=24)
         if recent_result["success"]:
             recent_count = len(recent_result["data"])
             self.log(f"Recent nodes (last 24h): {recent_count}")
@@ -165,9 +196,8 @@ class Neo4jBoltVerifier:
             if recent_count > 0:
                 self.log("Recent memory nodes:")
                 for i, record in enumerate(recent_result["data"][:5]):
-                    node = record["n"]
-                    name = node.get("name", "NO_NAME")
-                    created_at = node.get("created_at", "NO_DATE")
+                    name = record["name"] or "NO_NAME"
+                    created_at = record["created_at"] or "NO_DATE"
                     self.log(f"  {i+1}. {name} (created: {created_at})")
         else:
             self.log(f"Failed to get recent nodes: {recent_result['error']}")
@@ -175,8 +205,10 @@ class Neo4jBoltVerifier:
         # Search for specific terms if provided
         if search_terms:
             self.log("=== Searching for specific terms ===")
-            for term in search_terms:
-                search_result = await self.search_for_specific_memory(term)
+            search_results = await asyncio.gather(
+                *(self.search_for_specific_memory(term) for term in search_terms)
+            )
+            for term, search_result in zip(search_terms, search_results):
                 if search_result["success"]:
                     found_count = len(search_result["data"])
                     self.log(f"Found {found_count} nodes containing '{term}'")
@@ -3,146 +3,231 @@
 Neo4j Memory Verification Script
 
 This script helps verify what memories are actually stored in Neo4j
-and can help diagnose issues with memory storage.
+and can help diagnose issues with memory storage. Queries go over the
+Bolt protocol through one pooled driver.
 """
 
-import requests
-import json
-from datetime import datetime
-from typing import Dict, Any, List
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import orjson
+from neo4j import GraphDatabase
+
+# Verification queries, shared by the single-query helpers and the batched run
+ALL_NODES_QUERY = "MATCH (n) RETURN labels(n) AS labels, count(*) AS c ORDER BY c DESC"
+SAMPLE_NODES_QUERY = "MATCH (n) RETURN n LIMIT $limit"
+MEMORY_NODES_QUERY = """
+MATCH (n)
+WHERE n.name CONTAINS 'memory' OR n.name CONTAINS 'test' OR n.episode_body IS NOT NULL
+RETURN n
+LIMIT 50
+"""
+# $cutoff is computed client-side (see recent_cutoff) so the plan only depends
+# on parameters; a range index on created_at turns the filter into a range seek
+RECENT_NODES_QUERY = """
+MATCH (n)
+WHERE n.created_at IS NOT NULL
+AND datetime(n.created_at) > datetime($cutoff)
+RETURN n
+ORDER BY n.created_at DESC
+LIMIT 50
+"""
+NODE_COUNT_QUERY = "MATCH (n) RETURN count(n) as total_nodes"
+RELATIONSHIP_COUNT_QUERY = "MATCH ()-[r]->() RETURN count(r) as total_relationships"
+SEARCH_QUERY = """
+MATCH (n)
+WHERE n.name CONTAINS $search_term OR n.episode_body CONTAINS $search_term
+RETURN n
+LIMIT 20
+"""
+
+def configure_logging() -> None:
+    """Send Neo4jVerifier's log messages to stderr with timestamps.
+
+    Called by the command-line entry points only, so importing this module
+    never changes the host application's logging setup. basicConfig is a
+    no-op once the root logger has handlers.
+    """
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s",
+                        datefmt="%Y-%m-%d %H:%M:%S")
+
+def recent_cutoff(hours: int) -> str:
+    """Return the ISO-8601 UTC timestamp `hours` ago, for RECENT_NODES_QUERY's $cutoff"""
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
 
 class Neo4jVerifier:
-    def __init__(self, neo4j_url: str = "http://localhost:7474", 
+    # Seconds a cached read result stays valid
+    CACHE_TTL = 60.0
+    # Threads used to run independent queries side by side (the driver is thread-safe)
+    MAX_WORKERS = 8
+    
+    def __init__(self, uri: str = "bolt://localhost:7687", 
                  username: str = "neo4j", password: str = "password"):
-        self.neo4j_url = neo4j_url
+        self.uri = uri
         self.username = username
         self.password = password
-        self.session = requests.Session()
+        self.driver = None
+        # (method, args) -> (time cached, result) for repeated read-only queries
+        self._cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+        # Timestamps come from the logging formatter (see configure_logging)
+        self._logger = logging.getLogger(__name__)
         
     def log(self, message: str):
         """Log a message with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] {message}")
+        self._logger.info(message)
+        
+    def connect(self):
+        """Create the Bolt driver (connections are opened and pooled on demand)"""
+        if self.driver is None:
+            auth = (self.username, self.password) if self.username and self.password else None
+            self.driver = GraphDatabase.driver(self.uri, auth=auth)
+        return self.driver
+        
+    def clear_cache(self):
+        """Forget all cached query results"""
+        self._cache.clear()
         
+    def _cached(self, key: Tuple, fetch: Callable[[], Dict[str, Any]],
+                keep: Callable[[Dict[str, Any]], bool] = lambda r: "error" not in r) -> Dict[str, Any]:
+        """Return a cached result younger than CACHE_TTL, else fetch() it and cache it if keep(result)"""
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.CACHE_TTL:
+            return hit[1]
+        result = fetch()
+        if keep(result):
+            self._cache[key] = (now, result)
+        return result
+        
+    def close(self):
+        """Close the Neo4j driver and its pooled connections"""
+        if self.driver:
+            self.driver.close()
+            self.driver = None
+            
     def test_neo4j_connection(self) -> bool:
         """Test if Neo4j is accessible"""
         self.log("=== Testing Neo4j Connection ===")
         try:
-            # Try to access Neo4j browser
-            response = self.session.get(f"{self.neo4j_url}/browser/", timeout=5)
-            self.log(f"Neo4j browser response: {response.status_code}")
-            
-            # Try to access Neo4j REST API
-            response = self.session.get(f"{self.neo4j_url}/db/data/", timeout=5)
-            self.log(f"Neo4j REST API response: {response.status_code}")
-            
-            return response.status_code == 200
+            self.connect().verify_connectivity()
+            self.log(f"Neo4j Bolt connection to {self.uri} successful")
+            return True
             
         except Exception as e:
             self.log(f"Neo4j connection failed: {e}")
             return False
             
-    def query_neo4j(self, query: str) -> Dict[str, Any]:
-        """Execute a Cypher query against Neo4j"""
+    def query_neo4j_batch(self, statements: List[Tuple[str, Dict[str, Any]]],
+                          max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Execute several Cypher statements in one read transaction.
+        
+        Records are consumed as the driver streams them in; with max_rows set,
+        rows past the limit are only counted, so large results are never held
+        in memory.
+        
+        Args:
+            statements: (query, parameters) pairs, run in order
+            max_rows: Keep at most this many rows per statement (default: all)
+        
+        Returns:
+            The same shape as the HTTP transactional endpoint, with one entry
+            per statement: {"results": [{"columns": [...], "data": [{"row": [...]}],
+            "row_count": n}, ...], "errors": []}, or {"error": message} if any
+            statement failed
+        """
+        def run_all(tx):
+            results = []
+            for query, params in statements:
+                result = tx.run(query, params)
+                columns = list(result.keys())
+                data = []
+                row_count = 0
+                for record in result:
+                    if max_rows is None or row_count < max_rows:
+                        record_data = record.data()
+                        data.append({"row": [record_data[c] for c in columns]})
+                    row_count += 1
+                results.append({"columns": columns, "data": data, "row_count": row_count})
+            return results
+        
         try:
-            url = f"{self.neo4j_url}/db/data/transaction/commit"
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            payload = {
-                "statements": [{"statement": query}]
-            }
-            
-            # Use basic auth if credentials provided
-            auth = None
-            if self.username and self.password:
-                auth = (self.username, self.password)
-                
-            response = self.session.post(url, json=payload, headers=headers, auth=auth, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.log(f"Neo4j query failed with status {response.status_code}: {response.text}")
-                return {"error": f"Query failed: {response.status_code}"}
+            with self.connect().session() as session:
+                results = session.execute_read(run_all)
+            return {"results": results, "errors": []}
                 
         except Exception as e:
             self.log(f"Neo4j query error: {e}")
-            return {"error": str(e)}
+            return {"error": f"{type(e).__name__}: {e}"}
+            
+    def query_neo4j(self, query: str, **params) -> Dict[str, Any]:
+        """Execute a single Cypher query against Neo4j (see query_neo4j_batch for the result shape)"""
+        return self.query_neo4j_batch([(query, params)])
             
     def get_all_nodes(self) -> Dict[str, Any]:
-        """Get all nodes in the database"""
+        """Get node counts grouped by label set (no node properties are transferred)"""
         self.log("=== Getting All Nodes ===")
-        query = "MATCH (n) RETURN n LIMIT 100"
-        return self.query_neo4j(query)
+        return self.query_neo4j(ALL_NODES_QUERY)
+        
+    def get_sample_nodes(self, limit: int = 3) -> Dict[str, Any]:
+        """Get a few full nodes for a qualitative look at what is stored"""
+        self.log(f"=== Getting Sample Nodes ({limit}) ===")
+        return self.query_neo4j(SAMPLE_NODES_QUERY, limit=limit)
         
     def get_memory_nodes(self) -> Dict[str, Any]:
         """Get all memory-related nodes"""
         self.log("=== Getting Memory Nodes ===")
-        query = """
-        MATCH (n)
-        WHERE n.name CONTAINS 'memory' OR n.name CONTAINS 'test' OR n.episode_body IS NOT NULL
-        RETURN n
-        LIMIT 50
-        """
-        return self.query_neo4j(query)
+        return self.query_neo4j(MEMORY_NODES_QUERY)
         
     def get_recent_nodes(self, hours: int = 24) -> Dict[str, Any]:
         """Get nodes created in the last N hours"""
         self.log(f"=== Getting Recent Nodes (last {hours} hours) ===")
-        query = f"""
-        MATCH (n)
-        WHERE n.created_at IS NOT NULL
-        AND datetime(n.created_at) > datetime() - duration({{hours: {hours}}})
-        RETURN n
-        ORDER BY n.created_at DESC
-        LIMIT 50
-        """
-        return self.query_neo4j(query)
+        return self.query_neo4j(RECENT_NODES_QUERY, cutoff=recent_cutoff(hours))
         
     def get_node_count(self) -> Dict[str, Any]:
         """Get total node count"""
         self.log("=== Getting Node Count ===")
-        query = "MATCH (n) RETURN count(n) as total_nodes"
-        return self.query_neo4j(query)
+        return self._cached(("node_count",), lambda: self.query_neo4j(NODE_COUNT_QUERY))
         
     def get_relationship_count(self) -> Dict[str, Any]:
         """Get total relationship count"""
         self.log("=== Getting Relationship Count ===")
-        query = "MATCH ()-[r]->() RETURN count(r) as total_relationships"
-        return self.query_neo4j(query)
+        return self._cached(("relationship_count",), lambda: self.query_neo4j(RELATIONSHIP_COUNT_QUERY))
         
     def search_for_specific_memory(self, search_term: str) -> Dict[str, Any]:
         """Search for a specific memory by name or content"""
         self.log(f"=== Searching for Memory: {search_term} ===")
-        query = f"""
-        MATCH (n)
-        WHERE n.name CONTAINS '{search_term}' OR n.episode_body CONTAINS '{search_term}'
-        RETURN n
-        LIMIT 20
-        """
-        return self.query_neo4j(query)
+        # Only hits are cached: a memory that was not found yet may be added at any time
+        return self._cached(
+            ("search", search_term),
+            lambda: self.query_neo4j(SEARCH_QUERY, search_term=search_term),
+            keep=lambda r: "error" not in r and bool(r["results"][0]["data"]),
+        )
         
     def get_database_info(self) -> Dict[str, Any]:
         """Get database information"""
         self.log("=== Getting Database Info ===")
+        return self._cached(("database_info",), self._fetch_database_info)
+        
+    def _fetch_database_info(self) -> Dict[str, Any]:
+        """Run the database information queries"""
         queries = [
             "CALL dbms.components() YIELD name, versions, edition RETURN name, versions, edition",
             "CALL dbms.database.version() YIELD version RETURN version",
             "SHOW DATABASES YIELD name, current, role, address, requestedStatus, currentStatus"
         ]
         
-        results = {}
-        for i, query in enumerate(queries):
+        def run(query: str) -> Dict[str, Any]:
             try:
-                result = self.query_neo4j(query)
-                results[f"query_{i}"] = result
+                return self.query_neo4j(query)
             except Exception as e:
-                results[f"query_{i}"] = {"error": str(e)}
-                
-        return results
+                return {"error": str(e)}
+        
+        # Independent queries, each on its own session, run concurrently
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(queries))) as pool:
+            return {f"query_{i}": result for i, result in enumerate(pool.map(run, queries))}
         
     def run_full_verification(self, search_terms: List[str] = None):
         """Run a full verification of Neo4j contents"""
@@ -153,34 +238,48 @@ class Neo4jVerifier:
             self.log("Neo4j not accessible - stopping verification")
             return
             
-        # Get database info
-        db_info = self.get_database_info()
-        self.log(f"Database info: {json.dumps(db_info, indent=2)}")
-        
-        # Get counts
-        node_count = self.get_node_count()
-        self.log(f"Node count: {json.dumps(node_count, indent=2)}")
-        
-        relationship_count = self.get_relationship_count()
-        self.log(f"Relationship count: {json.dumps(relationship_count, indent=2)}")
-        
-        # Get all nodes (limited)
-        all_nodes = self.get_all_nodes()
-        self.log(f"All nodes (first 100): {json.dumps(all_nodes, indent=2)}")
+        # Run the counts, node fetches and searches in one transaction, then
+        # report each statement's result in the usual per-query shape
+        search_terms = search_terms or []
+        labels = ["Node count", "Relationship count", "Nodes by label",
+                  "Sample nodes", "Memory nodes", "Recent nodes"]
+        labels += [f"Search for '{term}'" for term in search_terms]
+        statements = [
+            (NODE_COUNT_QUERY, {}),
+            (RELATIONSHIP_COUNT_QUERY, {}),
+            (ALL_NODES_QUERY, {}),
+            (SAMPLE_NODES_QUERY, {"limit": 3}),
+            (MEMORY_NODES_QUERY, {}),
+            (RECENT_NODES_QUERY, {"cutoff": recent_cutoff(24)}),
+        ]
+        statements += [(SEARCH_QUERY, {"search_term": term}) for term in search_terms]
         
-        # Get memory nodes
-        memory_nodes = self.get_memory_nodes()
-        self.log(f"Memory nodes: {json.dumps(memory_nodes, indent=2)}")
+        # The database info queries and the batch are independent, so overlap them
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            db_info_future = pool.submit(self.get_database_info)
+            batch_future = pool.submit(self.query_neo4j_batch, statements, max_rows=5)
+            db_info = db_info_future.result()
+            batch = batch_future.result()
         
-        # Get recent nodes
-        recent_nodes = self.get_recent_nodes()
-        self.log(f"Recent nodes: {json.dumps(recent_nodes, indent=2)}")
+        # Get database info
+        self.log(f"Database info: {orjson.dumps(db_info, option=orjson.OPT_INDENT_2, default=str).decode()}")
         
-        # Search for specific terms
-        if search_terms:
-            for term in search_terms:
-                search_result = self.search_for_specific_memory(term)
-                self.log(f"Search for '{term}': {json.dumps(search_result, indent=2)}")
+        if "error" in batch:
+            self.log(f"Verification queries failed: {batch['error']}")
+        else:
+            # Log how many rows each statement returned and a short sample,
+            # rather than dumping every node as JSON
+            for label, result in zip(labels, batch["results"]):
+                self.log(f"{label}: {result['row_count']} rows")
+                if label == "Sample nodes":
+                    # Only the small sample is dumped with every property
+                    nodes = [entry["row"][0] for entry in result["data"]]
+                    self.log(orjson.dumps(nodes, option=orjson.OPT_INDENT_2, default=str).decode())
+                    continue
+                for i, entry in enumerate(result["data"], 1):
+                    values = [v.get("name", "NO_NAME") if isinstance(v, dict) else v
+                              for v in entry["row"]]
+                    self.log(f"  {i}. {', '.join(str(v) for v in values)}")
         
         self.log("=== NEO4J VERIFICATION COMPLETE ===")
 
@@ -189,8 +288,8 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Verify Neo4j memory storage")
-    parser.add_argument('--neo4j-url', default="http://localhost:7474", 
-                       help="Neo4j URL")
+    parser.add_argument('--neo4j-url', default="bolt://localhost:7687", 
+                       help="Neo4j Bolt URI")
     parser.add_argument('--username', default="neo4j", 
                        help="Neo4j username")
     parser.add_argument('--password', default="password", 
@@ -200,14 +299,18 @@ def main():
                        help="Terms to search for in memory nodes")
     
     args = parser.parse_args()
+    configure_logging()
     
     verifier = Neo4jVerifier(
-        neo4j_url=args.neo4j_url,
+        uri=args.neo4j_url,
         username=args.username,
         password=args.password
     )
     
-    verifier.run_full_verification(args.search_terms)
+    try:
+        verifier.run_full_verification(args.search_terms)
+    finally:
+        verifier.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Status output shared by the wait loops in the batch and Git processors.
+
+Spinner frames are redrawn in place on a terminal only; when stdout is a pipe
+or log file a plain status line is written every STATUS_EVERY polls instead.
+"""
+
+import sys
+
+IS_TTY = sys.stdout.isatty()
+STATUS_EVERY = 10
+
+def print_wait_status(message: str, polls: int) -> None:
+    """Report a wait-loop status without a flushed write on every poll."""
+    if IS_TTY:
+        print(f"\r⏳ {message}", end="", flush=True)
+    elif polls % STATUS_EVERY == 0:
+        print(f"⏳ {message}")
@@ -1,140 +1,91 @@
 #!/usr/bin/env python3
 """
 Test script to validate queue reading capabilities.
-This script tests all the docker exec commands for reading queue state.
+This script reads the queue state from the MCP server's queue status endpoint
+(falling back to one persistent docker exec process) and checks each piece of
+it (sizes, names, worker status, group ids).
 """
 
-import subprocess
+import sys
+import os
 import json
 import time
 from datetime import datetime
 
-def run_docker_command(cmd):
-    """Run a docker exec command and return the result."""
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+from queue_management.queue_common import QUEUE_STATUS_URL, fetch_queue_status
+
+def read_queue_snapshot():
+    """
+    Read all queue data in one request.
+    
+    The MCP server dumps its in-memory queue dicts at QUEUE_STATUS_URL, so a
+    read is a single HTTP GET with no process spawn or import. If the endpoint
+    is down, queue_management.queue_common falls back to its persistent
+    in-container status process.
+    """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode != 0:
-            return {"error": result.stderr.strip() or "Command failed"}
-        return {"success": True, "output": result.stdout.strip()}
-    except subprocess.TimeoutExpired:
-        return {"error": "Command timed out"}
-    except Exception as e:
-        return {"error": str(e)}
+        groups = fetch_queue_status()
+    except (RuntimeError, OSError) as e:
+        print(f"❌ Failed to read queue snapshot: {e}")
+        return None
+    return {"groups": groups, "total_groups": len(groups), "all_group_ids": list(groups)}
 
-def test_queue_size_reading():
+def test_queue_size_reading(snapshot=None):
     """Test reading queue sizes."""
     print("🔍 Testing queue size reading...")
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        "import json, graphiti_mcp_server as s; print(json.dumps({k: q.qsize() for k, q in s.episode_queues.items()}))"
-    ]
-    result = run_docker_command(cmd)
-    if result.get("success"):
-        try:
-            queue_sizes = json.loads(result["output"])
-            print(f"✅ Queue sizes: {queue_sizes}")
-            return queue_sizes
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse JSON: {result['output']}")
-            return None
-    else:
-        print(f"❌ Failed to read queue sizes: {result['error']}")
+    snapshot = snapshot if snapshot is not None else read_queue_snapshot()
+    if snapshot is None:
+        print("❌ Failed to read queue sizes")
         return None
+    queue_sizes = {k: g.get("size", 0) for k, g in snapshot["groups"].items()}
+    print(f"✅ Queue sizes: {queue_sizes}")
+    return queue_sizes
 
-def test_queue_names_reading():
+def test_queue_names_reading(snapshot=None):
     """Test reading queue names."""
     print("🔍 Testing queue names reading...")
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        "import json, graphiti_mcp_server as s; print(json.dumps({k: s.queue_names.get(k, []) for k in s.episode_queues.keys()}))"
-    ]
-    result = run_docker_command(cmd)
-    if result.get("success"):
-        try:
-            queue_names = json.loads(result["output"])
-            print(f"✅ Queue names: {queue_names}")
-            return queue_names
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse JSON: {result['output']}")
-            return None
-    else:
-        print(f"❌ Failed to read queue names: {result['error']}")
+    snapshot = snapshot if snapshot is not None else read_queue_snapshot()
+    if snapshot is None:
+        print("❌ Failed to read queue names")
         return None
+    queue_names = {k: g.get("items", []) for k, g in snapshot["groups"].items()}
+    print(f"✅ Queue names: {queue_names}")
+    return queue_names
 
-def test_worker_status_reading():
+def test_worker_status_reading(snapshot=None):
     """Test reading worker status."""
     print("🔍 Testing worker status reading...")
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        "import json, graphiti_mcp_server as s; print(json.dumps({k: s.queue_workers.get(k, False) for k in s.episode_queues.keys()}))"
-    ]
-    result = run_docker_command(cmd)
-    if result.get("success"):
-        try:
-            worker_status = json.loads(result["output"])
-            print(f"✅ Worker status: {worker_status}")
-            return worker_status
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse JSON: {result['output']}")
-            return None
-    else:
-        print(f"❌ Failed to read worker status: {result['error']}")
+    snapshot = snapshot if snapshot is not None else read_queue_snapshot()
+    if snapshot is None:
+        print("❌ Failed to read worker status")
         return None
+    worker_status = {k: g.get("worker_active", False) for k, g in snapshot["groups"].items()}
+    print(f"✅ Worker status: {worker_status}")
+    return worker_status
 
-def test_comprehensive_reading():
+def test_comprehensive_reading(snapshot=None):
     """Test reading all queue data at once."""
     print("🔍 Testing comprehensive queue reading...")
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        """import json, graphiti_mcp_server as s
-result = {}
-for k, q in s.episode_queues.items():
-    result[k] = {
-        'size': q.qsize(),
-        'items': s.queue_names.get(k, []),
-        'worker_active': s.queue_workers.get(k, False)
-    }
-print(json.dumps(result, indent=2))"""
-    ]
-    result = run_docker_command(cmd)
-    if result.get("success"):
-        try:
-            comprehensive_data = json.loads(result["output"])
-            print(f"✅ Comprehensive data: {json.dumps(comprehensive_data, indent=2)}")
-            return comprehensive_data
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse JSON: {result['output']}")
-            return None
-    else:
-        print(f"❌ Failed to read comprehensive data: {result['error']}")
+    snapshot = snapshot if snapshot is not None else read_queue_snapshot()
+    if snapshot is None:
+        print("❌ Failed to read comprehensive data")
         return None
+    comprehensive_data = snapshot["groups"]
+    print(f"✅ Comprehensive data: {json.dumps(comprehensive_data, indent=2)}")
+    return comprehensive_data
 
-def test_edge_cases():
+def test_edge_cases(snapshot=None):
     """Test edge cases like empty queue, multiple groups, etc."""
     print("🔍 Testing edge cases...")
-    
-    # Test with no group_id (should work)
-    cmd = [
-        "docker", "exec", "graphiti-graphiti-mcp-1",
-        "python", "-c",
-        "import json, graphiti_mcp_server as s; print(json.dumps({'total_groups': len(s.episode_queues), 'all_group_ids': list(s.episode_queues.keys())}))"
-    ]
-    result = run_docker_command(cmd)
-    if result.get("success"):
-        try:
-            edge_data = json.loads(result["output"])
-            print(f"✅ Edge case data: {edge_data}")
-            return edge_data
-        except json.JSONDecodeError:
-            print(f"❌ Failed to parse JSON: {result['output']}")
-            return None
-    else:
-        print(f"❌ Failed to read edge case data: {result['error']}")
+    snapshot = snapshot if snapshot is not None else read_queue_snapshot()
+    if snapshot is None:
+        print("❌ Failed to read edge case data")
         return None
+    edge_data = {"total_groups": snapshot["total_groups"], "all_group_ids": snapshot["all_group_ids"]}
+    print(f"✅ Edge case data: {edge_data}")
+    return edge_data
 
 def main():
     """Run all tests."""
@@ -144,20 +95,23 @@ def main():
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
+    # Read the queue state once, then check each capability against it
+    snapshot = read_queue_snapshot()
+    
     # Test all reading capabilities
-    queue_sizes = test_queue_size_reading()
+    queue_sizes = test_queue_size_reading(snapshot)
     print()
     
-    queue_names = test_queue_names_reading()
+    queue_names = test_queue_names_reading(snapshot)
     print()
     
-    worker_status = test_worker_status_reading()
+    worker_status = test_worker_status_reading(snapshot)
     print()
     
-    comprehensive_data = test_comprehensive_reading()
+    comprehensive_data = test_comprehensive_reading(snapshot)
     print()
     
-    edge_data = test_edge_cases()
+    edge_data = test_edge_cases(snapshot)
     print()
     
     # Summary
@@ -178,6 +132,7 @@ def main():
         print("✅ Queue reading capabilities are working correctly")
         print()
         print("📋 RELIABLE COMMANDS:")
+        print(f"0. Endpoint (preferred): curl -s {QUEUE_STATUS_URL}")
         print("1. Queue sizes: docker exec graphiti-graphiti-mcp-1 python -c \"import json, graphiti_mcp_server as s; print(json.dumps({k: q.qsize() for k, q in s.episode_queues.items()}))\"")
         print("2. Queue names: docker exec graphiti-graphiti-mcp-1 python -c \"import json, graphiti_mcp_server as s; print(json.dumps({k: s.queue_names.get(k, []) for k in s.episode_queues.keys()}))\"")
         print("3. Worker status: docker exec graphiti-graphiti-mcp-1 python -c \"import json, graphiti_mcp_server as s; print(json.dumps({k: s.queue_workers.get(k, False) for k in s.episode_queues.keys()}))\"")
@@ -190,7 +145,7 @@ def main():
     print("Current queue state:")
     if comprehensive_data:
         for group_id, data in comprehensive_data.items():
-            print(f"  Group '{group_id}': {data['size']} items, {len(data['items'])} names, worker_active={data['worker_active']}")
+            print(f"  Group '{group_id}': {data.get('size', 0)} items, {len(data.get('items', []))} names, worker_active={data.get('worker_active', False)}")
     else:
         print("  Unable to read queue state")
 
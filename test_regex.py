@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 import re
 
-# Test the regex pattern from the queue monitor
+# Test the regex pattern from the queue monitor (compiled once at load)
+EPISODE_RE = re.compile(r"Processing queued episode '([^']+)' for group_id: (\S+)")
+
 log_line = "Processing queued episode '/Users/nathanielsena/Documents/code/Kismet/custom-chat-element/index.html' for group_id: default"
-pattern = r"Processing queued episode '([^']+)' for group_id: ([^\s]+)"
 
 print(f"Log line: {log_line}")
-print(f"Pattern: {pattern}")
+print(f"Pattern: {EPISODE_RE.pattern}")
 
-match = re.search(pattern, log_line)
+match = EPISODE_RE.search(log_line)
 if match:
     print(f"✅ Match found: {match.group()}")
     print(f"   Episode name: {match.group(1)}")
@@ -24,7 +25,10 @@ docker_logs = """
 2025-07-20 16:44:23,681 - __main__ - INFO - Processing queued episode '/Users/nathanielsena/Documents/code/Kismet/custom-chat-element/index.html' for group_id: default
 """
 
-matches = re.findall(pattern, docker_logs)
+# Cheap substring check first: only lines containing it can match, so the
+# regex engine never runs on the rest
+SIGIL = "Processing queued episode '"
+matches = [m for m in (EPISODE_RE.search(line) for line in docker_logs.splitlines() if SIGIL in line) if m]
 print(f"Found {len(matches)} matches:")
 for i, match in enumerate(matches, 1):
-    print(f"  {i}. Episode: '{match[0]}', Group: {match[1]}") 
\ No newline at end of file
+    print(f"  {i}. Episode: '{match.group(1)}', Group: {match.group(2)}") 
\ No newline at end of file
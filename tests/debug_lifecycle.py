@@ -6,86 +6,202 @@ This script maps out the complete lifecycle of memory addition and provides
 detailed logging for tools and tool usage to help diagnose issues.
 """
 
-import requests
+# Only the standard library is imported at module level; the HTTP clients
+# (requests/urllib3, aiohttp, orjson) are imported where they are first used,
+# so importing LifecycleDebugger stays cheap
+import asyncio
 import json
 import uuid
-import re
 import os
 import time
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, ClassVar, Optional, Dict, Any, List, TextIO, Tuple, Union
 from datetime import datetime
 
+if TYPE_CHECKING:
+    import aiohttp
+
+# urllib3 Retry settings. Read timeouts are not retried: the SSE endpoint
+# legitimately holds reads open. Status retries only cover idempotent methods,
+# so LM Studio completions are never re-sent
+HTTP_RETRY_OPTIONS = dict(total=3, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+# Graphiti also retries POSTs (each test episode has its own name, so a repeat is
+# harmless) and waits out any Retry-After a restarting/overloaded server sends
+GRAPHITI_RETRY_OPTIONS = dict(HTTP_RETRY_OPTIONS, respect_retry_after_header=True,
+                              allowed_methods=frozenset(["GET", "POST"]))
+
+SESSION_ID_MARKER = b"session_id="
+# Stream chunks to scan for the session_id before giving up
+SSE_MAX_CHUNKS = 3
+
+# Log levels in increasing severity; messages below the debugger's level are dropped
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# Seconds a Graphiti availability result is reused (short, so a restart is still noticed)
+GRAPHITI_PROBE_TTL = 5.0
+
 class LifecycleDebugger:
+    # Tool discovery variant that last worked, per Graphiti URL (shared by all instances)
+    _last_successful_discovery: ClassVar[Dict[str, Dict[str, Any]]] = {}
+    
     def __init__(self, lmstudio_url: str = "http://127.0.0.1:1234/v1/chat/completions", 
                  graphiti_url: str = "http://localhost:8000/sse",
-                 model: str = "qwen3-32b"):
+                 model: str = "qwen3-32b", log_level: str = "INFO",
+                 log_path: str = "debug_lifecycle.log"):
         self.lmstudio_url = lmstudio_url
         self.graphiti_url = graphiti_url
         self.model = model
+        # Pretty-printed JSON dumps of requests/responses are logged at DEBUG
+        self.log_level = log_level
         self.session_id = None
-        self.debug_log = []
+        # Availability probe results: LM Studio's model list does not change within
+        # a run, so a success is kept for the process; Graphiti's is (time, result)
+        self._models_ok: Optional[bool] = None
+        self._graphiti_probe: Optional[Tuple[float, bool]] = None
+        # Entries are written to the log file as they are logged (line-buffered),
+        # so nothing accumulates in memory and a crash still leaves the log on disk.
+        # The file is opened in append mode for each run and closed when it ends
+        self.log_path = log_path
+        self._log_file: Optional[TextIO] = None
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import parse_url
+        from urllib3.util.retry import Retry
+        
+        # One pooled session for every call, so keep-alive connections to
+        # LM Studio and Graphiti are reused instead of reconnecting each time
+        self.session = requests.Session()
+        http_retry = Retry(**HTTP_RETRY_OPTIONS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=http_retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # The two origins get their own adapter (longest mount prefix wins), so
+        # alternating between them never evicts the other's pool
+        for url, retry in ((self.lmstudio_url, http_retry),
+                           (self.graphiti_url, Retry(**GRAPHITI_RETRY_OPTIONS))):
+            parsed = parse_url(url)
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            self.session.mount(origin, HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                                                   max_retries=retry))
+        
+    def is_enabled_for(self, level: str) -> bool:
+        """Return True if messages at this level are logged"""
+        return LOG_LEVELS[level] >= LOG_LEVELS[self.log_level]
         
-    def log(self, message: str, level: str = "INFO"):
-        """Add a timestamped log entry"""
+    def log(self, message: Union[str, Callable[[], str]], level: str = "INFO"):
+        """
+        Add a timestamped log entry.
+        
+        message may be a callable returning the text, so expensive formatting
+        (such as pretty-printing a large response) only runs if the level is enabled.
+        """
+        if not self.is_enabled_for(level):
+            return
+        if callable(message):
+            message = message()
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         log_entry = f"[{timestamp}] [{level}] {message}"
         print(log_entry)
-        self.debug_log.append(log_entry)
+        if self._log_file is not None:
+            self._log_file.write(log_entry + "\n")
         
-    def save_debug_log(self, filename: str = "debug_lifecycle.log"):
-        """Save the debug log to a file"""
-        with open(filename, 'w') as f:
-            f.write('\n'.join(self.debug_log))
-        self.log(f"Debug log saved to {filename}")
+    def save_debug_log(self):
+        """Close the debug log file (entries were already written as they were logged)"""
+        if self._log_file is not None:
+            self.log(f"Debug log saved to {self.log_path}")
+            self._log_file.close()
+            self._log_file = None
         
-    def check_lmstudio_availability(self) -> bool:
-        """Check if LM Studio is available and responding"""
+    async def check_lmstudio_availability(self, http: "aiohttp.ClientSession",
+                                          force: bool = False) -> bool:
+        """Check if LM Studio is available and responding (force=True re-probes)"""
         self.log("=== STEP 1: Checking LM Studio Availability ===")
+        if self._models_ok and not force:
+            self.log("LM Studio already confirmed available in this run")
+            return True
         try:
             # Test basic connectivity
             self.log(f"Testing connection to LM Studio at: {self.lmstudio_url}")
-            response = requests.get(self.lmstudio_url.replace('/v1/chat/completions', '/v1/models'), timeout=5)
-            self.log(f"LM Studio models endpoint response: {response.status_code}")
-            
-            if response.status_code == 200:
-                models = response.json()
-                self.log(f"Available models: {[m.get('id', 'unknown') for m in models.get('data', [])]}")
+            models_url = self.lmstudio_url.replace('/v1/chat/completions', '/v1/models')
+            # Only the status is needed unless the model list is being logged, so
+            # try HEAD first and skip the body (GET if HEAD is not served)
+            list_models = self.is_enabled_for("DEBUG")
+            status = None
+            if not list_models:
+                async with http.head(models_url) as response:
+                    status = response.status
+            if status is None or status in (404, 405, 501):
+                async with http.get(models_url) as response:
+                    status = response.status
+                    if status == 200 and list_models:
+                        models = await response.json()
+                        self.log(f"Available models: {[m.get('id', 'unknown') for m in models.get('data', [])]}", "DEBUG")
+            self.log(f"LM Studio models endpoint response: {status}")
+            
+            if status == 200:
+                self._models_ok = True
                 return True
             else:
-                self.log(f"LM Studio not responding properly: {response.status_code}")
+                self.log(f"LM Studio not responding properly: {status}")
                 return False
                 
         except Exception as e:
             self.log(f"LM Studio connection failed: {e}", "ERROR")
             return False
             
-    def check_graphiti_availability(self) -> bool:
-        """Check if Graphiti server is available"""
+    async def check_graphiti_availability(self, http: "aiohttp.ClientSession",
+                                          force: bool = False) -> bool:
+        """Check if Graphiti server is available (force=True re-probes)"""
         self.log("=== STEP 2: Checking Graphiti Server Availability ===")
+        if self._graphiti_probe is not None and not force:
+            checked_at, available = self._graphiti_probe
+            if time.monotonic() - checked_at < GRAPHITI_PROBE_TTL:
+                self.log(f"Reusing Graphiti availability from the last {GRAPHITI_PROBE_TTL:.0f}s: {available}")
+                return available
         try:
             base_url = self.graphiti_url.replace('/sse', '')
             self.log(f"Testing connection to Graphiti at: {base_url}")
             
-            # Test basic connectivity
-            response = requests.get(base_url, timeout=5)
-            self.log(f"Graphiti base endpoint response: {response.status_code}")
+            async def status(url: str, headers: Optional[Dict[str, str]] = None) -> int:
+                # Only the status line is needed, so the (endless) SSE body is never read
+                async with http.get(url, headers=headers) as response:
+                    return response.status
             
-            # Test SSE endpoint
-            sse_response = requests.get(self.graphiti_url, headers={"Accept": "text/event-stream"}, timeout=5)
-            self.log(f"Graphiti SSE endpoint response: {sse_response.status_code}")
+            # Test basic connectivity and the SSE endpoint at the same time
+            base_status, sse_status = await asyncio.gather(
+                status(base_url),
+                status(self.graphiti_url, {"Accept": "text/event-stream"}),
+            )
+            self.log(f"Graphiti base endpoint response: {base_status}")
+            self.log(f"Graphiti SSE endpoint response: {sse_status}")
             
-            return sse_response.status_code == 200
+            available = sse_status == 200
+            self._graphiti_probe = (time.monotonic(), available)
+            return available
             
         except Exception as e:
             self.log(f"Graphiti connection failed: {e}", "ERROR")
             return False
             
+    async def check_availability(self, force: bool = False) -> Tuple[bool, bool]:
+        """Probe LM Studio and Graphiti concurrently; returns (lmstudio_ok, graphiti_ok)"""
+        import aiohttp
+        
+        # One client session shared by every probe
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as http:
+            lmstudio_ok, graphiti_ok = await asyncio.gather(
+                self.check_lmstudio_availability(http, force),
+                self.check_graphiti_availability(http, force),
+            )
+        return lmstudio_ok, graphiti_ok
+            
     def discover_available_tools(self) -> List[Dict]:
         """Discover what tools are available on the Graphiti server"""
         self.log("=== STEP 3: Discovering Available Tools ===")
         try:
-            # Get session first
-            session_id = self.get_session()
+            # Use the current session, or get one first
+            session_id = self.session_id or self.get_session()
             if not session_id:
                 self.log("Cannot discover tools without session", "ERROR")
                 return []
@@ -94,12 +210,17 @@ class LifecycleDebugger:
             base_url = self.graphiti_url.replace('/sse', '')
             messages_url = f"{base_url}/messages/?session_id={session_id}"
             
-            # Try different tool discovery methods
+            # Try different tool discovery methods, starting with the one that
+            # last worked against this server
             tool_discovery_methods = [
                 {"method": "tools/list", "params": {}},
                 {"method": "tools/list", "params": {"includeSchema": True}},
                 {"method": "tools/list", "params": {"includeSchema": False}},
             ]
+            cached = self._last_successful_discovery.get(self.graphiti_url)
+            if cached is not None:
+                tool_discovery_methods.remove(cached)
+                tool_discovery_methods.insert(0, cached)
             
             for method_info in tool_discovery_methods:
                 try:
@@ -111,14 +232,15 @@ class LifecycleDebugger:
                     }
                     
                     self.log(f"Trying tool discovery method: {method_info['method']}")
-                    response = requests.post(messages_url, json=request, headers={"Content-Type": "application/json"}, timeout=10)
+                    response = self.session.post(messages_url, json=request, headers={"Content-Type": "application/json"}, timeout=10)
                     self.log(f"Tool discovery response: {response.status_code}")
                     
                     if response.status_code == 200:
                         data = response.json()
-                        self.log(f"Tool discovery result: {json.dumps(data, indent=2)}")
+                        self.log(lambda: f"Tool discovery result: {json.dumps(data, indent=2)}", "DEBUG")
                         if "result" in data and "tools" in data["result"]:
                             tools = data["result"]["tools"]
+                            self._last_successful_discovery[self.graphiti_url] = method_info
                             self.log(f"Found {len(tools)} available tools:")
                             for tool in tools:
                                 self.log(f"  - {tool.get('name', 'unknown')}: {tool.get('description', 'no description')}")
@@ -151,21 +273,24 @@ class LifecycleDebugger:
             self.log(f"Requesting session from: {sse_url}")
             
             headers = {"Accept": "text/event-stream"}
-            response = requests.get(sse_url, headers=headers, stream=True, timeout=10)
-            
-            if response.status_code != 200:
-                self.log(f"Failed to connect to SSE endpoint: {response.status_code}", "ERROR")
-                return None
-            
-            self.log("SSE connection established, parsing for session_id...")
-            
-            # Parse SSE stream for session_id
-            for line in response.iter_lines():
-                if b"session_id" in line:
-                    self.log(f"Found session line: {line}")
-                    match = re.search(rb'session_id=([a-f0-9]+)', line)
-                    if match:
-                        session_id = match.group(1).decode()
+            # Closing the stream once the id is read releases its connection
+            with self.session.get(sse_url, headers=headers, stream=True, timeout=10) as response:
+                if response.status_code != 200:
+                    self.log(f"Failed to connect to SSE endpoint: {response.status_code}", "ERROR")
+                    return None
+                
+                self.log("SSE connection established, parsing for session_id...")
+                
+                # The session_id arrives in the first SSE event, so only the first
+                # few chunks are read, as bytes, and the id is sliced from the
+                # marker to the end of its line
+                buf = b""
+                for chunk in islice(response.iter_content(chunk_size=None), SSE_MAX_CHUNKS):
+                    buf += chunk
+                    start = buf.find(SESSION_ID_MARKER)
+                    end = buf.find(b"\n", start) if start >= 0 else -1
+                    if end >= 0:  # the whole line has arrived
+                        session_id = buf[start + len(SESSION_ID_MARKER):end].strip().decode()
                         self.log(f"Extracted session_id: {session_id}")
                         self.session_id = session_id
                         return session_id
@@ -196,21 +321,31 @@ class LifecycleDebugger:
             base_url = self.graphiti_url.replace('/sse', '')
             messages_url = f"{base_url}/messages/?session_id={self.session_id}"
             
-            self.log(f"Tool call details:")
-            self.log(f"  URL: {messages_url}")
-            self.log(f"  Tool: {tool_name}")
-            self.log(f"  Arguments: {json.dumps(arguments, indent=2)}")
-            self.log(f"  Full Request: {json.dumps(tool_call_request, indent=2)}")
-            
-            start_time = time.time()
-            response = requests.post(messages_url, json=tool_call_request, headers=headers, timeout=30)
-            end_time = time.time()
-            
-            self.log(f"Tool call response:")
-            self.log(f"  Status: {response.status_code}")
-            self.log(f"  Time: {end_time - start_time:.2f}s")
-            self.log(f"  Headers: {dict(response.headers)}")
-            self.log(f"  Body: {response.text}")
+            # One entry per logical event rather than one per line
+            self.log("\n".join([
+                "Tool call details:",
+                f"  URL: {messages_url}",
+                f"  Tool: {tool_name}",
+            ]))
+            self.log(lambda: "\n".join([
+                f"  Arguments: {json.dumps(arguments, indent=2)}",
+                f"  Full Request: {json.dumps(tool_call_request, indent=2)}",
+            ]), "DEBUG")
+            
+            # Serialize the body once, straight to bytes
+            import orjson
+            body = orjson.dumps(tool_call_request)
+            start_time = time.perf_counter()
+            response = self.session.post(messages_url, data=body, headers=headers, timeout=30)
+            end_time = time.perf_counter()
+            
+            self.log("\n".join([
+                "Tool call response:",
+                f"  Status: {response.status_code}",
+                f"  Time: {end_time - start_time:.2f}s",
+                f"  Headers: {dict(response.headers)}",
+                f"  Body: {response.text}",
+            ]))
             
             if response.status_code == 202:
                 self.log("Server accepted the event (202). Memory addition is queued.")
@@ -259,24 +394,31 @@ class LifecycleDebugger:
                 "stream": False
             }
             
-            self.log(f"LM Studio request:")
-            self.log(f"  URL: {self.lmstudio_url}")
-            self.log(f"  Model: {self.model}")
-            self.log(f"  Prompt: {test_prompt}")
-            self.log(f"  Tools: {json.dumps(tools, indent=2)}")
-            
-            start_time = time.time()
-            response = requests.post(self.lmstudio_url, json=payload, headers={"Content-Type": "application/json"}, timeout=600)
-            end_time = time.time()
-            
-            self.log(f"LM Studio response:")
-            self.log(f"  Status: {response.status_code}")
-            self.log(f"  Time: {end_time - start_time:.2f}s")
+            self.log("\n".join([
+                "LM Studio request:",
+                f"  URL: {self.lmstudio_url}",
+                f"  Model: {self.model}",
+                f"  Prompt: {test_prompt}",
+            ]))
+            self.log(lambda: f"  Tools: {json.dumps(tools, indent=2)}", "DEBUG")
+            
+            # Serialize the body once, straight to bytes
+            import orjson
+            body = orjson.dumps(payload)
+            start_time = time.perf_counter()
+            response = self.session.post(self.lmstudio_url, data=body, headers={"Content-Type": "application/json"}, timeout=600)
+            end_time = time.perf_counter()
+            
+            self.log("\n".join([
+                "LM Studio response:",
+                f"  Status: {response.status_code}",
+                f"  Time: {end_time - start_time:.2f}s",
+            ]))
             
             response.raise_for_status()
             data = response.json()
             
-            self.log(f"LM Studio response data: {json.dumps(data, indent=2)}")
+            self.log(lambda: f"LM Studio response data: {json.dumps(data, indent=2)}", "DEBUG")
             
             if data["choices"][0]["message"].get("tool_calls"):
                 tool_call = data["choices"][0]["message"]["tool_calls"][0]
@@ -307,46 +449,63 @@ class LifecycleDebugger:
             
     def run_full_lifecycle_test(self, test_file_path: str = None):
         """Run the complete lifecycle test"""
+        if self._log_file is None:
+            self._log_file = open(self.log_path, 'a', buffering=1, encoding='utf-8')
         self.log("=== STARTING FULL LIFECYCLE TEST ===")
-        
-        # Step 1: Check LM Studio availability
-        if not self.check_lmstudio_availability():
+        try:
+            self._run_lifecycle_steps(test_file_path)
+        finally:
+            self.session.close()
+            self.save_debug_log()
+            
+    def _run_lifecycle_steps(self, test_file_path: str = None):
+        """Run the lifecycle steps in order, stopping at the first blocking failure"""
+        # Steps 1 and 2: Check LM Studio and Graphiti availability (independent hosts,
+        # so both probes run at once)
+        lmstudio_ok, graphiti_ok = asyncio.run(self.check_availability())
+        if not lmstudio_ok:
             self.log("LM Studio not available - stopping test", "ERROR")
             return
             
-        # Step 2: Check Graphiti availability
-        if not self.check_graphiti_availability():
+        if not graphiti_ok:
             self.log("Graphiti server not available - stopping test", "ERROR")
             return
             
-        # Step 3: Discover available tools
-        tools = self.discover_available_tools()
-        if not tools:
-            self.log("No tools discovered - this might be normal for some MCP implementations", "WARNING")
-            
-        # Step 4: Get session
+        # Step 4: Get session (every Graphiti step needs it, so it comes first;
+        # tool discovery reuses it)
         session_id = self.get_session()
         if not session_id:
             self.log("Failed to get session - stopping test", "ERROR")
             return
             
-        # Step 5: Test direct tool call
-        test_args = {
-            "name": "test_memory",
-            "episode_body": "This is a test memory created during lifecycle debugging."
-        }
-        tool_result = self.test_tool_call("add_memory", test_args)
-        self.log(f"Direct tool call result: {tool_result}")
-        
-        # Step 6: Test LM Studio tool calling
+        # Step 6 prompt: depends only on the test file
         if test_file_path and os.path.exists(test_file_path):
             with open(test_file_path, 'r', encoding='utf-8') as f:
                 content = f.read()[:1000]  # Limit content
             test_prompt = f"Please add a memory with the name '{test_file_path}' and the following content: '{content[:200]}...'"
         else:
             test_prompt = "Please add a memory with the name 'test_lifecycle' and the content 'This is a test memory from the lifecycle debugger.'"
+        
+        # LM Studio generation is the slowest step and needs nothing from Graphiti,
+        # so it runs in the background while the Graphiti steps go ahead
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            lmstudio_future = pool.submit(self.test_lmstudio_tool_calling, test_prompt)
+            
+            # Step 3: Discover available tools
+            tools = self.discover_available_tools()
+            if not tools:
+                self.log("No tools discovered - this might be normal for some MCP implementations", "WARNING")
+                
+            # Step 5: Test direct tool call
+            test_args = {
+                "name": "test_memory",
+                "episode_body": "This is a test memory created during lifecycle debugging."
+            }
+            tool_result = self.test_tool_call("add_memory", test_args)
+            self.log(f"Direct tool call result: {tool_result}")
             
-        lmstudio_result = self.test_lmstudio_tool_calling(test_prompt)
+            # Step 6: Test LM Studio tool calling
+            lmstudio_result = lmstudio_future.result()
         self.log(f"LM Studio tool calling result: {lmstudio_result}")
         
         # Step 7: If LM Studio requested a tool call, execute it
@@ -366,7 +525,6 @@ class LifecycleDebugger:
                 self.log("Missing required arguments from LM Studio", "ERROR")
         
         self.log("=== LIFECYCLE TEST COMPLETE ===")
-        self.save_debug_log()
 
 def main():
     """Main function to run the lifecycle debugger"""
@@ -381,13 +539,16 @@ def main():
                        help="Model to use")
     parser.add_argument('--test-file', 
                        help="Optional test file to use in the lifecycle test")
+    parser.add_argument('--log-level', default="INFO", choices=list(LOG_LEVELS),
+                       help="Minimum level to log (DEBUG adds full JSON requests and responses)")
     
     args = parser.parse_args()
     
     debugger = LifecycleDebugger(
         lmstudio_url=args.lmstudio_url,
         graphiti_url=args.graphiti_url,
-        model=args.model
+        model=args.model,
+        log_level=args.log_level
     )
     
     debugger.run_full_lifecycle_test(args.test_file)
@@ -13,9 +13,15 @@ import re
 import os
 import time
 import asyncio
+from itertools import islice
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+# Compiled once; only lines that pass the cheap literal check reach it
+_SID_RE = re.compile(rb'session_id=([a-f0-9]+)')
+# Stream chunks to scan for the session_id before giving up
+SSE_MAX_CHUNKS = 3
+
 class EnhancedLifecycleDebugger:
     def __init__(self, lmstudio_url: str = "http://127.0.0.1:1234/v1/chat/completions", 
                  graphiti_url: str = "http://localhost:8000/sse",
@@ -101,24 +107,28 @@ class EnhancedLifecycleDebugger:
             self.log(f"Requesting session from: {sse_url}")
             
             headers = {"Accept": "text/event-stream"}
-            response = requests.get(sse_url, headers=headers, stream=True, timeout=10)
-            
-            if response.status_code != 200:
-                self.log(f"Failed to connect to SSE endpoint: {response.status_code}", "ERROR")
-                return None
-            
-            self.log("SSE connection established, parsing for session_id...")
-            
-            # Parse SSE stream for session_id
-            for line in response.iter_lines():
-                if b"session_id" in line:
-                    self.log(f"Found session line: {line}")
-                    match = re.search(rb'session_id=([a-f0-9]+)', line)
-                    if match:
-                        session_id = match.group(1).decode()
-                        self.log(f"Extracted session_id: {session_id}")
-                        self.session_id = session_id
-                        return session_id
+            # Closing the stream once the id is read releases its connection
+            with requests.get(sse_url, headers=headers, stream=True, timeout=10) as response:
+                if response.status_code != 200:
+                    self.log(f"Failed to connect to SSE endpoint: {response.status_code}", "ERROR")
+                    return None
+                
+                self.log("SSE connection established, parsing for session_id...")
+                
+                # The session_id arrives in the first SSE event, so only the first few
+                # chunks are read, each as soon as it arrives, instead of splitting
+                # the stream into lines
+                buf = b""
+                for chunk in islice(response.iter_content(chunk_size=None), SSE_MAX_CHUNKS):
+                    buf += chunk
+                    start = buf.find(b"session_id=")
+                    if start >= 0 and buf.find(b"\n", start) >= 0:  # the whole line has arrived
+                        match = _SID_RE.search(buf, start)
+                        if match:
+                            session_id = match.group(1).decode()
+                            self.log(f"Extracted session_id: {session_id}")
+                            self.session_id = session_id
+                            return session_id
             
             self.log("Could not find session_id in SSE stream", "ERROR")
             return None
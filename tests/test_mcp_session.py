@@ -1,33 +1,47 @@
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 GRAPHITI_URL = "http://localhost:8000/sse"  # Change this to your actual Graphiti /sse endpoint
 RETRIES = 5
-DELAY = 2  # seconds between retries
+BACKOFF = 0.5  # exponential backoff factor between retries, in seconds
+MAX_SSE_LINES = 200  # give up on an SSE stream that has not sent a session_id by then
+
+# Connection errors and 5xx replies are retried inside the connection layer
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(max_retries=Retry(
+    total=RETRIES, backoff_factor=BACKOFF,
+    status_forcelist=[500, 502, 503, 504], allowed_methods=["GET", "POST"],
+    raise_on_status=False,
+)))
 
 def get_session_id(graphiti_url):
     print(f"Requesting session from: {graphiti_url}")
     try:
-        response = requests.get(graphiti_url, stream=True, timeout=10)
+        response = SESSION.get(graphiti_url, stream=True, timeout=10)
         if response.status_code == 200:
-            # Try JSON
-            try:
-                data = response.json()
-                session_id = data.get("session_id")
-                if session_id:
-                    print(f"[SUCCESS] Obtained session_id from JSON: {session_id}")
-                    return session_id
-            except Exception:
-                pass
+            # Try JSON (only for JSON replies: reading an SSE body in full never ends)
+            if "json" in response.headers.get("Content-Type", ""):
+                try:
+                    data = response.json()
+                    session_id = data.get("session_id")
+                    if session_id:
+                        print(f"[SUCCESS] Obtained session_id from JSON: {session_id}")
+                        return session_id
+                except Exception:
+                    pass
             # Try headers
             session_id = response.headers.get("session_id")
             if session_id:
                 print(f"[SUCCESS] Obtained session_id from headers: {session_id}")
                 return session_id
-            # Try SSE stream
-            for line in response.iter_lines():
+            # Try SSE stream, reading at most MAX_SSE_LINES lines
+            for i, line in enumerate(response.iter_lines(chunk_size=256)):
+                if i >= MAX_SSE_LINES:
+                    break
                 if b"session_id" in line:
-                    session_id = line.decode().split(":")[-1].strip()
+                    # Decode only the text after the last ':' rather than the whole line
+                    session_id = line[line.rfind(b":") + 1:].strip().decode()
                     print(f"[SUCCESS] Obtained session_id from SSE: {session_id}")
                     return session_id
             print("[FAIL] Could not find session_id in response.")
@@ -38,14 +52,8 @@ def get_session_id(graphiti_url):
     return None
 
 if __name__ == "__main__":
-    for i in range(RETRIES):
-        print(f"\nAttempt {i+1} of {RETRIES}")
-        session_id = get_session_id(GRAPHITI_URL)
-        if session_id:
-            print(f"[DONE] Successfully obtained session_id: {session_id}")
-            break
-        else:
-            print(f"[RETRY] Waiting {DELAY} seconds before next attempt...")
-            time.sleep(DELAY)
+    session_id = get_session_id(GRAPHITI_URL)
+    if session_id:
+        print(f"[DONE] Successfully obtained session_id: {session_id}")
     else:
-        print("[FAIL] Could not obtain a session_id after multiple attempts.") 
\ No newline at end of file
+        print(f"[FAIL] Could not obtain a session_id (up to {RETRIES} retries).") 
\ No newline at end of file
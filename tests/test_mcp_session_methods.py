@@ -2,25 +2,29 @@ import requests
 
 BASE_URL = "http://localhost:8000"  # Change if needed
 
+# One session for every probe, so they share a keep-alive connection to BASE_URL
+SESSION = requests.Session()
+
 # 1. GET /sse with SSE headers
-def try_get_sse_with_headers():
+def try_get_sse_with_headers(session=SESSION):
     print("\n[1] GET /sse with Accept: text/event-stream")
     url = f"{BASE_URL}/sse"
     headers = {"Accept": "text/event-stream"}
     try:
-        response = requests.get(url, headers=headers, stream=True, timeout=10)
-        print("Status:", response.status_code)
-        print("Headers:", response.headers)
-        for line in response.iter_lines():
-            print("Line:", line)
-            if b"session_id" in line:
-                print("Found session_id in SSE:", line)
-                break
+        # Closing the streamed response hands its connection back to the session
+        with session.get(url, headers=headers, stream=True, timeout=10) as response:
+            print("Status:", response.status_code)
+            print("Headers:", response.headers)
+            for line in response.iter_lines():
+                print("Line:", line)
+                if b"session_id" in line:
+                    print("Found session_id in SSE:", line)
+                    break
     except Exception as e:
         print("[ERROR]", e)
 
 # 2. POST /session with JSON-RPC
-def try_post_session_jsonrpc():
+def try_post_session_jsonrpc(session=SESSION):
     print("\n[2] POST /session with JSON-RPC")
     url = f"{BASE_URL}/session"
     payload = {
@@ -31,7 +35,7 @@ def try_post_session_jsonrpc():
     }
     headers = {"Content-Type": "application/json"}
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = session.post(url, json=payload, headers=headers, timeout=10)
         print("Status:", response.status_code)
         print("Headers:", response.headers)
         print("Body:", response.text)
@@ -39,11 +43,11 @@ def try_post_session_jsonrpc():
         print("[ERROR]", e)
 
 # 3. GET /session
-def try_get_session():
+def try_get_session(session=SESSION):
     print("\n[3] GET /session")
     url = f"{BASE_URL}/session"
     try:
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         print("Status:", response.status_code)
         print("Headers:", response.headers)
         print("Body:", response.text)
@@ -51,7 +55,7 @@ def try_get_session():
         print("[ERROR]", e)
 
 # 4. POST /sse with JSON-RPC
-def try_post_sse_jsonrpc():
+def try_post_sse_jsonrpc(session=SESSION):
     print("\n[4] POST /sse with JSON-RPC")
     url = f"{BASE_URL}/sse"
     payload = {
@@ -62,7 +66,7 @@ def try_post_sse_jsonrpc():
     }
     headers = {"Content-Type": "application/json"}
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = session.post(url, json=payload, headers=headers, timeout=10)
         print("Status:", response.status_code)
         print("Headers:", response.headers)
         print("Body:", response.text)
@@ -70,11 +74,11 @@ def try_post_sse_jsonrpc():
         print("[ERROR]", e)
 
 # 5. GET /sse with no special headers
-def try_get_sse_plain():
+def try_get_sse_plain(session=SESSION):
     print("\n[5] GET /sse (plain)")
     url = f"{BASE_URL}/sse"
     try:
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         print("Status:", response.status_code)
         print("Headers:", response.headers)
         print("Body:", response.text)
@@ -82,8 +86,11 @@ def try_get_sse_plain():
         print("[ERROR]", e)
 
 if __name__ == "__main__":
-    try_get_sse_with_headers()
-    try_post_session_jsonrpc()
-    try_get_session()
-    try_post_sse_jsonrpc()
-    try_get_sse_plain() 
\ No newline at end of file
+    for probe in [
+        try_get_sse_with_headers,
+        try_post_session_jsonrpc,
+        try_get_session,
+        try_post_sse_jsonrpc,
+        try_get_sse_plain,
+    ]:
+        probe(SESSION) 
\ No newline at end of file
@@ -3,72 +3,64 @@
 Test Tool Call Verification Script
 
 This script tests whether the Graphiti MCP server is actually receiving and processing tool calls.
+All requests share one persistent MCP session (core.memory_adder.FastMcpSession),
+whose SSE connection stays open and carries the server's responses.
 """
 
-import requests
+import sys
+import os
 import json
-import uuid
 import re
 import time
 from datetime import datetime
 
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from core.memory_adder import FastMcpSession
+
+GRAPHITI_URL = "http://localhost:8000/sse"
+
+# Log markers of tool call processing: (marker, found message, missing message)
+LOG_MARKERS = [
+    ("CallToolRequest", "✅ Found CallToolRequest in logs", "❌ No CallToolRequest found in logs"),
+    ("add_memory", "✅ Found add_memory in logs", "❌ No add_memory found in logs"),
+    ("Processing queued episode", "✅ Found background processing in logs", "❌ No background processing found in logs"),
+]
+# All markers in one alternation, so the logs are scanned once
+_PAT = re.compile("|".join(re.escape(marker) for marker, _, _ in LOG_MARKERS))
+
 def log(message: str):
     """Log a message with timestamp"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{timestamp}] {message}")
 
-def get_session(graphiti_url: str = "http://localhost:8000/sse") -> str:
-    """Get a session ID from Graphiti server"""
-    log("Getting MCP session...")
-    try:
-        headers = {"Accept": "text/event-stream"}
-        response = requests.get(graphiti_url, headers=headers, stream=True, timeout=10)
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to connect to SSE endpoint: {response.status_code}")
-        
-        # Parse SSE stream for session_id
-        for line in response.iter_lines():
-            if b"session_id" in line:
-                match = re.search(rb'session_id=([a-f0-9]+)', line)
-                if match:
-                    session_id = match.group(1).decode()
-                    log(f"Session ID: {session_id}")
-                    return session_id
-        
-        raise Exception("Could not find session_id in SSE stream")
-        
-    except Exception as e:
-        log(f"Failed to get session: {e}")
-        raise
+def open_mcp_session(graphiti_url: str = GRAPHITI_URL) -> FastMcpSession:
+    """Open the persistent SSE connection and run the MCP initialize handshake"""
+    log("Opening persistent MCP session...")
+    mcp = FastMcpSession(graphiti_url)
+    mcp.start()
+    log(f"Session ID: {mcp.session_id}")
+    if not mcp.initialize(graphiti_url.replace('/sse', '')):
+        mcp.stop()
+        raise Exception("MCP initialization failed")
+    return mcp
 
-def test_tool_call(session_id: str, graphiti_url: str = "http://localhost:8000/sse") -> dict:
+def test_tool_call(mcp: FastMcpSession, graphiti_url: str = GRAPHITI_URL) -> dict:
     """Test a direct tool call to verify processing"""
     log("Testing direct tool call...")
     
     try:
         base_url = graphiti_url.replace('/sse', '')
-        messages_url = f"{base_url}/messages/?session_id={session_id}"
-        
-        tool_call_request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": "add_memory",
-                "arguments": {
-                    "name": "test_verification_memory",
-                    "episode_body": "This is a test memory to verify tool call processing.",
-                    "group_id": "test_group"
-                }
-            }
+        arguments = {
+            "name": "test_verification_memory",
+            "episode_body": "This is a test memory to verify tool call processing.",
+            "group_id": "test_group"
         }
         
-        log(f"Sending tool call to: {messages_url}")
-        log(f"Tool call payload: {json.dumps(tool_call_request, indent=2)}")
+        log(f"Sending tool call for session: {mcp.session_id}")
+        log(f"Tool call arguments: {json.dumps(arguments, indent=2)}")
         
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(messages_url, json=tool_call_request, headers=headers, timeout=30)
+        response = mcp.post_tool_call(base_url, "add_memory", arguments)
         
         log(f"Response status: {response.status_code}")
         log(f"Response body: {response.text}")
@@ -84,35 +76,34 @@ def test_tool_call(session_id: str, graphiti_url: str = "http://localhost:8000/s
         log(f"❌ Tool call error: {e}")
         return {"success": False, "error": str(e)}
 
-def test_tool_listing(session_id: str, graphiti_url: str = "http://localhost:8000/sse") -> dict:
+def test_tool_listing(mcp: FastMcpSession, graphiti_url: str = GRAPHITI_URL) -> dict:
     """Test tool listing to verify server is responding"""
     log("Testing tool listing...")
     
     try:
         base_url = graphiti_url.replace('/sse', '')
-        messages_url = f"{base_url}/messages/?session_id={session_id}"
-        
-        list_tools_request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/list",
-            "params": {}
-        }
-        
-        log(f"Sending tool list request to: {messages_url}")
-        
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(messages_url, json=list_tools_request, headers=headers, timeout=30)
+        response = mcp.list_tools(base_url)
         
         log(f"Tool list response status: {response.status_code}")
-        log(f"Tool list response body: {response.text}")
         
-        if response.status_code == 200:
-            log("✅ Tool listing successful")
-            return {"success": True, "status": 200, "data": response.json()}
-        else:
+        if response.status_code != 202:
             log(f"❌ Tool listing failed: {response.status_code}")
             return {"success": False, "status": response.status_code, "message": response.text}
+        
+        # The result comes back as a message event on the persistent SSE connection
+        for _ in range(10):
+            event = mcp.get_event(timeout=1)
+            if event and event.get("event") == "message":
+                data = json.loads(event["data"])
+                log(f"Tool list result: {event['data']}")
+                if "result" in data:
+                    log("✅ Tool listing successful")
+                    return {"success": True, "status": 202, "data": data}
+                log(f"❌ Tool listing failed: {data.get('error')}")
+                return {"success": False, "status": 202, "message": data.get("error")}
+        
+        log("❌ No tool list response received over SSE")
+        return {"success": False, "status": 202, "message": "No response event"}
             
     except Exception as e:
         log(f"❌ Tool listing error: {e}")
@@ -125,34 +116,27 @@ def check_docker_logs():
     import subprocess
     
     try:
-        # Get recent logs
-        result = subprocess.run([
-            "docker", "logs", "graphiti-graphiti-mcp-1", "--tail", "20"
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
-            logs = result.stdout
+        # Stream the recent logs line by line (docker logs replays the container's
+        # stderr on its own stderr, so both are read) and stop once every marker is seen
+        found = set()
+        with subprocess.Popen(
+            ["docker", "logs", "graphiti-graphiti-mcp-1", "--tail", "20"],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        ) as proc:
             log("Recent Docker logs:")
-            print(logs)
-            
-            # Check for specific patterns
-            if "CallToolRequest" in logs:
-                log("✅ Found CallToolRequest in logs")
-            else:
-                log("❌ No CallToolRequest found in logs")
-                
-            if "add_memory" in logs:
-                log("✅ Found add_memory in logs")
-            else:
-                log("❌ No add_memory found in logs")
-                
-            if "Processing queued episode" in logs:
-                log("✅ Found background processing in logs")
-            else:
-                log("❌ No background processing found in logs")
-                
-        else:
-            log(f"❌ Failed to get Docker logs: {result.stderr}")
+            for line in proc.stdout:
+                print(line, end="")
+                found.update(m.group(0) for m in _PAT.finditer(line))
+                if len(found) == len(LOG_MARKERS):
+                    proc.terminate()  # the remaining lines cannot change the result
+                    break
+        
+        if len(found) < len(LOG_MARKERS) and proc.returncode != 0:
+            log(f"❌ Failed to get Docker logs (exit code {proc.returncode})")
+            return
+        
+        for marker, found_message, missing_message in LOG_MARKERS:
+            log(found_message if marker in found else missing_message)
             
     except Exception as e:
         log(f"❌ Error checking Docker logs: {e}")
@@ -161,15 +145,16 @@ def main():
     """Main test function"""
     log("=== TOOL CALL VERIFICATION TEST ===")
     
+    mcp = None
     try:
-        # Step 1: Get session
-        session_id = get_session()
+        # Step 1: Open the persistent session (one SSE connection for the whole test)
+        mcp = open_mcp_session()
         
         # Step 2: Test tool listing
-        tool_list_result = test_tool_listing(session_id)
+        tool_list_result = test_tool_listing(mcp)
         
         # Step 3: Test tool call
-        tool_call_result = test_tool_call(session_id)
+        tool_call_result = test_tool_call(mcp)
         
         # Step 4: Wait a moment
         log("Waiting 5 seconds for processing...")
@@ -190,6 +175,9 @@ def main():
             
     except Exception as e:
         log(f"❌ Test failed: {e}")
+    finally:
+        if mcp is not None:
+            mcp.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file